@@ -15,6 +15,9 @@ from app.infrastructure.models.project import ProjectModel
 from app.infrastructure.models.table import TableModel, ColumnModel
 from app.infrastructure.models.cell import RowModel, CellModel
 from app.infrastructure.models.version import VersionModel
+from app.infrastructure.models.branch import BranchModel, BranchCellModel
+from app.infrastructure.models.snapshot import TableSnapshotModel
+from app.infrastructure.models.staged_change import StagedChangeModel
 
 # this is the Alembic Config object
 config = context.config
@@ -4,6 +4,7 @@ Authentication API endpoints
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.exceptions import ServiceUnavailableError
 from app.schemas.request.auth import RegisterRequest, LoginRequest
 from app.schemas.response.auth import TokenResponse, UserResponse
 from app.application.services.auth_service import AuthService
@@ -33,6 +34,9 @@ async def register(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableError:
+        await db.rollback()
+        raise
     except Exception as e:
         await db.rollback()
         import traceback
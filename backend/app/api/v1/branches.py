@@ -0,0 +1,168 @@
+"""
+Branches API endpoints
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.api.v1.dependencies import get_current_user
+from app.di.providers import get_data_repository
+from app.infrastructure.models.user import UserModel
+from app.schemas.request.branch import CreateBranchRequest, UpdateBranchRowRequest, MergeBranchRequest
+from app.schemas.response.branch import BranchResponse, BranchChangesResponse, MergeResponse
+from app.schemas.response.table import TableDataResponse
+from app.application.services.branch_service import BranchService
+from app.application.services.merge_service import MergeService
+from app.application.services.version_service import VersionService
+from app.application.services.snapshot_service import SnapshotService
+from app.infrastructure.repositories.branch_repository import BranchRepository
+from app.infrastructure.repositories.table_repository import TableRepository
+from app.infrastructure.repositories.version_repository import VersionRepository
+from app.infrastructure.repositories.snapshot_repository import SnapshotRepository
+from app.application.mappers.domain_mapper import DomainMapper
+from app.utils.pagination import decode_cursor, next_cursor_for
+
+router = APIRouter()
+
+
+def _branch_service(db: AsyncSession) -> BranchService:
+    """Build the branch service for a request"""
+    return BranchService(BranchRepository(db), TableRepository(db), get_data_repository(db), VersionRepository(db))
+
+
+def _merge_service(db: AsyncSession) -> MergeService:
+    """Build the merge service for a request"""
+    version_repo = VersionRepository(db)
+    data_repo = get_data_repository(db)
+    snapshot_service = SnapshotService(SnapshotRepository(db), version_repo, data_repo)
+    version_service = VersionService(version_repo, data_repo, snapshot_service=snapshot_service)
+    return MergeService(BranchRepository(db), TableRepository(db), data_repo, version_service)
+
+
+@router.post("", response_model=BranchResponse, status_code=status.HTTP_201_CREATED)
+async def create_branch(
+    request: CreateBranchRequest,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create a branch of a table (copy-on-write, no data is copied)"""
+    branch = await _branch_service(db).create_branch(
+        table_id=request.table_id,
+        name=request.name,
+        description=request.description,
+        user_id=current_user.id
+    )
+    return BranchResponse(**vars(branch))
+
+
+@router.get("/table/{table_id}", response_model=List[BranchResponse])
+async def get_table_branches(
+    table_id: int,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get branches of a table"""
+    branches = await _branch_service(db).get_table_branches(table_id)
+    return [BranchResponse(**vars(branch)) for branch in branches]
+
+
+@router.get("/{branch_id}", response_model=BranchResponse)
+async def get_branch(
+    branch_id: int,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get branch by ID"""
+    branch = await _branch_service(db).get_branch(branch_id)
+    return BranchResponse(**vars(branch))
+
+
+@router.delete("/{branch_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_branch(
+    branch_id: int,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete a branch and its overrides"""
+    await _branch_service(db).delete_branch(branch_id, current_user.id)
+
+
+@router.get("/{branch_id}/data", response_model=TableDataResponse)
+async def get_branch_data(
+    branch_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get table data as seen on a branch (base rows with the branch's overrides applied)"""
+    branch_service = _branch_service(db)
+    branch = await branch_service.get_branch(branch_id)
+    
+    after_id = decode_cursor(cursor, branch.table_id) if cursor else None
+    
+    # Fetch one extra row to know whether another page exists
+    _, table, rows = await branch_service.get_branch_page(branch_id, skip, limit + 1, after_id)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    rows_data = [DomainMapper.row_to_dict(row, table.columns) for row in rows]
+    next_cursor = next_cursor_for(table.id, rows[-1].id if rows else None, has_more)
+    
+    return TableDataResponse(table_id=table.id, rows=rows_data, next_cursor=next_cursor)
+
+
+@router.patch("/{branch_id}/rows/{row_id}")
+async def update_branch_row(
+    branch_id: int,
+    row_id: int,
+    request: UpdateBranchRowRequest,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Override row cells on a branch (the base table is untouched)"""
+    row = await _branch_service(db).update_row(branch_id, row_id, request.cells)
+    
+    # Get table columns for mapping
+    table = await TableRepository(db).get_by_id(row.table_id)
+    return DomainMapper.row_to_dict(row, table.columns)
+
+
+@router.get("/{branch_id}/changes", response_model=BranchChangesResponse)
+async def get_branch_changes(
+    branch_id: int,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the cells overridden on a branch, with their base values"""
+    changes = await _branch_service(db).get_changes(branch_id)
+    return BranchChangesResponse(**changes)
+
+
+@router.get("/{branch_id}/merge", response_model=MergeResponse)
+async def preview_branch_merge(
+    branch_id: int,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Preview a three-way merge of the branch into its table (nothing is written)"""
+    report = await _merge_service(db).preview_branch_merge(branch_id)
+    return MergeResponse(**report)
+
+
+@router.post("/{branch_id}/merge", response_model=MergeResponse)
+async def merge_branch(
+    branch_id: int,
+    request: MergeBranchRequest,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Merge the branch into its table as a new version; conflicts fail with 409 unless a strategy resolves them"""
+    report = await _merge_service(db).merge_branch(
+        branch_id,
+        current_user.id,
+        strategy=request.strategy,
+        message=request.message
+    )
+    return MergeResponse(**report)
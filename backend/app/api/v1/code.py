@@ -1,14 +1,15 @@
 """
 Code generation API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.api.v1.dependencies import get_current_user
 from app.infrastructure.models.user import UserModel
 from app.infrastructure.repositories.table_repository import TableRepository
-from app.infrastructure.repositories.data_repository import DataRepository
+from app.di.providers import get_data_repository, get_code_generation_service
 from app.application.services.code_generation_service import CodeGenerationService
 from app.application.mappers.domain_mapper import DomainMapper
 
@@ -19,13 +20,15 @@ router = APIRouter()
 async def generate_code(
     table_id: int,
     format: str = Query(..., description="Code format: unity, unreal, json"),
+    if_none_match: Optional[str] = Header(None),
     current_user: UserModel = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    code_service: CodeGenerationService = Depends(get_code_generation_service)
 ):
     """Generate code for a table"""
     try:
         table_repo = TableRepository(db)
-        data_repo = DataRepository(db)
+        data_repo = get_data_repository(db)
         
         # Get table
         table = await table_repo.get_by_id(table_id)
@@ -35,22 +38,21 @@ async def generate_code(
                 detail="Table not found"
             )
         
-        # Get table data
-        rows = await data_repo.get_rows_by_table_id(table_id, skip=0, limit=1000)
+        # Unchanged table: the client already has this exact artifact
+        data_revision = await data_repo.get_data_revision(table_id)
+        etag = code_service.artifact_etag(table, format, data_revision)
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
         
-        # Prepare data for code generation
-        table_data = {
-            "name": table.name,
-            "rows": [DomainMapper.row_to_dict(row, table.columns) for row in rows]
-        }
+        async def load_rows():
+            # Get all table data, streamed in chunks so only row dicts are kept in memory
+            rows_data = []
+            async for rows in data_repo.stream_rows_by_table_id(table_id):
+                rows_data.extend(DomainMapper.row_to_dict(row, table.columns) for row in rows)
+            return rows_data
         
-        schema = {
-            "columns": [DomainMapper.column_to_dict(col) for col in table.columns]
-        }
-        
-        # Generate code
-        code_service = CodeGenerationService()
-        code = code_service.generate_code(format, table_data, schema)
+        # Generate code (served from the artifact cache when schema and data are unchanged)
+        artifact = await code_service.get_artifact(table, format, data_revision, load_rows)
         
         # Determine file extension and MIME type
         file_ext = "cs" if format == "unity" else "json" if format == "json" else "json"
@@ -59,10 +61,15 @@ async def generate_code(
         filename = f"{table.name}.{file_ext}"
         
         return Response(
-            content=code,
+            content=artifact.content,
             media_type=mime_type,
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "ETag": artifact.etag
+            }
         )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
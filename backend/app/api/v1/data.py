@@ -1,18 +1,34 @@
 """
 Data API endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import json
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.api.v1.dependencies import get_current_user
 from app.infrastructure.models.user import UserModel
-from app.schemas.request.data import UpdateCellRequest, CreateRowRequest, UpdateRowRequest
+from app.core.exceptions import GDHException
+from app.schemas.request.data import (
+    UpdateCellRequest, CreateRowRequest, UpdateRowRequest, BulkCreateRowsRequest, BatchCellPatchRequest,
+    ValidateRowsRequest
+)
 from app.schemas.response.table import TableDataResponse
+from app.schemas.response.data import (
+    BulkCreateRowsResponse, BatchCellPatchResponse, RowValidationResponse, DanglingReferencesResponse
+)
 from app.application.services.data_service import DataService
-from app.infrastructure.repositories.data_repository import DataRepository
+from app.di.providers import get_data_repository
 from app.infrastructure.repositories.table_repository import TableRepository
+from app.infrastructure.repositories.version_repository import VersionRepository
+from app.infrastructure.repositories.snapshot_repository import SnapshotRepository
+from app.infrastructure.repositories.staged_change_repository import StagedChangeRepository
+from app.application.services.snapshot_service import SnapshotService
+from app.application.services.expansion_service import ExpansionService
 from app.application.mappers.domain_mapper import DomainMapper
+from app.utils.pagination import decode_cursor, next_cursor_for
+from app.utils.etag import version_etag, parse_if_match
 
 router = APIRouter()
 
@@ -22,17 +38,86 @@ async def get_table_data(
     table_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    as_of_version: Optional[int] = Query(None, ge=1, description="Read the table as it was right after this version"),
+    expand: Optional[str] = Query(
+        None,
+        description="Reference columns to inline, comma separated; dotted paths expand nested references (Item.Material)"
+    ),
+    filters: Optional[List[str]] = Query(
+        None,
+        alias="filter",
+        description="Row filter like Damage>50 or Name~sword (operators = != > >= < <= ~, value null); repeat to combine"
+    ),
+    sort: Optional[str] = Query(None, description="Columns to sort by, comma separated, - prefix for descending (-Level,Name)"),
+    fields: Optional[str] = Query(None, description="Columns to return, comma separated (all if omitted)"),
     current_user: UserModel = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get table data (rows)"""
-    data_repo = DataRepository(db)
+    """
+    Get table data (rows) - keyset paginated with `cursor`, offset paginated otherwise
+    `filter`, `sort` and `fields` are evaluated in the database against the columns' types
+    """
+    data_repo = get_data_repository(db)
     table_repo = TableRepository(db)
     data_service = DataService(data_repo, table_repo)
     
-    rows = await data_service.get_table_data(table_id, skip, limit)
+    after_id = decode_cursor(cursor, table_id) if cursor else None
+    
+    queried = bool(filters) or bool(sort) or fields is not None
+    
+    # Fetch one extra row to know whether another page exists
+    if as_of_version is None and queried:
+        table, columns, rows = await data_service.query_table_page(
+            table_id, filters, sort, fields, skip, limit + 1, after_id
+        )
+    elif as_of_version is None:
+        table, rows = await data_service.get_table_page(table_id, skip, limit + 1, after_id)
+        columns = table.columns
+    elif queried:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="filter, sort and fields cannot be combined with as_of_version"
+        )
+    else:
+        table = await table_repo.get_by_id(table_id)
+        if not table:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Table not found"
+            )
+        snapshot_service = SnapshotService(SnapshotRepository(db), VersionRepository(db), data_repo)
+        rows = await snapshot_service.get_rows_as_of(table_id, as_of_version, skip, limit + 1, after_id)
+        columns = table.columns
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    rows_data = [DomainMapper.row_to_dict(row, columns, include_version=as_of_version is None) for row in rows]
+    if expand:
+        expansion = ExpansionService(data_repo, table_repo)
+        await expansion.expand(rows_data, await expansion.parse(table, expand))
+    # Sorted pages are not in ID order, so they have no keyset cursor (page with skip)
+    next_cursor = next_cursor_for(table_id, rows[-1].id if rows else None, has_more and not sort)
+    
+    return TableDataResponse(table_id=table_id, rows=rows_data, next_cursor=next_cursor)
+
+
+@router.get("/table/{table_id}/stream")
+async def stream_table_data(
+    table_id: int,
+    chunk_size: int = Query(1000, ge=1, le=10000),
+    expand: Optional[str] = Query(
+        None,
+        description="Reference columns to inline, comma separated; dotted paths expand nested references (Item.Material)"
+    ),
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Export all rows of a table as NDJSON (one row object per line), streamed in chunks"""
+    data_repo = get_data_repository(db)
+    table_repo = TableRepository(db)
+    data_service = DataService(data_repo, table_repo)
     
-    # Get table columns for mapping
     table = await table_repo.get_by_id(table_id)
     if not table:
         raise HTTPException(
@@ -40,9 +125,21 @@ async def get_table_data(
             detail="Table not found"
         )
     
-    rows_data = [DomainMapper.row_to_dict(row, table.columns) for row in rows]
+    # Parsed before streaming starts, so a bad expand is a 400 rather than a broken stream
+    expansion = ExpansionService(data_repo, table_repo)
+    tree = await expansion.parse(table, expand)
+    
+    async def ndjson_chunks():
+        async for rows in data_service.stream_table_data(table_id, chunk_size):
+            rows_data = [DomainMapper.row_to_dict(row, table.columns) for row in rows]
+            await expansion.expand(rows_data, tree)
+            yield "".join(json.dumps(row, default=str) + "\n" for row in rows_data)
     
-    return TableDataResponse(table_id=table_id, rows=rows_data)
+    return StreamingResponse(
+        ndjson_chunks(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{table.name}.ndjson"'}
+    )
 
 
 @router.post("/rows", status_code=status.HTTP_201_CREATED)
@@ -53,13 +150,14 @@ async def create_row(
 ):
     """Create a new row"""
     try:
-        data_repo = DataRepository(db)
+        data_repo = get_data_repository(db)
         table_repo = TableRepository(db)
-        data_service = DataService(data_repo, table_repo)
+        data_service = DataService(data_repo, table_repo, StagedChangeRepository(db))
         
         row = await data_service.create_row(
             table_id=request.table_id,
-            cells=request.cells
+            cells=request.cells,
+            user_id=current_user.id
         )
         
         # Get table columns for mapping
@@ -72,6 +170,11 @@ async def create_row(
         
         row_dict = DomainMapper.row_to_dict(row, table.columns)
         return row_dict
+    except GDHException:
+        await db.rollback()
+        raise
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -82,22 +185,92 @@ async def create_row(
         )
 
 
+@router.post("/tables/{table_id}/rows:bulk", response_model=BulkCreateRowsResponse, status_code=status.HTTP_201_CREATED)
+async def create_rows_bulk(
+    table_id: int,
+    request: BulkCreateRowsRequest,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk create rows (validated as a batch, inserted in chunked transactions)"""
+    try:
+        data_repo = get_data_repository(db)
+        table_repo = TableRepository(db)
+        data_service = DataService(data_repo, table_repo, StagedChangeRepository(db))
+        
+        result = await data_service.create_rows(
+            table_id=table_id,
+            rows=request.rows,
+            chunk_size=request.chunk_size,
+            user_id=current_user.id
+        )
+        
+        return BulkCreateRowsResponse(**result)
+    except GDHException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create rows: {str(e)}"
+        )
+
+
+@router.post("/tables/{table_id}/rows:validate", response_model=RowValidationResponse)
+async def validate_rows(
+    table_id: int,
+    request: ValidateRowsRequest,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Validate rows column by column without inserting them (error report with row/column coordinates)"""
+    data_repo = get_data_repository(db)
+    table_repo = TableRepository(db)
+    data_service = DataService(data_repo, table_repo)
+    
+    result = await data_service.validate_rows(table_id=table_id, rows=request.rows)
+    return RowValidationResponse(**result)
+
+
+@router.get("/tables/{table_id}/references:dangling", response_model=DanglingReferencesResponse)
+async def get_dangling_references(
+    table_id: int,
+    limit: int = Query(1000, ge=1, le=10000),
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """List reference values of a table that point at rows that do not exist (e.g. deleted with force)"""
+    data_repo = get_data_repository(db)
+    table_repo = TableRepository(db)
+    data_service = DataService(data_repo, table_repo)
+    
+    result = await data_service.find_dangling_references(table_id=table_id, limit=limit)
+    return DanglingReferencesResponse(**result)
+
+
 @router.patch("/rows/{row_id}", status_code=status.HTTP_200_OK)
 async def update_row(
     row_id: int,
     request: UpdateRowRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None, description='Row ETag, e.g. "row-12-v3"; the update fails with 412 if the row changed'),
     current_user: UserModel = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update row cells"""
+    """Update row cells (conditional with If-Match)"""
     try:
-        data_repo = DataRepository(db)
+        data_repo = get_data_repository(db)
         table_repo = TableRepository(db)
-        data_service = DataService(data_repo, table_repo)
+        data_service = DataService(data_repo, table_repo, StagedChangeRepository(db))
         
         row = await data_service.update_row(
             row_id=row_id,
-            cells=request.cells
+            cells=request.cells,
+            user_id=current_user.id,
+            expected_version=parse_if_match(if_match, "row", row_id)
         )
         
         # Get table columns for mapping
@@ -108,8 +281,14 @@ async def update_row(
                 detail="Table not found"
             )
         
-        row_dict = DomainMapper.row_to_dict(row, table.columns)
+        response.headers["ETag"] = version_etag("row", row.id, row.version)
+        row_dict = DomainMapper.row_to_dict(row, table.columns, include_version=True)
         return row_dict
+    except GDHException:
+        await db.rollback()
+        raise
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -123,19 +302,25 @@ async def update_row(
 @router.delete("/rows/{row_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_row(
     row_id: int,
+    force: bool = Query(False, description="Delete even if reference columns point at the row (they are left dangling)"),
     current_user: UserModel = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete a row"""
+    """Delete a row (409 while other rows still reference it, unless forced)"""
     try:
-        data_repo = DataRepository(db)
-        success = await data_repo.delete_row(row_id)
+        data_repo = get_data_repository(db)
+        table_repo = TableRepository(db)
+        data_service = DataService(data_repo, table_repo, StagedChangeRepository(db))
+        success = await data_service.delete_row(row_id, force=force, user_id=current_user.id)
         
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Row not found"
             )
+    except GDHException:
+        await db.rollback()
+        raise
     except HTTPException:
         raise
     except Exception as e:
@@ -149,22 +334,29 @@ async def delete_row(
 @router.patch("/cell", status_code=status.HTTP_200_OK)
 async def update_cell(
     request: UpdateCellRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None, description='Cell ETag, e.g. "cell-40-v7"; the update fails with 412 if the cell changed'),
     current_user: UserModel = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update cell value"""
+    """Update cell value (conditional with If-Match)"""
     try:
-        data_repo = DataRepository(db)
+        data_repo = get_data_repository(db)
         table_repo = TableRepository(db)
-        data_service = DataService(data_repo, table_repo)
+        data_service = DataService(data_repo, table_repo, StagedChangeRepository(db))
         
         cell = await data_service.update_cell_value(
             cell_id=request.cell_id,
             new_value=request.value,
-            user_id=current_user.id
+            user_id=current_user.id,
+            expected_version=parse_if_match(if_match, "cell", request.cell_id)
         )
         
-        return {"cell_id": cell.id, "value": cell.value, "message": "Cell updated successfully"}
+        response.headers["ETag"] = version_etag("cell", cell.id, cell.version)
+        return {"cell_id": cell.id, "value": cell.value, "version": cell.version, "message": "Cell updated successfully"}
+    except GDHException:
+        await db.rollback()
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -174,3 +366,32 @@ async def update_cell(
             detail=f"Failed to update cell: {str(e)}"
         )
 
+
+@router.patch("/cells:batch", response_model=BatchCellPatchResponse, status_code=status.HTTP_200_OK)
+async def patch_cells_batch(
+    request: BatchCellPatchRequest,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Write many cells in one transaction (e.g. a spreadsheet paste), with a result per operation"""
+    try:
+        data_repo = get_data_repository(db)
+        table_repo = TableRepository(db)
+        data_service = DataService(data_repo, table_repo, StagedChangeRepository(db))
+        
+        result = await data_service.patch_cells(
+            [operation.model_dump() for operation in request.operations],
+            user_id=current_user.id
+        )
+        return BatchCellPatchResponse(**result)
+    except GDHException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to patch cells: {str(e)}"
+        )
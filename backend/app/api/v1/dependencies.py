@@ -4,9 +4,9 @@ API dependencies for authentication and authorization
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from app.core.security import decode_access_token
 from app.core.exceptions import UnauthorizedError
 from app.infrastructure.models.user import UserModel
+from app.infrastructure.cache.principal_cache import principal_cache
 from app.core.database import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -18,8 +18,8 @@ async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ) -> UserModel:
-    """Get current authenticated user"""
-    payload = decode_access_token(token)
+    """Get current authenticated user (served from the principal cache when warm)"""
+    payload = principal_cache.decode_token(token)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,9 +35,12 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    stmt = select(UserModel).where(UserModel.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    async def load_user() -> Optional[UserModel]:
+        stmt = select(UserModel).where(UserModel.id == user_id)
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    user = await principal_cache.get_user(user_id, load_user)
     
     if user is None:
         raise HTTPException(
@@ -46,5 +49,12 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Inactive user",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     return user
 
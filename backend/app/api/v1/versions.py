@@ -1,17 +1,26 @@
 """
 Versions API endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+import json
+from typing import List, Optional
+from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.exceptions import GDHException
 from app.core.database import get_db
 from app.api.v1.dependencies import get_current_user
+from app.di.providers import get_data_repository
 from app.infrastructure.models.user import UserModel
 from app.schemas.request.version import CreateCommitRequest
-from app.schemas.response.version import VersionResponse, DiffResponse
+from app.schemas.response.version import VersionResponse, DiffResponse, RollbackResponse, StagedChangesResponse, VersionChangeResponse, TableBlameResponse
 from app.application.services.version_service import VersionService
 from app.infrastructure.repositories.version_repository import VersionRepository
-from app.infrastructure.repositories.data_repository import DataRepository
+from app.infrastructure.repositories.table_repository import TableRepository
+from app.infrastructure.repositories.snapshot_repository import SnapshotRepository
+from app.infrastructure.repositories.staged_change_repository import StagedChangeRepository
+from app.application.services.snapshot_service import SnapshotService
+from app.utils.pagination import decode_cursor
 
 router = APIRouter()
 
@@ -24,15 +33,20 @@ async def create_commit(
 ):
     """Create a new version/commit"""
     version_repo = VersionRepository(db)
-    data_repo = DataRepository(db)
-    version_service = VersionService(version_repo, data_repo)
+    data_repo = get_data_repository(db)
+    snapshot_service = SnapshotService(SnapshotRepository(db), version_repo, data_repo)
+    version_service = VersionService(
+        version_repo,
+        data_repo,
+        snapshot_service=snapshot_service,
+        staged_change_repository=StagedChangeRepository(db)
+    )
     
     version = await version_service.create_commit(
         project_id=request.project_id,
         table_id=request.table_id,
         message=request.message,
-        author_id=current_user.id,
-        changes=request.changes
+        author_id=current_user.id
     )
     
     return VersionResponse(
@@ -46,6 +60,23 @@ async def create_commit(
     )
 
 
+@router.get("/staged", response_model=StagedChangesResponse)
+async def get_staged_changes(
+    project_id: int = Query(..., ge=1),
+    table_id: Optional[int] = Query(None, ge=1),
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the current user's changes captured since their last commit"""
+    version_repo = VersionRepository(db)
+    data_repo = get_data_repository(db)
+    version_service = VersionService(version_repo, data_repo, staged_change_repository=StagedChangeRepository(db))
+    
+    changes = await version_service.get_staged_changes(current_user.id, project_id, table_id)
+    
+    return StagedChangesResponse(project_id=project_id, table_id=table_id, changes=changes)
+
+
 @router.get("/project/{project_id}", response_model=List[VersionResponse])
 async def get_versions_by_project(
     project_id: int,
@@ -72,6 +103,67 @@ async def get_versions_by_project(
     ]
 
 
+async def _change_history(db: AsyncSession, skip: int, limit: int, **key) -> List[VersionChangeResponse]:
+    """Shared body of the history endpoints"""
+    version_service = VersionService(VersionRepository(db), get_data_repository(db))
+    changes = await version_service.get_change_history(skip=skip, limit=limit, **key)
+    return [VersionChangeResponse(**vars(change)) for change in changes]
+
+
+@router.get("/history/cell/{cell_id}", response_model=List[VersionChangeResponse])
+async def get_cell_history(
+    cell_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the versions that changed a cell, newest first"""
+    return await _change_history(db, skip, limit, cell_id=cell_id)
+
+
+@router.get("/history/row/{row_id}", response_model=List[VersionChangeResponse])
+async def get_row_history(
+    row_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the cell changes of a row, newest version first"""
+    return await _change_history(db, skip, limit, row_id=row_id)
+
+
+@router.get("/history/column/{column_id}", response_model=List[VersionChangeResponse])
+async def get_column_history(
+    column_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the cell changes of a column, newest version first"""
+    return await _change_history(db, skip, limit, column_id=column_id)
+
+
+@router.get("/blame/table/{table_id}", response_model=TableBlameResponse)
+async def get_table_blame(
+    table_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from GET /data/table/{table_id}, to blame the same page"),
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get who last changed each cell, for the same row page as GET /data/table/{table_id}"""
+    version_service = VersionService(VersionRepository(db), get_data_repository(db), TableRepository(db))
+    
+    after_id = decode_cursor(cursor, table_id) if cursor else None
+    blame = await version_service.get_table_blame(table_id, skip, limit, after_id)
+    
+    return TableBlameResponse(**blame)
+
+
 @router.get("/{version_id}/diff", response_model=DiffResponse)
 async def get_diff(
     version_id: int,
@@ -80,7 +172,7 @@ async def get_diff(
 ):
     """Get diff for a version"""
     version_repo = VersionRepository(db)
-    data_repo = DataRepository(db)
+    data_repo = get_data_repository(db)
     version_service = VersionService(version_repo, data_repo)
     
     diff_data = await version_service.get_diff(version_id)
@@ -88,24 +180,65 @@ async def get_diff(
     return DiffResponse(**diff_data)
 
 
-@router.post("/{version_id}/rollback", status_code=status.HTTP_200_OK)
+@router.post("/{version_id}/rollback", response_model=RollbackResponse, status_code=status.HTTP_200_OK)
 async def rollback_version(
     version_id: int,
+    chunk_size: int = Query(1000, ge=1, le=10000),
+    stream: bool = Query(False, description="Stream NDJSON progress lines ({done, total} per chunk) before the result"),
     current_user: UserModel = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Rollback to a version"""
+    """Rollback a version (single transaction, recorded as a new version)"""
     version_repo = VersionRepository(db)
-    data_repo = DataRepository(db)
-    version_service = VersionService(version_repo, data_repo)
+    data_repo = get_data_repository(db)
+    table_repo = TableRepository(db)
+    snapshot_service = SnapshotService(SnapshotRepository(db), version_repo, data_repo)
+    version_service = VersionService(
+        version_repo,
+        data_repo,
+        table_repo,
+        snapshot_service,
+        staged_change_repository=StagedChangeRepository(db)
+    )
     
-    success = await version_service.rollback(version_id, current_user.id)
+    if not stream:
+        stats = await version_service.rollback(version_id, current_user.id, chunk_size=chunk_size)
+        return RollbackResponse(message="Rollback successful", **stats)
     
-    if success:
-        return {"message": "Rollback successful"}
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Rollback failed"
-        )
+    # Checked before streaming starts, so a missing or foreign version is a 404/403 rather than a broken stream
+    await version_service.get_rollback_target(version_id, current_user.id)
+    
+    async def progress_lines():
+        # The rollback reports progress synchronously; the queue hands it to the response as it happens
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def run():
+            try:
+                stats = await version_service.rollback(
+                    version_id,
+                    current_user.id,
+                    chunk_size=chunk_size,
+                    on_progress=lambda done, total: queue.put_nowait({"done": done, "total": total})
+                )
+                # Committed before the result line, so a client that saw it knows the rollback is durable
+                await db.commit()
+                queue.put_nowait(RollbackResponse(message="Rollback successful", **stats).model_dump())
+            except GDHException as error:
+                await db.rollback()
+                queue.put_nowait({"error": error.message, "status_code": error.status_code})
+            except Exception:
+                await db.rollback()
+                queue.put_nowait({"error": "Rollback failed", "status_code": 500})
+            queue.put_nowait(None)
+        
+        task = asyncio.create_task(run())
+        try:
+            while (line := await queue.get()) is not None:
+                yield json.dumps(line) + "\n"
+        finally:
+            # A client that disconnects mid-stream abandons the transaction
+            if not task.done():
+                task.cancel()
+    
+    return StreamingResponse(progress_lines(), media_type="application/x-ndjson")
 
@@ -52,13 +52,15 @@ class DomainMapper:
         }
     
     @staticmethod
-    def row_to_dict(row: Row, columns: List[Column]) -> Dict[str, Any]:
-        """Convert row entity to dictionary"""
+    def row_to_dict(row: Row, columns: List[Column], include_version: bool = False) -> Dict[str, Any]:
+        """Convert row entity to dictionary (the version is for editing clients, not exports)"""
         data = {
             "id": row.id,
             "table_id": row.table_id,
             "cells": {}
         }
+        if include_version:
+            data["version"] = row.version
         
         # Map cells by column name for easier frontend consumption
         for column in columns:
@@ -3,12 +3,13 @@ Authentication service
 """
 from typing import Optional
 from datetime import timedelta
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import verify_password_async, get_password_hash_async, create_access_token
 from app.core.config import get_settings
 from app.domain.interfaces.services import IAuthService
 from app.infrastructure.models.user import UserModel
+from app.infrastructure.cache.principal_cache import principal_cache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 settings = get_settings()
 
@@ -33,7 +34,7 @@ class AuthService(IAuthService):
             return None
         
         # Verify password
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return None
         
         # Create access token
@@ -59,7 +60,7 @@ class AuthService(IAuthService):
             raise ValueError("Username or email already exists")
         
         # Create new user
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash_async(password)
         new_user = UserModel(
             username=username,
             email=email,
@@ -77,4 +78,17 @@ class AuthService(IAuthService):
             "username": new_user.username,
             "email": new_user.email
         }
+    
+    async def set_user_active(self, user_id: int, is_active: bool) -> bool:
+        """Activate or deactivate a user and drop their cached principal and tokens"""
+        if not self.session:
+            raise ValueError("Database session not available")
+        
+        stmt = update(UserModel).where(UserModel.id == user_id).values(is_active=is_active)
+        result = await self.session.execute(stmt)
+        if result.rowcount == 0:
+            return False
+        
+        principal_cache.invalidate_user(user_id, self.session)
+        return True
 
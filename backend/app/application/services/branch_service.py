@@ -0,0 +1,140 @@
+"""
+Branch service
+Branches are copy-on-write: creating one is O(1) and a branch stores only the
+cells overridden on it, read back merged over the live base table
+"""
+from typing import Optional, List, Dict, Any, Tuple
+from app.core.exceptions import NotFoundError, ValidationError, ConflictError, ForbiddenError
+from app.domain.entities.branch import Branch
+from app.domain.entities.cell import Row
+from app.domain.entities.table import Table
+from app.domain.interfaces.repositories import IBranchRepository, ITableRepository, IDataRepository, IVersionRepository
+from app.application.validators.row_validator import RowValidator, get_row_validator
+from app.application.services.reference_index_service import ReferenceIndexService
+
+
+class BranchService:
+    """Branch service implementation"""
+    
+    def __init__(
+        self,
+        branch_repository: IBranchRepository,
+        table_repository: ITableRepository,
+        data_repository: IDataRepository,
+        version_repository: Optional[IVersionRepository] = None
+    ):
+        # Branch overrides are merged over the cells table
+        data_repository.require_cell_ids("Branching")
+        self.branch_repository = branch_repository
+        self.table_repository = table_repository
+        self.data_repository = data_repository
+        self.version_repository = version_repository
+    
+    async def create_branch(self, table_id: int, name: str, description: Optional[str], user_id: int) -> Branch:
+        """Create a branch of a table - no data is copied"""
+        table = await self.table_repository.get_by_id(table_id)
+        if not table:
+            raise NotFoundError("Table", str(table_id))
+        
+        existing = await self.branch_repository.get_by_table_id(table_id)
+        if any(branch.name == name for branch in existing):
+            raise ConflictError(f"Branch '{name}' already exists on this table")
+        
+        base_version_id = None
+        if self.version_repository:
+            base_version_id = await self.version_repository.get_latest_table_version_id(table_id)
+        
+        try:
+            branch = Branch(
+                table_id=table_id,
+                name=name,
+                description=description,
+                created_by=user_id,
+                base_version_id=base_version_id
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
+        return await self.branch_repository.create(branch)
+    
+    async def get_branch(self, branch_id: int) -> Branch:
+        """Get a branch by ID"""
+        branch = await self.branch_repository.get_by_id(branch_id)
+        if not branch:
+            raise NotFoundError("Branch", str(branch_id))
+        return branch
+    
+    async def get_table_branches(self, table_id: int) -> List[Branch]:
+        """Get branches of a table"""
+        return await self.branch_repository.get_by_table_id(table_id)
+    
+    async def delete_branch(self, branch_id: int, user_id: int) -> bool:
+        """Delete a branch and its overrides; the base table is untouched"""
+        branch = await self.get_branch(branch_id)
+        
+        # Check authorization (simplified)
+        if branch.created_by != user_id:
+            raise ForbiddenError("You can only delete your own branches")
+        
+        return await self.branch_repository.delete(branch_id)
+    
+    async def get_branch_page(
+        self,
+        branch_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> Tuple[Branch, Table, List[Row]]:
+        """Get a branch with its table and one page of rows as seen on the branch"""
+        branch = await self.get_branch(branch_id)
+        table = await self.table_repository.get_by_id(branch.table_id)
+        if not table:
+            raise NotFoundError("Table", str(branch.table_id))
+        
+        rows = await self.branch_repository.get_rows(branch.id, table.id, skip, limit, after_id)
+        return branch, table, rows
+    
+    async def update_row(self, branch_id: int, row_id: int, cells: Dict[str, Any]) -> Row:
+        """Override row cells on a branch; the base table is untouched"""
+        branch = await self.get_branch(branch_id)
+        
+        table_id = await self.data_repository.get_row_table_id(row_id)
+        if table_id != branch.table_id:
+            raise NotFoundError("Row", str(row_id))
+        
+        table = await self.table_repository.get_by_id(table_id)
+        if not table:
+            raise NotFoundError("Table", str(table_id))
+        
+        validator = get_row_validator(table)
+        values, errors = validator.validate_row(cells, partial=True)
+        if errors:
+            raise ValidationError(RowValidator.describe(errors[0]))
+        await ReferenceIndexService(self.data_repository, self.table_repository).check_row(validator, values)
+        
+        await self.branch_repository.set_cells(branch.id, row_id, values)
+        rows = await self.branch_repository.get_rows(branch.id, table_id, limit=1, after_id=row_id - 1)
+        return rows[0]
+    
+    async def get_changes(self, branch_id: int) -> Dict[str, Any]:
+        """Get the cells overridden on a branch, keyed by column name"""
+        branch = await self.get_branch(branch_id)
+        table = await self.table_repository.get_by_id(branch.table_id)
+        if not table:
+            raise NotFoundError("Table", str(branch.table_id))
+        column_names = {column.id: column.name for column in table.columns}
+        
+        overrides = await self.branch_repository.get_overrides(branch.id)
+        return {
+            "branch_id": branch.id,
+            "table_id": branch.table_id,
+            "changes": [
+                {
+                    "row_id": override.row_id,
+                    "column": column_names.get(override.column_id),
+                    "base_value": override.base_value,
+                    "value": override.value
+                }
+                for override in overrides
+                if override.column_id in column_names
+            ]
+        }
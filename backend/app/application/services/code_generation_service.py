@@ -2,8 +2,12 @@
 Code generation service
 Orchestrates code generators
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+from app.domain.entities.table import Table
 from app.domain.interfaces.code_generators import ICodeGenerator
+from app.application.mappers.domain_mapper import DomainMapper
+from app.infrastructure.cache.artifact_cache import ArtifactCache, Artifact, artifact_cache
+from app.infrastructure.cache.single_flight import single_flight
 from app.infrastructure.code_generators.unity_generator import UnityGenerator
 from app.infrastructure.code_generators.unreal_generator import UnrealGenerator
 from app.infrastructure.code_generators.json_generator import JSONGenerator
@@ -12,12 +16,13 @@ from app.infrastructure.code_generators.json_generator import JSONGenerator
 class CodeGenerationService:
     """Code generation service"""
     
-    def __init__(self):
+    def __init__(self, artifacts: Optional[ArtifactCache] = None):
         self._generators: Dict[str, ICodeGenerator] = {
             "unity": UnityGenerator(),
             "unreal": UnrealGenerator(),
             "json": JSONGenerator()
         }
+        self._artifacts = artifacts or artifact_cache
     
     def generate_code(
         self,
@@ -32,6 +37,60 @@ class CodeGenerationService:
         
         return generator.generate(table_data, schema)
     
+    def artifact_key(self, table: Table, generator_type: str, data_revision: str) -> str:
+        """Content address of the artifact for the table's schema, data revision and template"""
+        generator = self._generators.get(generator_type.lower())
+        if not generator:
+            raise ValueError(f"Unknown generator type: {generator_type}")
+        columns = [DomainMapper.column_to_dict(col) for col in table.columns]
+        return ArtifactCache.make_key(
+            table.id,
+            ArtifactCache.schema_hash(columns),
+            data_revision,
+            generator_type,
+            generator.get_template_revision()
+        )
+    
+    def artifact_etag(self, table: Table, generator_type: str, data_revision: str) -> str:
+        """Strong ETag of the table's current artifact (computable without rendering)"""
+        return ArtifactCache.etag_for(self.artifact_key(table, generator_type, data_revision))
+    
+    async def get_artifact(
+        self,
+        table: Table,
+        generator_type: str,
+        data_revision: str,
+        load_rows: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> Artifact:
+        """Get the generated artifact from cache, rendering it (and loading rows) only on a miss"""
+        key = self.artifact_key(table, generator_type, data_revision)
+        artifact = self._artifacts.get(key)
+        if artifact is not None:
+            return artifact
+        
+        async def render() -> Artifact:
+            table_data = {
+                "name": table.name,
+                "rows": await load_rows()
+            }
+            schema = {
+                "columns": [DomainMapper.column_to_dict(col) for col in table.columns]
+            }
+            
+            rendered = Artifact(
+                content=self.generate_code(generator_type, table_data, schema),
+                etag=ArtifactCache.etag_for(key)
+            )
+            self._artifacts.set(table.id, key, rendered)
+            return rendered
+        
+        # Build agents polling an unchanged table at the same moment share one render
+        return await single_flight.do(key, render)
+    
+    def invalidate_table(self, table_id: int):
+        """Drop cached artifacts of a table"""
+        self._artifacts.invalidate_table(table_id)
+    
     def get_supported_generators(self) -> List[str]:
         """Get list of supported generator types"""
         return list(self._generators.keys())
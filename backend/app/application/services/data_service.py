@@ -1,111 +1,592 @@
 """
 Data service
 """
-from typing import List, Any, Dict
-from app.domain.entities.cell import Row, Cell
+import time
+from itertools import repeat
+from typing import List, Any, Dict, Optional, AsyncIterator, Tuple
+from app.domain.entities.cell import Row, Cell, CellChange
+from app.domain.entities.table import Table, Column
+from app.domain.entities.version import StagedChange
 from app.domain.interfaces.services import IDataService
-from app.domain.interfaces.repositories import IDataRepository, ITableRepository
-from app.core.exceptions import NotFoundError, ValidationError
+from app.domain.interfaces.repositories import IDataRepository, ITableRepository, IStagedChangeRepository
+from app.core.exceptions import NotFoundError, ValidationError, PreconditionFailedError, ConflictError
 from app.domain.value_objects.data_types import DataType, DataTypeDefinition
+from app.application.validators.row_validator import RowValidator, CompiledColumn, get_row_validator
+from app.application.validators.columnar_validator import ColumnarValidator
+from app.application.validators.query_parser import parse_row_query
+from app.application.services.reference_index_service import ReferenceIndexService, missing_reference_message
+from app.infrastructure.cache.invalidation import table_tag
+from app.infrastructure.cache.single_flight import single_flight
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Maximum number of error groups (column + message) reported back for a rejected batch
+MAX_REPORTED_ERRORS = 20
+# Row numbers listed per error group in that message
+MAX_REPORTED_ROWS_PER_ERROR = 10
+# Referencing rows named when a delete is refused
+MAX_REPORTED_REFERRERS = 5
 
 
 class DataService(IDataService):
     """Data service implementation"""
     
-    def __init__(self, data_repository: IDataRepository, table_repository: ITableRepository):
+    def __init__(
+        self,
+        data_repository: IDataRepository,
+        table_repository: ITableRepository,
+        staged_change_repository: Optional[IStagedChangeRepository] = None
+    ):
         self.data_repository = data_repository
         self.table_repository = table_repository
+        self.staged_change_repository = staged_change_repository
+        self.reference_index = ReferenceIndexService(data_repository, table_repository)
     
-    async def update_cell_value(self, cell_id: int, new_value: Any, user_id: int) -> Cell:
-        """Update cell value with validation"""
-        # Get cell
-        cell = await self.data_repository.get_cell_by_id(cell_id)
-        if not cell:
-            raise NotFoundError("Cell", str(cell_id))
+    async def update_cell_value(
+        self,
+        cell_id: int,
+        new_value: Any,
+        user_id: int,
+        expected_version: Optional[int] = None
+    ) -> Cell:
+        """
+        Update cell value with validation; the change is staged for the user's next commit
+        The value is coerced and checked against its column like any row write.
+        With `expected_version` the write only happens if nobody changed the cell since
+        """
+        self.data_repository.require_cell_ids("Updating a cell by ID")
         
-        # Get column for validation (simplified - would need column repository)
-        # For now, basic validation
-        if new_value is not None and not isinstance(new_value, (str, int, float, bool)):
-            raise ValidationError("Invalid cell value type")
-        
-        # Update cell
-        cell.update_value(new_value)
-        return await self.data_repository.update_cell(cell)
-    
-    async def get_table_data(self, table_id: int, skip: int = 0, limit: int = 100) -> List[Row]:
-        """Get table data (rows)"""
-        # Verify table exists
+        location = (await self.data_repository.get_cell_locations([cell_id])).get(cell_id)
+        if location is None:
+            raise NotFoundError("Cell", str(cell_id))
+        table_id, _, column_id = location
         table = await self.table_repository.get_by_id(table_id)
         if not table:
             raise NotFoundError("Table", str(table_id))
         
-        return await self.data_repository.get_rows_by_table_id(table_id, skip, limit)
+        validator = get_row_validator(table)
+        column = validator.by_id.get(column_id)
+        if column is None:
+            raise NotFoundError("Column", str(column_id))
+        try:
+            value = column.coerce(new_value)
+        except ValidationError as e:
+            raise ValidationError(f"Column '{column.name}': {e.message}")
+        await self.reference_index.check_row(validator, {column_id: value})
+        
+        # The write returns the previous value, so no read is needed to build the diff
+        expected_versions = {cell_id: expected_version} if expected_version is not None else None
+        changes = await self.data_repository.update_cell_values({cell_id: value}, expected_versions)
+        if not changes:
+            cell = await self.data_repository.get_cell_by_id(cell_id) if expected_version is not None else None
+            if cell is None:
+                raise NotFoundError("Cell", str(cell_id))
+            raise PreconditionFailedError(
+                f"Cell {cell_id} was modified by someone else (version {cell.version}, expected {expected_version})"
+            )
+        change = changes[0]
+        
+        await self._stage(user_id, table_id, changes)
+        return Cell(
+            id=change.cell_id,
+            row_id=change.row_id,
+            column_id=change.column_id,
+            value=change.new_value,
+            version=change.version
+        )
+    
+    async def get_table_data(
+        self,
+        table_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Row]:
+        """Get table data (rows), by offset or after a keyset position"""
+        _, rows = await self.get_table_page(table_id, skip, limit, after_id)
+        return rows
+    
+    async def get_table_page(
+        self,
+        table_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> Tuple[Table, List[Row]]:
+        """
+        Get a table with one page of its rows
+        Pages are cached under the table's tag (repository writes evict them) and
+        concurrent identical misses are coalesced into a single set of queries
+        """
+        async def load() -> Tuple[Table, List[Row]]:
+            # Verify table exists
+            table = await self.table_repository.get_by_id(table_id)
+            if not table:
+                raise NotFoundError("Table", str(table_id))
+            
+            rows = await self.data_repository.get_rows_by_table_id(table_id, skip, limit, after_id)
+            return table, rows
+        
+        key = f"table_page:{table_id}:{skip}:{limit}:{after_id}"
+        return await single_flight.do_cached(
+            key,
+            load,
+            settings.TABLE_PAGE_CACHE_TTL_SECONDS,
+            tags=[table_tag(table_id)]
+        )
+    
+    async def query_table_page(
+        self,
+        table_id: int,
+        filters: Optional[List[str]] = None,
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> Tuple[Table, List[Column], List[Row]]:
+        """
+        Get a table with one page of the rows matching `filters`, ordered by `sort` and
+        projected to `fields`, returns (table, returned columns, rows)
+        The query runs in the database; pages are cached under the table's tag like plain reads
+        """
+        if sort and after_id is not None:
+            raise ValidationError("A cursor cannot be combined with sort, page with skip instead")
+        
+        async def load() -> Tuple[Table, List[Column], List[Row]]:
+            table = await self.table_repository.get_by_id(table_id)
+            if not table:
+                raise NotFoundError("Table", str(table_id))
+            
+            query = parse_row_query(table, filters, sort, fields)
+            rows = await self.data_repository.query_rows(table_id, query, skip, limit, after_id)
+            return table, query.fields if query.fields is not None else table.columns, rows
+        
+        key = f"table_query:{table_id}:{skip}:{limit}:{after_id}:{filters}:{sort}:{fields}"
+        return await single_flight.do_cached(
+            key,
+            load,
+            settings.TABLE_PAGE_CACHE_TTL_SECONDS,
+            tags=[table_tag(table_id)]
+        )
+    
+    async def stream_table_data(self, table_id: int, chunk_size: int = 1000) -> AsyncIterator[List[Row]]:
+        """Stream all rows of a table in chunks (memory stays flat for any table size)"""
+        async for chunk in self.data_repository.stream_rows_by_table_id(table_id, chunk_size):
+            yield chunk
     
-    async def create_row(self, table_id: int, cells: Dict[str, Any]) -> Row:
-        """Create a new row with cells"""
+    async def create_row(self, table_id: int, cells: Dict[str, Any], user_id: Optional[int] = None) -> Row:
+        """Create a new row with cells; with a user its creation is staged for their next commit"""
         # Verify table exists
         table = await self.table_repository.get_by_id(table_id)
         if not table:
             raise NotFoundError("Table", str(table_id))
         
+        # Defaults, required columns and value types come from the table's compiled validator
+        validator = get_row_validator(table)
+        values, errors = validator.validate_row(cells)
+        if errors:
+            raise ValidationError(RowValidator.describe(errors[0]))
+        await self.reference_index.check_row(validator, values)
+        
         # Create row
         row = Row(table_id=table_id)
         
         # Create cells for each column
-        for column in table.columns:
-            value = cells.get(column.name)
-            
-            # Use default value if not provided
-            if value is None and column.default_value is not None:
-                value = column.default_value
-            
-            # Validate required columns
-            if column.is_required and value is None:
-                raise ValidationError(f"Column '{column.name}' is required")
-            
+        for column_id, value in values.items():
             # Create cell (row_id will be set after row is created)
             # Temporarily set row_id to 0 to pass validation
             cell = Cell(
                 row_id=0,  # Will be set after row is created
-                column_id=column.id,
+                column_id=column_id,
                 value=value
             )
-            row.cells[column.id] = cell
+            row.cells[column_id] = cell
+        
+        created = await self.data_repository.create_row(row)
+        await self._stage_created_rows(user_id, table_id, [created])
+        return created
+    
+    async def create_rows(
+        self,
+        table_id: int,
+        rows: List[Dict[str, Any]],
+        chunk_size: int = 1000,
+        user_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate a whole batch in memory, then insert it chunk by chunk
+        Each chunk is written with set-based inserts and committed as its own transaction;
+        with a user the creation of its rows is staged along with it
+        """
+        table = await self.table_repository.get_by_id(table_id)
+        if not table:
+            raise NotFoundError("Table", str(table_id))
+        
+        started = time.perf_counter()
+        prepared, report = await self._validate_batch(table, rows)
+        if report["error_count"]:
+            raise ValidationError(self._describe_report(report))
+        
+        inserted_cells = 0
+        chunks = 0
+        for start in range(0, len(prepared), chunk_size):
+            chunk = prepared[start:start + chunk_size]
+            row_ids = await self.data_repository.create_rows(table_id, chunk)
+            if self._stages(user_id):
+                await self._stage_created_rows(
+                    user_id, table_id, await self.data_repository.get_rows_by_ids(table_id, row_ids)
+                )
+            await self.data_repository.commit()
+            inserted_cells += sum(len(values) for values in chunk)
+            chunks += 1
+        
+        elapsed = time.perf_counter() - started
+        return {
+            "table_id": table_id,
+            "inserted_rows": len(prepared),
+            "inserted_cells": inserted_cells,
+            "chunks": chunks,
+            "elapsed_seconds": round(elapsed, 4),
+            "rows_per_second": round(len(prepared) / elapsed, 1) if elapsed > 0 else 0.0
+        }
+    
+    async def validate_rows(self, table_id: int, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate a batch without writing it, returns the error report"""
+        table = await self.table_repository.get_by_id(table_id)
+        if not table:
+            raise NotFoundError("Table", str(table_id))
+        
+        started = time.perf_counter()
+        _, report = await self._validate_batch(table, rows)
+        return {"table_id": table_id, **report, "elapsed_seconds": round(time.perf_counter() - started, 4)}
+    
+    async def _validate_batch(
+        self,
+        table: Table,
+        rows: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[int, Any]], Dict[str, Any]]:
+        """
+        Validate rows against table columns column by column, returns (column_id -> value maps, report)
+        Reference values must be rows of the referenced tables: the IDs the batch uses are
+        looked up once per referenced table
+        """
+        validator = get_row_validator(table)
+        wanted: Dict[int, set] = {}
+        for column in validator.references:
+            wanted.setdefault(column.reference_table_id, set()).update(
+                value for value in map(dict.get, rows, repeat(column.name)) if isinstance(value, int)
+            )
+        reference_keys = {
+            table_id: await self.reference_index.existing_keys(table_id, ids) for table_id, ids in wanted.items()
+        }
+        return ColumnarValidator(validator).validate(rows, reference_keys)
+    
+    @staticmethod
+    def _describe_report(report: Dict[str, Any]) -> str:
+        """One-line summary of a batch error report"""
+        shown = []
+        for error in report["errors"][:MAX_REPORTED_ERRORS]:
+            rows = ", ".join(str(row) for row in error["rows"][:MAX_REPORTED_ROWS_PER_ERROR])
+            if error["count"] > MAX_REPORTED_ROWS_PER_ERROR:
+                rows += f", ... {error['count'] - MAX_REPORTED_ROWS_PER_ERROR} more"
+            shown.append(f"column '{error['column']}': {error['message']} (rows {rows})")
+        if len(report["errors"]) > MAX_REPORTED_ERRORS:
+            shown.append(f"... {len(report['errors']) - MAX_REPORTED_ERRORS} more")
+        return f"{report['error_count']} invalid values in batch: " + "; ".join(shown)
+    
+    async def patch_cells(self, operations: List[Dict[str, Any]], user_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Apply many cell writes at once, reporting a result per operation
+        Each operation addresses a cell by `cell_id` or by `row_id` + `column` (name), with
+        an optional expected cell `version`. Targets are resolved with two batched lookups,
+        values are validated against their column types, then existing cells are written
+        with one conditional bulk UPDATE and missing ones are created per row. Operations
+        that fail (unknown target, invalid value, stale version) are reported and skipped;
+        the rest are applied in the caller's transaction
+        """
+        started = time.perf_counter()
+        results: List[Dict[str, Any]] = [
+            {
+                "index": index,
+                "status": "updated",
+                "cell_id": op.get("cell_id"),
+                "row_id": op.get("row_id"),
+                "column": op.get("column")
+            }
+            for index, op in enumerate(operations)
+        ]
+        
+        def fail(index: int, status: str, error: str):
+            results[index].update(status=status, error=error)
+        
+        cell_locations = await self.data_repository.get_cell_locations(
+            [op["cell_id"] for op in operations if op.get("cell_id") is not None]
+        )
+        row_cells = await self.data_repository.get_row_cell_ids(
+            [op["row_id"] for op in operations if op.get("cell_id") is None]
+        )
+        validators: Dict[int, RowValidator] = {}
+        for table_id in {location[0] for location in cell_locations.values()} | {row[0] for row in row_cells.values()}:
+            table = await self.table_repository.get_by_id(table_id)
+            if table:
+                validators[table_id] = get_row_validator(table)
+        columns_by_id = {
+            column_id: column for validator in validators.values() for column_id, column in validator.by_id.items()
+        }
+        columns_by_name = {
+            (table_id, name): column
+            for table_id, validator in validators.items()
+            for name, column in validator.by_name.items()
+        }
         
-        return await self.data_repository.create_row(row)
+        # Resolve every operation to a cell (or a row + column for cells that do not exist yet);
+        # a later operation on the same target supersedes an earlier one
+        cell_targets: Dict[int, int] = {}
+        new_targets: Dict[Tuple[int, int], int] = {}
+        reference_ops: Dict[int, CompiledColumn] = {}
+        for index, op in enumerate(operations):
+            result = results[index]
+            if op.get("cell_id") is not None:
+                location = cell_locations.get(op["cell_id"])
+                if location is None:
+                    fail(index, "not_found", f"Cell {op['cell_id']} not found")
+                    continue
+                table_id, row_id, column_id = location
+                column = columns_by_id.get(column_id)
+                cell_id = op["cell_id"]
+            else:
+                row = row_cells.get(op["row_id"])
+                if row is None:
+                    fail(index, "not_found", f"Row {op['row_id']} not found")
+                    continue
+                table_id, cells = row
+                row_id = op["row_id"]
+                column = columns_by_name.get((table_id, op["column"]))
+                if column is None:
+                    fail(index, "not_found", f"Column '{op['column']}' not found")
+                    continue
+                cell_id = cells.get(column.id)
+            
+            if column is None:
+                fail(index, "not_found", f"Column of cell {cell_id} not found")
+                continue
+            result.update(table_id=table_id, row_id=row_id, column=column.name)
+            try:
+                value = column.coerce(op.get("value"))
+            except ValidationError as e:
+                fail(index, "invalid", f"Column '{column.name}': {e.message}")
+                continue
+            result["value"] = value
+            if column.reference_table_id is not None and value is not None:
+                reference_ops[index] = column
+            
+            if cell_id is not None:
+                previous = cell_targets.get(cell_id)
+                cell_targets[cell_id] = index
+            else:
+                if op.get("version") is not None:
+                    fail(index, "conflict", f"Cell of row {row_id}, column '{column.name}' does not exist yet")
+                    continue
+                previous = new_targets.get((row_id, column.id))
+                new_targets[(row_id, column.id)] = index
+            if previous is not None:
+                fail(previous, "superseded", f"Overwritten by operation {index}")
+        
+        # Reference values of the surviving operations: one lookup per referenced table
+        checked = [index for index in [*cell_targets.values(), *new_targets.values()] if index in reference_ops]
+        missing = await self.reference_index.find_missing(
+            [(reference_ops[index].reference_table_id, results[index]["value"]) for index in checked]
+        )
+        if missing:
+            dropped = set()
+            for position in missing:
+                index = checked[position]
+                column = reference_ops[index]
+                message = missing_reference_message(column.reference_table_id, results[index]["value"])
+                fail(index, "invalid", f"Column '{column.name}': {message}")
+                dropped.add(index)
+            cell_targets = {cell_id: index for cell_id, index in cell_targets.items() if index not in dropped}
+            new_targets = {target: index for target, index in new_targets.items() if index not in dropped}
+        
+        changes: List[CellChange] = []
+        if cell_targets:
+            written = await self.data_repository.update_cell_values(
+                {cell_id: results[index]["value"] for cell_id, index in cell_targets.items()},
+                {
+                    cell_id: operations[index]["version"]
+                    for cell_id, index in cell_targets.items()
+                    if operations[index].get("version") is not None
+                }
+            )
+            changes.extend(written)
+            for change in written:
+                results[cell_targets.pop(change.cell_id)].update(cell_id=change.cell_id, version=change.version)
+            # Whatever was not written changed (or disappeared) since it was resolved
+            current = {cell.id: cell.version for cell in await self.data_repository.get_cells_by_ids(list(cell_targets))}
+            for cell_id, index in cell_targets.items():
+                if cell_id in current:
+                    fail(
+                        index,
+                        "conflict",
+                        f"Cell {cell_id} was modified by someone else "
+                        f"(version {current[cell_id]}, expected {operations[index]['version']})"
+                    )
+                else:
+                    fail(index, "not_found", f"Cell {cell_id} not found")
+        
+        by_row: Dict[int, Dict[int, int]] = {}
+        for (row_id, column_id), index in new_targets.items():
+            by_row.setdefault(row_id, {})[column_id] = index
+        for row_id, indexes in by_row.items():
+            written = await self.data_repository.write_row_cells(
+                row_id, {column_id: results[index]["value"] for column_id, index in indexes.items()}
+            )
+            changes.extend(written)
+            for change in written:
+                results[indexes[change.column_id]].update(cell_id=change.cell_id, version=change.version)
+        
+        row_tables = {row_id: table_id for table_id, row_id, _ in cell_locations.values()}
+        row_tables.update({row_id: row[0] for row_id, row in row_cells.items()})
+        changes_by_table: Dict[int, List[CellChange]] = {}
+        for change in changes:
+            changes_by_table.setdefault(row_tables[change.row_id], []).append(change)
+        for table_id, table_changes in changes_by_table.items():
+            await self._stage(user_id, table_id, table_changes)
+        
+        updated = sum(1 for result in results if result["status"] == "updated")
+        return {
+            "updated": updated,
+            "failed": len(results) - updated,
+            "results": results,
+            "elapsed_seconds": round(time.perf_counter() - started, 4)
+        }
     
-    async def update_row(self, row_id: int, cells: Dict[str, Any]) -> Row:
-        """Update row cells"""
-        # Get row
-        row = await self.data_repository.get_row_by_id(row_id)
-        if not row:
+    async def update_row(
+        self,
+        row_id: int,
+        cells: Dict[str, Any],
+        user_id: Optional[int] = None,
+        expected_version: Optional[int] = None
+    ) -> Row:
+        """
+        Update row cells; with a user the changes are staged for their next commit
+        With `expected_version` the write only happens if nobody changed the row since
+        """
+        table_id = await self.data_repository.get_row_table_id(row_id)
+        if table_id is None:
             raise NotFoundError("Row", str(row_id))
         
         # Get table for column info
-        table = await self.table_repository.get_by_id(row.table_id)
+        table = await self.table_repository.get_by_id(table_id)
         if not table:
-            raise NotFoundError("Table", str(row.table_id))
-        
-        # Update cells
-        for column in table.columns:
-            if column.name in cells:
-                value = cells[column.name]
-                
-                # Validate required columns
-                if column.is_required and value is None:
-                    raise ValidationError(f"Column '{column.name}' is required")
-                
-                # Get or create cell
-                if column.id in row.cells:
-                    cell = row.cells[column.id]
-                    cell.update_value(value)
-                else:
-                    cell = Cell(
-                        row_id=row_id,
-                        column_id=column.id,
-                        value=value
-                    )
-                    row.cells[column.id] = cell
+            raise NotFoundError("Table", str(table_id))
         
-        return await self.data_repository.update_row(row)
-
+        validator = get_row_validator(table)
+        values, errors = validator.validate_row(cells, partial=True)
+        if errors:
+            raise ValidationError(RowValidator.describe(errors[0]))
+        await self.reference_index.check_row(validator, values)
+        
+        # Old values come back from the write itself
+        changes = await self.data_repository.write_row_cells(row_id, values, expected_version)
+        if changes is None:
+            row = await self.data_repository.get_row_by_id(row_id)
+            raise PreconditionFailedError(
+                f"Row {row_id} was modified by someone else (version {row.version}, expected {expected_version})"
+            )
+        await self._stage(user_id, table_id, changes)
+        return await self.data_repository.get_row_by_id(row_id)
+    
+    async def delete_row(self, row_id: int, force: bool = False, user_id: Optional[int] = None) -> bool:
+        """
+        Delete a row
+        A row that reference columns still point at is only deleted with `force`, which
+        leaves those references dangling. Staged edits of its cells (anyone's) are dropped;
+        with a user the deletion is staged for their next commit
+        """
+        table_id = await self.data_repository.get_row_table_id(row_id)
+        if table_id is None:
+            return False
+        
+        if not force:
+            referrers = await self.reference_index.find_referrers(
+                table_id, [row_id], limit=MAX_REPORTED_REFERRERS + 1
+            )
+            if referrers:
+                shown = ", ".join(
+                    f"row {referrer['row_id']} of table {referrer['table_id']} ('{referrer['column']}')"
+                    for referrer in referrers[:MAX_REPORTED_REFERRERS]
+                )
+                if len(referrers) > MAX_REPORTED_REFERRERS:
+                    shown += " and more"
+                raise ConflictError(
+                    f"Row {row_id} is referenced by {shown}; delete with force=true to leave the references dangling"
+                )
+        
+        staged = self.staged_change_repository is not None and self.data_repository.supports_cell_ids
+        row = await self.data_repository.get_row_by_id(row_id) if staged else None
+        deleted = await self.data_repository.delete_row(row_id)
+        if deleted:
+            if row is not None:
+                await self._stage_deleted_row(user_id, table_id, row)
+        return deleted
+    
+    async def find_dangling_references(self, table_id: int, limit: int = 1000) -> Dict[str, Any]:
+        """Find reference values of a table pointing at rows that do not exist, returns the report"""
+        table = await self.table_repository.get_by_id(table_id)
+        if not table:
+            raise NotFoundError("Table", str(table_id))
+        
+        started = time.perf_counter()
+        report = await self.reference_index.find_dangling(table, limit)
+        return {**report, "elapsed_seconds": round(time.perf_counter() - started, 4)}
+    
+    def _stages(self, user_id: Optional[int]) -> bool:
+        """Whether writes of this user are staged (changes are staged by cell ID)"""
+        return (
+            user_id is not None
+            and self.staged_change_repository is not None
+            and self.data_repository.supports_cell_ids
+        )
+    
+    async def _stage(self, user_id: Optional[int], table_id: int, changes: List[CellChange]):
+        """Add captured changes to the user's staged change buffer"""
+        if self._stages(user_id) and changes:
+            await self.staged_change_repository.stage(user_id, table_id, changes)
+    
+    async def _stage_created_rows(self, user_id: Optional[int], table_id: int, rows: List[Row]):
+        """Stage the cells of new rows: they enter the version history once committed"""
+        await self._stage(user_id, table_id, [
+            CellChange(cell_id=cell.id, row_id=row.id, column_id=column_id, new_value=cell.value, is_new=True)
+            for row in rows
+            for column_id, cell in row.cells.items()
+        ])
+    
+    async def _stage_deleted_row(self, user_id: Optional[int], table_id: int, row: Row):
+        """
+        Drop every staged edit of a deleted row's cells and stage the deletion instead
+        The deletion records each cell's committed value: the old value of its first staged
+        edit, if any. Cells whose creation was never committed leave no trace
+        """
+        discarded = await self.staged_change_repository.discard_cells(
+            [cell.id for cell in row.cells.values() if cell.id is not None]
+        )
+        first_staged: Dict[int, StagedChange] = {}
+        for change in discarded:
+            first_staged.setdefault(change.cell_id, change)
+        
+        changes = []
+        for column_id, cell in row.cells.items():
+            staged = first_staged.get(cell.id)
+            if staged is not None and staged.is_new:
+                continue
+            changes.append(CellChange(
+                cell_id=cell.id,
+                row_id=row.id,
+                column_id=column_id,
+                old_value=staged.old_value if staged is not None else cell.value,
+                is_deleted=True
+            ))
+        await self._stage(user_id, table_id, changes)
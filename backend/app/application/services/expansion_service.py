@@ -0,0 +1,128 @@
+"""
+Expansion service
+Inlines the rows that reference columns point at (`expand=Item,Item.Material`),
+loading each level with one batched query per referenced table and memoizing
+the rows already resolved for the rest of the request
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.core.exceptions import ValidationError
+from app.domain.entities.table import Table, Column
+from app.domain.interfaces.repositories import IDataRepository, ITableRepository
+from app.application.mappers.domain_mapper import DomainMapper
+
+# Reference hops allowed in one expand path
+MAX_EXPAND_DEPTH = 4
+
+
+class ExpandNode:
+    """A reference column to expand, with the expansions of the table it points at"""
+    
+    __slots__ = ("column", "table", "children")
+    
+    def __init__(self, column: Column, table: Table):
+        self.column = column
+        self.table = table
+        self.children: Dict[str, "ExpandNode"] = {}
+
+
+class ExpansionService:
+    """
+    Reference expansion for one request
+    Tables and referenced rows are memoized on the instance, so repeated and nested
+    references (and later chunks of an export) never load the same row twice
+    """
+    
+    def __init__(self, data_repository: IDataRepository, table_repository: ITableRepository):
+        self.data_repository = data_repository
+        self.table_repository = table_repository
+        self._tables: Dict[int, Optional[Table]] = {}
+        # (table_id, row_id) -> row dict, None for rows that do not exist
+        self._rows: Dict[Tuple[int, int], Optional[Dict[str, Any]]] = {}
+    
+    async def parse(self, table: Table, expand: Optional[str]) -> Dict[str, ExpandNode]:
+        """Parse a comma separated list of (dotted) reference column paths into an expansion tree"""
+        tree: Dict[str, ExpandNode] = {}
+        for path in (expand or "").split(","):
+            path = path.strip()
+            if not path:
+                continue
+            names = path.split(".")
+            if len(names) > MAX_EXPAND_DEPTH:
+                raise ValidationError(f"Cannot expand '{path}': at most {MAX_EXPAND_DEPTH} levels are allowed")
+            
+            nodes, current = tree, table
+            for name in names:
+                node = nodes.get(name)
+                if node is None:
+                    column = next((column for column in current.columns if column.name == name), None)
+                    if column is None or column.data_type != "reference" or column.reference_table_id is None:
+                        raise ValidationError(
+                            f"Cannot expand '{path}': '{name}' is not a reference column of table '{current.name}'"
+                        )
+                    target = await self._get_table(column.reference_table_id)
+                    if target is None:
+                        raise ValidationError(f"Cannot expand '{path}': table {column.reference_table_id} not found")
+                    node = nodes[name] = ExpandNode(column, target)
+                nodes, current = node.children, node.table
+        return tree
+    
+    async def expand(self, rows: List[Dict[str, Any]], tree: Dict[str, ExpandNode]) -> List[Dict[str, Any]]:
+        """
+        Replace reference values of row dicts (in place) with the rows they point at, or None
+        when that row does not exist - one query per referenced table and level for rows
+        not resolved yet, then the next level over the distinct referenced rows
+        """
+        if not tree or not rows:
+            return rows
+        
+        wanted: Dict[int, Set[int]] = {}
+        for name, node in tree.items():
+            ids = wanted.setdefault(node.table.id, set())
+            for row in rows:
+                row_id = self._row_id(row["cells"].get(name))
+                if row_id is not None:
+                    ids.add(row_id)
+        for table_id, ids in wanted.items():
+            await self._load(self._tables[table_id], ids)
+        
+        for name, node in tree.items():
+            # Referenced rows are shared between the rows that point at them; a node with
+            # nested expansions works on its own copies so the memoized rows stay unexpanded
+            resolved: Dict[int, Optional[Dict[str, Any]]] = {}
+            for row in rows:
+                row_id = self._row_id(row["cells"].get(name))
+                if row_id is not None and row_id not in resolved:
+                    base = self._rows[(node.table.id, row_id)]
+                    resolved[row_id] = {**base, "cells": dict(base["cells"])} if base and node.children else base
+            if node.children:
+                await self.expand([row for row in resolved.values() if row is not None], node.children)
+            for row in rows:
+                row_id = self._row_id(row["cells"].get(name))
+                if row_id is not None:
+                    row["cells"][name] = resolved[row_id]
+        return rows
+    
+    async def _get_table(self, table_id: int) -> Optional[Table]:
+        """Get a table (memoized)"""
+        if table_id not in self._tables:
+            self._tables[table_id] = await self.table_repository.get_by_id(table_id)
+        return self._tables[table_id]
+    
+    async def _load(self, table: Table, row_ids: Set[int]):
+        """Memoize the rows of a table not resolved yet - one batched query"""
+        missing = [row_id for row_id in row_ids if (table.id, row_id) not in self._rows]
+        if not missing:
+            return
+        for row_id in missing:
+            self._rows[(table.id, row_id)] = None
+        for row in await self.data_repository.get_rows_by_ids(table.id, missing):
+            self._rows[(table.id, row.id)] = DomainMapper.row_to_dict(row, table.columns)
+    
+    @staticmethod
+    def _row_id(value: Any) -> Optional[int]:
+        """Row ID a reference value names (text storage gives strings), None if it names none"""
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.isascii() and value.isdigit():
+            return int(value)
+        return None
@@ -0,0 +1,141 @@
+"""
+Merge service
+Three-way merges of a branch into its base table: the common ancestor is the
+base value stored with each override, "ours" is the live base table and
+"theirs" is the branch
+"""
+from typing import Optional, Dict, Any, List, Tuple
+from app.core.exceptions import NotFoundError, ValidationError, ConflictError
+from app.domain.entities.branch import Branch, BranchCell
+from app.domain.entities.cell import CellChange
+from app.domain.entities.table import Table
+from app.domain.interfaces.repositories import IBranchRepository, ITableRepository, IDataRepository
+from app.application.services.version_service import VersionService
+from app.utils.diff import calculate_change_diff, calculate_three_way_merge
+
+# How conflicting cells are resolved: fail the merge, keep the base table value, or take the branch value
+MERGE_STRATEGIES = ("fail", "ours", "theirs")
+
+CellKey = Tuple[int, int]  # (row_id, column_id)
+
+
+class MergeService:
+    """Merge service implementation"""
+    
+    def __init__(
+        self,
+        branch_repository: IBranchRepository,
+        table_repository: ITableRepository,
+        data_repository: IDataRepository,
+        version_service: VersionService
+    ):
+        data_repository.require_cell_ids("Merging a branch")
+        self.branch_repository = branch_repository
+        self.table_repository = table_repository
+        self.data_repository = data_repository
+        self.version_service = version_service
+    
+    async def preview_branch_merge(self, branch_id: int) -> Dict[str, Any]:
+        """Compute what merging a branch would change, without writing anything"""
+        branch, table, _, merge = await self._merge_state(branch_id)
+        return self._report(branch, table, merge)
+    
+    async def merge_branch(
+        self,
+        branch_id: int,
+        user_id: int,
+        strategy: str = "fail",
+        message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Merge a branch into its base table and record the result as a version
+        Edits made only on the branch are applied, edits made only on the base table
+        are kept; cells edited differently on both sides are resolved by `strategy`
+        """
+        if strategy not in MERGE_STRATEGIES:
+            raise ValidationError(f"Unknown merge strategy '{strategy}'")
+        
+        branch, table, overrides, merge = await self._merge_state(branch_id)
+        if merge["conflicts"] and strategy == "fail":
+            raise ConflictError(
+                f"{len(merge['conflicts'])} cells were changed on both the branch and the table; "
+                "preview the merge or choose the 'ours' or 'theirs' strategy"
+            )
+        
+        changes = dict(merge["changes"])
+        if strategy == "theirs":
+            changes.update({key: conflict["theirs_value"] for key, conflict in merge["conflicts"].items()})
+        
+        captured = await self._apply(changes, {(o.row_id, o.column_id): o.cell_id for o in overrides})
+        
+        version_id = None
+        diff = calculate_change_diff(captured)
+        if diff:
+            version = await self.version_service.record_commit(
+                project_id=table.project_id,
+                table_id=table.id,
+                message=message or f"Merge branch '{branch.name}'",
+                author_id=user_id,
+                changes=diff
+            )
+            version_id = version.id
+        
+        await self.branch_repository.mark_merged(branch.id, version_id)
+        
+        report = self._report(branch, table, merge)
+        report.update({"strategy": strategy, "version_id": version_id, "applied_cells": len(diff)})
+        return report
+    
+    async def _merge_state(self, branch_id: int) -> Tuple[Branch, Table, List[BranchCell], Dict[str, Any]]:
+        """Load a branch's overrides with the live base values and run the three-way merge"""
+        branch = await self.branch_repository.get_by_id(branch_id)
+        if not branch:
+            raise NotFoundError("Branch", str(branch_id))
+        table = await self.table_repository.get_by_id(branch.table_id)
+        if not table:
+            raise NotFoundError("Table", str(branch.table_id))
+        
+        overrides = await self.branch_repository.get_overrides(branch.id)
+        base: Dict[CellKey, Any] = {}
+        ours: Dict[CellKey, Any] = {}
+        theirs: Dict[CellKey, Any] = {}
+        for override in overrides:
+            key = (override.row_id, override.column_id)
+            base[key] = override.base_value
+            ours[key] = override.current_value
+            theirs[key] = override.value
+        
+        return branch, table, overrides, calculate_three_way_merge(base, ours, theirs)
+    
+    async def _apply(self, changes: Dict[CellKey, Any], cell_ids: Dict[CellKey, Optional[int]]) -> List[CellChange]:
+        """
+        Write merged values to the base table, capturing old values - existing cells in
+        one bulk update, cells the base rows lack with one insert per row
+        """
+        existing = {cell_ids[key]: value for key, value in changes.items() if cell_ids.get(key) is not None}
+        captured = await self.data_repository.update_cell_values(existing) if existing else []
+        
+        missing: Dict[int, Dict[int, Any]] = {}
+        for (row_id, column_id), value in changes.items():
+            if cell_ids.get((row_id, column_id)) is None:
+                missing.setdefault(row_id, {})[column_id] = value
+        for row_id, values in missing.items():
+            captured.extend(await self.data_repository.write_row_cells(row_id, values))
+        return captured
+    
+    @staticmethod
+    def _report(branch: Branch, table: Table, merge: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge summary with conflicts keyed by row and column name"""
+        column_names = {column.id: column.name for column in table.columns}
+        return {
+            "branch_id": branch.id,
+            "table_id": table.id,
+            "ours_only": merge["ours_only"],
+            "theirs_only": merge["theirs_only"],
+            "convergent": merge["convergent"],
+            "conflicts": [
+                {"row_id": row_id, "column": column_names.get(column_id), **conflict}
+                for (row_id, column_id), conflict in sorted(merge["conflicts"].items())
+                if column_id in column_names
+            ]
+        }
@@ -0,0 +1,160 @@
+"""
+Reference index service
+Checks reference values against the rows of the tables they point at with one
+lookup per referenced table, and finds references left dangling by deleted rows
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from app.core.exceptions import ValidationError
+from app.domain.entities.table import Table
+from app.domain.interfaces.repositories import IDataRepository, ITableRepository
+from app.application.validators.row_validator import RowValidator
+from app.infrastructure.cache.invalidation import table_tag
+from app.infrastructure.cache.single_flight import single_flight
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Distinct IDs up to which a table is probed with one IN query (one chunk of the data
+# repositories) instead of loading its key index
+PROBE_LIMIT = 500
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def missing_reference_message(table_id: int, value: Any) -> str:
+    """Error message of a reference to a row that does not exist"""
+    return f"Referenced row {value} does not exist in table {table_id}"
+
+
+class ReferenceIndexService:
+    """
+    Existence lookups of referenced rows
+    Small lookups are one IN query; large ones go through the table's key index, a sorted
+    int64 array of its row IDs cached under the table's tag (row writes evict it)
+    """
+    
+    def __init__(self, data_repository: IDataRepository, table_repository: ITableRepository):
+        self.data_repository = data_repository
+        self.table_repository = table_repository
+    
+    async def get_key_index(self, table_id: int) -> np.ndarray:
+        """Get the sorted row IDs of a table - one query on a miss, concurrent misses coalesced"""
+        async def load() -> np.ndarray:
+            return np.array(await self.data_repository.get_row_ids(table_id), dtype=np.int64)
+        
+        return await single_flight.do_cached(
+            f"reference_index:{table_id}",
+            load,
+            settings.REFERENCE_INDEX_CACHE_TTL_SECONDS,
+            tags=[table_tag(table_id)]
+        )
+    
+    async def existing_ids(self, table_id: int, ids: Iterable[Any]) -> Set[int]:
+        """
+        Get the subset of `ids` that are rows of the table - one lookup
+        Misses of the key index are re-probed (when few), since an index loaded while a
+        write was committing can lack its rows until the next eviction
+        """
+        wanted = {int(value) for value in ids if isinstance(value, int) and 0 < value <= INT64_MAX}
+        if len(wanted) <= PROBE_LIMIT:
+            return await self.data_repository.filter_row_ids(table_id, list(wanted)) if wanted else set()
+        
+        candidates = np.fromiter(wanted, dtype=np.int64, count=len(wanted))
+        found = np.isin(candidates, await self.get_key_index(table_id), assume_unique=True)
+        existing = set(candidates[found].tolist())
+        misses = candidates[~found].tolist()
+        if misses and len(misses) <= PROBE_LIMIT:
+            existing |= await self.data_repository.filter_row_ids(table_id, misses)
+        return existing
+    
+    async def existing_keys(self, table_id: int, ids: Iterable[Any]) -> np.ndarray:
+        """Get existing_ids as a sorted int64 array, for columnar membership checks"""
+        existing = await self.existing_ids(table_id, ids)
+        return np.sort(np.fromiter(existing, dtype=np.int64, count=len(existing)))
+    
+    async def find_missing(self, references: List[Tuple[int, Any]]) -> List[int]:
+        """
+        Check (referenced table ID, value) pairs, returns the positions of those whose row does
+        not exist - one lookup per referenced table however many pairs there are
+        """
+        wanted: Dict[int, Set[Any]] = {}
+        for table_id, value in references:
+            wanted.setdefault(table_id, set()).add(value)
+        existing = {table_id: await self.existing_ids(table_id, values) for table_id, values in wanted.items()}
+        return [
+            index for index, (table_id, value) in enumerate(references)
+            if not isinstance(value, int) or value not in existing[table_id]
+        ]
+    
+    async def check_row(self, validator: RowValidator, values: Dict[int, Any]):
+        """Reject a validated row whose reference values name rows that do not exist"""
+        references = validator.reference_values(values)
+        missing = await self.find_missing([(column.reference_table_id, value) for column, value in references])
+        if missing:
+            column, value = references[missing[0]]
+            raise ValidationError(
+                f"Column '{column.name}': {missing_reference_message(column.reference_table_id, value)}"
+            )
+    
+    async def find_dangling(self, table: Table, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Find values of the table's reference columns whose row does not exist (any more)
+        One scan of the reference columns plus one lookup per referenced table
+        """
+        references = {
+            column.id: column for column in table.columns
+            if column.data_type == "reference" and column.reference_table_id is not None
+        }
+        values = await self.data_repository.get_column_values(table.id, list(references))
+        
+        checked: List[Tuple[int, int, Any]] = []
+        for row_id, column_id, value in values:
+            # Text storage gives back strings; anything that is not an ID can never resolve
+            if isinstance(value, str):
+                try:
+                    value = int(value)
+                except ValueError:
+                    pass
+            checked.append((row_id, column_id, value))
+        
+        missing = await self.find_missing(
+            [(references[column_id].reference_table_id, value) for _, column_id, value in checked]
+        )
+        dangling = [
+            {
+                "row_id": checked[index][0],
+                "column": references[checked[index][1]].name,
+                "value": checked[index][2],
+                "reference_table_id": references[checked[index][1]].reference_table_id
+            }
+            for index in missing[:limit]
+        ]
+        return {
+            "table_id": table.id,
+            "checked": len(checked),
+            "dangling_count": len(missing),
+            "dangling": dangling
+        }
+    
+    async def find_referrers(
+        self,
+        table_id: int,
+        row_ids: List[int],
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Find the reference values (in any table) that point at some rows of a table"""
+        columns = await self.table_repository.get_referencing_columns(table_id)
+        if not columns or not row_ids:
+            return []
+        by_id = {column.id: column for column in columns}
+        found = await self.data_repository.find_references(columns, row_ids, limit)
+        return [
+            {
+                "table_id": by_id[column_id].table_id,
+                "row_id": row_id,
+                "column": by_id[column_id].name,
+                "value": int(value)
+            }
+            for row_id, column_id, value in found
+        ]
@@ -0,0 +1,145 @@
+"""
+Snapshot service
+Periodic full-table snapshots plus the change log give "table as of version N"
+reads with a bounded replay: start from the latest snapshot at or before N (or
+an empty table) and apply the logged changes in between. Only committed data is
+read - never the live cells, which also hold staged edits and rows whose
+creation is not committed yet
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import get_settings
+from app.core.exceptions import NotFoundError
+from app.domain.entities.cell import Row, Cell
+from app.domain.entities.snapshot import TableSnapshot
+from app.domain.entities.version import Version, VersionChange
+from app.domain.interfaces.repositories import IDataRepository, ISnapshotRepository, IVersionRepository
+from app.infrastructure.cache.invalidation import table_tag
+from app.infrastructure.cache.single_flight import single_flight
+
+settings = get_settings()
+
+# cell_id -> (row_id, column_id, value)
+CellState = Dict[int, Tuple[int, int, Any]]
+
+
+class SnapshotService:
+    """Snapshot service implementation"""
+    
+    def __init__(
+        self,
+        snapshot_repository: ISnapshotRepository,
+        version_repository: IVersionRepository,
+        data_repository: IDataRepository,
+        every_versions: Optional[int] = None,
+        every_cells: Optional[int] = None
+    ):
+        data_repository.require_cell_ids("Reading a table as of a version")
+        self.snapshot_repository = snapshot_repository
+        self.version_repository = version_repository
+        self.data_repository = data_repository
+        self.every_versions = every_versions or settings.SNAPSHOT_EVERY_VERSIONS
+        self.every_cells = every_cells or settings.SNAPSHOT_EVERY_CELLS
+    
+    async def record_version(self, version: Version) -> Optional[TableSnapshot]:
+        """
+        Snapshot the version's table if every_versions versions or every_cells changed
+        cells accumulated since its last snapshot - O(every_versions) to decide
+        """
+        if version.table_id is None or version.id is None:
+            return None
+        
+        last_snapshot_version_id = await self.snapshot_repository.get_latest_version_id(version.table_id) or 0
+        pending = await self.version_repository.get_table_versions_between(
+            version.table_id,
+            after_id=last_snapshot_version_id,
+            up_to_id=version.id,
+            limit=self.every_versions
+        )
+        changed_cells = sum(len(v.changes) for v in pending)
+        if len(pending) < self.every_versions and changed_cells < self.every_cells:
+            return None
+        
+        return await self.take_snapshot(version.table_id, version.id)
+    
+    async def take_snapshot(self, table_id: int, version_id: int) -> TableSnapshot:
+        """Snapshot the committed state of a table after `version_id` - O(n) plus the replay since the last snapshot"""
+        snapshot = TableSnapshot(
+            table_id=table_id,
+            version_id=version_id,
+            cells=await self._reconstruct(table_id, version_id)
+        )
+        return await self.snapshot_repository.create(snapshot)
+    
+    async def get_rows_as_of(
+        self,
+        table_id: int,
+        version_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Row]:
+        """Get one page of a table's rows as they were right after a version"""
+        rows = await self.get_table_rows_as_of(table_id, version_id)
+        if after_id is not None:
+            rows = [row for row in rows if row.id > after_id]
+            return rows[:limit]
+        return rows[skip:skip + limit]
+    
+    async def get_table_rows_as_of(self, table_id: int, version_id: int) -> List[Row]:
+        """
+        Reconstruct all rows of a table as of a version, ordered by row ID
+        Reconstructions are cached under the table's tag, so paging through one is cheap
+        """
+        async def load() -> List[Row]:
+            return self._to_rows(table_id, await self._reconstruct(table_id, version_id))
+        
+        return await single_flight.do_cached(
+            f"table_as_of:{table_id}:{version_id}",
+            load,
+            settings.TIME_TRAVEL_CACHE_TTL_SECONDS,
+            tags=[table_tag(table_id)]
+        )
+    
+    async def _reconstruct(self, table_id: int, version_id: int) -> CellState:
+        """Latest snapshot at or before the version (or an empty table) plus the changes logged since"""
+        version = await self.version_repository.get_by_id(version_id)
+        # Project-wide commits can hold changes of the table too
+        if not version or version.table_id not in (None, table_id):
+            raise NotFoundError("Version", str(version_id))
+        
+        snapshot = await self.snapshot_repository.get_latest_up_to(table_id, version_id)
+        if snapshot is not None:
+            base_version_id, state = snapshot.version_id, dict(snapshot.cells)
+        else:
+            base_version_id, state = 0, {}
+        
+        changes = await self.version_repository.get_table_changes_between(table_id, base_version_id, version_id)
+        self._apply(state, changes)
+        return state
+    
+    @staticmethod
+    def _apply(state: CellState, changes: List[VersionChange]):
+        """
+        Apply logged changes in commit order: deletions drop the cell, anything else sets it
+        at its logged location. Entries logged without a location (their cell was gone before
+        changes carried one) can only update a cell the state already has
+        """
+        for change in changes:
+            if change.is_deleted:
+                state.pop(change.cell_id, None)
+            elif change.row_id is not None and change.column_id is not None:
+                state[change.cell_id] = (change.row_id, change.column_id, change.new_value)
+            elif change.cell_id in state:
+                row_id, column_id, _ = state[change.cell_id]
+                state[change.cell_id] = (row_id, column_id, change.new_value)
+    
+    @staticmethod
+    def _to_rows(table_id: int, state: CellState) -> List[Row]:
+        """Group a cell state into rows ordered by row ID"""
+        rows: Dict[int, Row] = {}
+        for cell_id, (row_id, column_id, value) in state.items():
+            row = rows.get(row_id)
+            if row is None:
+                row = rows[row_id] = Row(id=row_id, table_id=table_id, cells={})
+            row.cells[column_id] = Cell(id=cell_id, row_id=row_id, column_id=column_id, value=value)
+        return [rows[row_id] for row_id in sorted(rows)]
@@ -1,29 +1,62 @@
 """
 Version service
 """
-from typing import Optional, Dict, Any
-from app.domain.entities.version import Version
+import time
+from typing import Optional, Dict, Any, Callable, Set, List
+from app.domain.entities.version import Version, VersionChange, StagedChange
+from app.domain.entities.cell import Row, Cell
 from app.domain.interfaces.services import IVersionService
-from app.domain.interfaces.repositories import IVersionRepository, IDataRepository
-from app.core.exceptions import NotFoundError, ForbiddenError
+from app.domain.interfaces.repositories import IVersionRepository, IDataRepository, ITableRepository, IStagedChangeRepository
+from app.core.exceptions import NotFoundError, ForbiddenError, ValidationError
+from app.utils.diff import calculate_change_diff
+from app.application.services.snapshot_service import SnapshotService
+from app.infrastructure.cache.invalidation import emit_invalidation
 
 
 class VersionService(IVersionService):
     """Version service implementation"""
     
-    def __init__(self, version_repository: IVersionRepository, data_repository: IDataRepository):
+    def __init__(
+        self,
+        version_repository: IVersionRepository,
+        data_repository: IDataRepository,
+        table_repository: Optional[ITableRepository] = None,
+        snapshot_service: Optional[SnapshotService] = None,
+        staged_change_repository: Optional[IStagedChangeRepository] = None
+    ):
+        # Versions record changes by cell ID
+        data_repository.require_cell_ids("Version history")
         self.version_repository = version_repository
         self.data_repository = data_repository
+        self.table_repository = table_repository
+        self.snapshot_service = snapshot_service
+        self.staged_change_repository = staged_change_repository
     
     async def create_commit(
+        self,
+        project_id: int,
+        table_id: Optional[int],
+        message: str,
+        author_id: int
+    ) -> Version:
+        """
+        Create a new version/commit
+        The author's staged changes are sealed into it; diffs only ever come from the server
+        """
+        changes = await self.seal_staged_changes(author_id, project_id, table_id)
+        if not changes:
+            raise ValidationError("No staged changes to commit")
+        return await self.record_commit(project_id, table_id, message, author_id, changes)
+    
+    async def record_commit(
         self,
         project_id: int,
         table_id: Optional[int],
         message: str,
         author_id: int,
-        changes: dict
+        changes: Dict[str, Any]
     ) -> Version:
-        """Create a new version/commit"""
+        """Record a version from a diff the server built itself (a commit's sealed buffer, a merge)"""
         version = Version(
             project_id=project_id,
             table_id=table_id,
@@ -31,7 +64,25 @@ class VersionService(IVersionService):
             author_id=author_id,
             changes=changes
         )
-        return await self.version_repository.create(version)
+        version = await self.version_repository.create(version)
+        if self.snapshot_service:
+            await self.snapshot_service.record_version(version)
+        return version
+    
+    async def get_staged_changes(self, user_id: int, project_id: int, table_id: Optional[int] = None) -> Dict[str, Any]:
+        """Get a user's staged (uncommitted) changes as {cell_id: {old_value, new_value, row_id, column_id, ...}}"""
+        staged = await self.staged_change_repository.get_staged(user_id, project_id, table_id)
+        return self._to_diff(staged)
+    
+    async def seal_staged_changes(self, user_id: int, project_id: int, table_id: Optional[int] = None) -> Dict[str, Any]:
+        """Take a user's staged changes out of the buffer (net no-op edits are dropped)"""
+        staged = await self.staged_change_repository.pop_staged(user_id, project_id, table_id)
+        return self._to_diff(staged)
+    
+    @staticmethod
+    def _to_diff(staged: list) -> Dict[str, Any]:
+        """Build the version diff from staged changes"""
+        return calculate_change_diff(staged)
     
     async def get_diff(self, version_id: int) -> Dict[str, Any]:
         """Get diff for a version"""
@@ -46,8 +97,60 @@ class VersionService(IVersionService):
             "created_at": version.created_at.isoformat() if version.created_at else None
         }
     
-    async def rollback(self, version_id: int, user_id: int) -> bool:
-        """Rollback to a version"""
+    async def get_change_history(
+        self,
+        cell_id: Optional[int] = None,
+        row_id: Optional[int] = None,
+        column_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[VersionChange]:
+        """Get the versions that touched a cell, row or column, newest first"""
+        if cell_id is None and row_id is None and column_id is None:
+            raise ValidationError("A cell, row or column is required for history")
+        return await self.version_repository.get_change_history(
+            cell_id=cell_id,
+            row_id=row_id,
+            column_id=column_id,
+            skip=skip,
+            limit=limit
+        )
+    
+    async def get_table_blame(
+        self,
+        table_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get who last changed each cell of one page of a table's rows, keyed by column name"""
+        table = await self.table_repository.get_by_id(table_id)
+        if not table:
+            raise NotFoundError("Table", str(table_id))
+        column_names = {column.id: column.name for column in table.columns}
+        
+        blame = await self.version_repository.get_table_blame(table_id, skip, limit, after_id)
+        rows: Dict[int, Dict[str, Any]] = {}
+        for entry in blame:
+            column_name = column_names.get(entry.column_id)
+            if column_name is None:
+                continue
+            rows.setdefault(entry.row_id, {})[column_name] = {
+                "cell_id": entry.cell_id,
+                "version_id": entry.version_id,
+                "author_id": entry.author_id,
+                "author_username": entry.author_username,
+                "message": entry.message,
+                "changed_at": entry.changed_at
+            }
+        
+        return {
+            "table_id": table_id,
+            "rows": [{"row_id": row_id, "cells": cells} for row_id, cells in rows.items()]
+        }
+    
+    async def get_rollback_target(self, version_id: int, user_id: int) -> Version:
+        """Version the user may rollback; raises before any cell is touched"""
         version = await self.version_repository.get_by_id(version_id)
         if not version:
             raise NotFoundError("Version", str(version_id))
@@ -56,16 +159,154 @@ class VersionService(IVersionService):
         if version.author_id != user_id:
             raise ForbiddenError("You can only rollback your own versions")
         
-        # Apply rollback - restore old values
+        return version
+    
+    @staticmethod
+    def _committed_value(cell: Cell, first_staged: Dict[int, StagedChange]) -> Any:
+        """A cell's committed value: the old value of its first staged edit, if any"""
+        change = first_staged.get(cell.id)
+        return change.old_value if change is not None and not change.is_new else cell.value
+    
+    async def rollback(
+        self,
+        version_id: int,
+        user_id: int,
+        chunk_size: int = 1000,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Rollback a version - undoes every change it recorded
+        Edited cells get their old value back (loaded in one query, written with one bulk
+        UPDATE per chunk), rows the version created are deleted (references to them are left
+        dangling, as with a forced delete) and rows it deleted are re-inserted with their
+        original row and cell IDs - all inside the caller's transaction. The rollback is
+        recorded as a new version with the inverse changes, so it can be rolled back too and
+        as-of reads replay it. Staged edits (anyone's) of the cells it touches are dropped, as
+        their old values no longer hold; the rollback records each cell's committed value.
+        `on_progress(done, total)` is called after each step.
+        """
+        started = time.perf_counter()
+        version = await self.get_rollback_target(version_id, user_id)
+        
+        restore_values: Dict[int, Any] = {}
+        created_rows: Dict[int, Set[int]] = {}
+        deleted_rows: Dict[int, Row] = {}
         for cell_id_str, change_data in version.changes.items():
             cell_id = int(cell_id_str)
-            old_value = change_data.get("old_value")
-            
-            # Get cell and restore old value
-            cell = await self.data_repository.get_cell_by_id(cell_id)
-            if cell:
-                cell.update_value(old_value)
-                await self.data_repository.update_cell(cell)
+            table_id = change_data.get("table_id") or version.table_id
+            row_id, column_id = change_data.get("row_id"), change_data.get("column_id")
+            if change_data.get("is_new"):
+                if table_id and row_id is not None:
+                    created_rows.setdefault(table_id, set()).add(row_id)
+            elif change_data.get("is_deleted") and table_id and row_id is not None and column_id is not None:
+                row = deleted_rows.setdefault(row_id, Row(id=row_id, table_id=table_id))
+                row.cells[column_id] = Cell(
+                    id=cell_id, row_id=row_id, column_id=column_id, value=change_data.get("old_value")
+                )
+            else:
+                restore_values[cell_id] = change_data.get("old_value")
         
-        return True
-
+        # Deleted cells that exist again (their row was restored since) are updated in place
+        deleted_cells = {cell.id: cell for row in deleted_rows.values() for cell in row.cells.values()}
+        cells = await self.data_repository.get_cells_by_ids(list(restore_values) + list(deleted_cells))
+        for cell in cells:
+            restored = deleted_cells.get(cell.id)
+            if restored is not None:
+                restore_values[cell.id] = restored.value
+                del deleted_rows[restored.row_id].cells[restored.column_id]
+        deleted_rows = {row_id: row for row_id, row in deleted_rows.items() if row.cells}
+        
+        rows_to_delete: List[Row] = []
+        for table_id, row_ids in created_rows.items():
+            rows_to_delete.extend(await self.data_repository.get_rows_by_ids(table_id, list(row_ids)))
+        
+        first_staged: Dict[int, StagedChange] = {}
+        discarded = 0
+        if self.staged_change_repository:
+            staged = await self.staged_change_repository.discard_cells(
+                [cell.id for cell in cells]
+                + [cell.id for row in rows_to_delete for cell in row.cells.values()]
+                + [cell.id for row in deleted_rows.values() for cell in row.cells.values()]
+            )
+            discarded = len(staged)
+            for change in staged:
+                first_staged.setdefault(change.cell_id, change)
+        
+        # The rollback version records what it overwrites with inverse flags, so it can be rolled back too
+        rollback_changes: Dict[str, Any] = {}
+        for cell in cells:
+            old_value = self._committed_value(cell, first_staged)
+            cell.update_value(restore_values[cell.id])
+            rollback_changes[str(cell.id)] = {
+                "old_value": old_value,
+                "new_value": cell.value,
+                "row_id": cell.row_id,
+                "column_id": cell.column_id
+            }
+        for row in rows_to_delete:
+            for column_id, cell in row.cells.items():
+                # Cells whose creation was never committed leave no trace
+                if cell.id in first_staged and first_staged[cell.id].is_new:
+                    continue
+                rollback_changes[str(cell.id)] = {
+                    "old_value": self._committed_value(cell, first_staged),
+                    "new_value": None,
+                    "row_id": row.id,
+                    "column_id": column_id,
+                    "table_id": row.table_id,
+                    "is_deleted": True
+                }
+        for row in deleted_rows.values():
+            for column_id, cell in row.cells.items():
+                rollback_changes[str(cell.id)] = {
+                    "old_value": None,
+                    "new_value": cell.value,
+                    "row_id": row.id,
+                    "column_id": column_id,
+                    "table_id": row.table_id,
+                    "is_new": True
+                }
+        
+        removed_cells = sum(len(row.cells) for row in rows_to_delete)
+        inserted_cells = sum(len(row.cells) for row in deleted_rows.values())
+        total = len(cells) + removed_cells + inserted_cells
+        chunks = 0
+        for start in range(0, len(cells), chunk_size):
+            await self.data_repository.update_cells(cells[start:start + chunk_size])
+            chunks += 1
+            if on_progress:
+                on_progress(min(start + chunk_size, len(cells)), total)
+        if rows_to_delete:
+            await self.data_repository.delete_rows([row.id for row in rows_to_delete])
+            if on_progress:
+                on_progress(len(cells) + removed_cells, total)
+        if deleted_rows:
+            await self.data_repository.restore_rows(list(deleted_rows.values()))
+            if on_progress:
+                on_progress(total, total)
+        
+        rollback_version = await self.version_repository.create(Version(
+            project_id=version.project_id,
+            table_id=version.table_id,
+            message=f"Rollback of version {version.id}: {version.message}"[:500],
+            author_id=user_id,
+            changes=rollback_changes
+        ))
+        if self.snapshot_service:
+            await self.snapshot_service.record_version(rollback_version)
+        
+        # Cell updates evict their own rows; also drop project/table level entries
+        emit_invalidation(project_ids=[version.project_id], table_ids=[version.table_id])
+        
+        elapsed = time.perf_counter() - started
+        return {
+            "version_id": version.id,
+            "rollback_version_id": rollback_version.id,
+            "restored_cells": len(cells) + inserted_cells,
+            "missing_cells": sum(1 for cell_id_str in version.changes if cell_id_str not in rollback_changes),
+            "deleted_rows": len(rows_to_delete),
+            "restored_rows": len(deleted_rows),
+            "discarded_staged_changes": discarded,
+            "chunks": chunks,
+            "elapsed_seconds": round(elapsed, 4)
+        }
@@ -0,0 +1,205 @@
+"""
+Columnar validator
+Validates a large batch of rows column by column: each column's values become
+one NumPy array, and type coercion, required nulls, enum membership and
+reference existence are checked with array operations instead of per-cell calls
+"""
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.application.validators.row_validator import RowValidator, CompiledColumn
+
+# Row numbers listed per error group in the report (the count is always exact)
+MAX_REPORTED_ROWS = 100
+
+# Values accepted as true by boolean columns (same as DataValidator.parse_value)
+TRUE_STRINGS = np.array(["true", "1", "yes"])
+
+NONE_TYPE = type(None)
+
+
+class ColumnarValidator:
+    """
+    Batch validator on top of a table's compiled RowValidator
+    Produces the same values as RowValidator.validate_row for full rows; errors are
+    collected as boolean masks per (column, message) and reported with row coordinates
+    """
+    
+    def __init__(self, row_validator: RowValidator):
+        self.row_validator = row_validator
+    
+    def validate(
+        self,
+        rows: List[Dict[str, Any]],
+        reference_keys: Optional[Dict[int, np.ndarray]] = None
+    ) -> Tuple[List[Dict[int, Any]], Dict[str, Any]]:
+        """
+        Validate and coerce rows given by column name - O(n) array operations per column
+        `reference_keys` maps referenced table IDs to the IDs of their rows (at least those the
+        batch references); reference values not among them are errors
+        Returns (column_id -> value per row, error report)
+        """
+        count = len(rows)
+        errors: List[Tuple[Optional[str], str, np.ndarray]] = []
+        
+        # Rows are only scanned one by one for names that are not columns
+        unknown = set().union(*map(dict.keys, rows)) - self.row_validator.by_name.keys()
+        for name in sorted(unknown):
+            mask = np.fromiter(map(dict.__contains__, rows, repeat(name, count)), dtype=bool, count=count)
+            errors.append((name, "Unknown column", mask))
+        
+        column_ids = []
+        column_values = []
+        for column in self.row_validator.columns:
+            values, column_errors = self._validate_column(
+                column,
+                list(map(dict.get, rows, repeat(column.name, count))),
+                reference_keys or {}
+            )
+            column_ids.append(column.id)
+            column_values.append(values)
+            errors.extend((column.name, message, mask) for message, mask in column_errors)
+        
+        if not column_ids:
+            return [{} for _ in rows], self._report(count, errors)
+        prepared = list(map(dict, map(zip, repeat(column_ids, count), zip(*column_values))))
+        return prepared, self._report(count, errors)
+    
+    def _validate_column(
+        self,
+        column: CompiledColumn,
+        values: List[Any],
+        reference_keys: Dict[int, np.ndarray]
+    ) -> Tuple[List[Any], List[Tuple[str, np.ndarray]]]:
+        """Coerce one column's values, returns (values, [(message, row mask)])"""
+        count = len(values)
+        data = np.fromiter(values, dtype=object, count=count)
+        types = np.fromiter(map(type, values), dtype=object, count=count)
+        missing = types == NONE_TYPE
+        is_str = types == str
+        is_int = (types == int) | (types == bool)
+        out = data.copy()
+        invalid = np.zeros(count, dtype=bool)
+        parsed_null = np.zeros(count, dtype=bool)
+        errors: List[Tuple[str, np.ndarray]] = []
+        
+        data_type = column.data_type
+        if column.parse is not None:
+            # integer / float / boolean: strings are parsed, other values type-checked
+            string_rows = np.flatnonzero(is_str)
+            if string_rows.size:
+                strings = np.array(data[string_rows].tolist(), dtype=str)
+                empty = strings == ""
+                parsed_null[string_rows[empty]] = True
+                out[string_rows[empty]] = None
+                rows_to_parse = string_rows[~empty]
+                parsed, bad = self._parse_strings(column, strings[~empty])
+                good_rows = rows_to_parse[~bad]
+                if good_rows.size:
+                    out[good_rows] = parsed
+                invalid[rows_to_parse[bad]] = True
+            if data_type == "integer":
+                accepted = is_int
+            elif data_type == "float":
+                accepted = is_int | (types == float)
+            else:
+                accepted = types == bool
+            invalid |= ~(missing | is_str | accepted)
+        elif data_type == "string":
+            invalid |= ~(missing | is_str)
+        elif data_type == "enum":
+            string_rows = np.flatnonzero(is_str)
+            if string_rows.size:
+                strings = np.array(data[string_rows].tolist(), dtype=str)
+                invalid[string_rows[~np.isin(strings, np.array(column.enum_values, dtype=str))]] = True
+            # Non-string members are rare; they keep the scalar check
+            for index in np.flatnonzero(~(missing | is_str)):
+                invalid[index] = not column.check(values[index])
+        elif data_type == "reference":
+            int_rows = np.flatnonzero(is_int)
+            ids = self._int_array(data[int_rows])
+            keys = reference_keys.get(column.reference_table_id)
+            if ids is None:
+                bad = np.array([not column.check(value) for value in data[int_rows]], dtype=bool)
+                # IDs beyond int64 are never rows
+                dangling = ~bad if keys is not None else np.zeros(int_rows.size, dtype=bool)
+            else:
+                bad = ids <= 0
+                dangling = np.zeros(int_rows.size, dtype=bool)
+                if keys is not None:
+                    dangling = ~bad & ~np.isin(ids, keys)
+            invalid[int_rows[bad]] = True
+            invalid |= ~(missing | is_int)
+            if dangling.any():
+                mask = np.zeros(count, dtype=bool)
+                mask[int_rows[dangling]] = True
+                errors.append((f"Referenced row does not exist in table {column.reference_table_id}", mask))
+        else:
+            for index in np.flatnonzero(~missing):
+                invalid[index] = not column.check(values[index])
+        
+        if invalid.any():
+            errors.append((f"Value does not match data type {data_type}", invalid))
+        if column.required and parsed_null.any():
+            errors.append(("Required field cannot be null", parsed_null))
+        if missing.any():
+            if column.default is not None:
+                out[missing] = column.default
+            elif column.required:
+                errors.append((f"Column '{column.name}' is required", missing))
+        return out.tolist(), errors
+    
+    @staticmethod
+    def _parse_strings(column: CompiledColumn, strings: np.ndarray) -> Tuple[List[Any], np.ndarray]:
+        """
+        Parse non-empty strings of a typed column, returns (parsed values of the good ones, bad mask)
+        One vectorized cast; only when it fails are the strings parsed one by one to find the bad ones
+        """
+        bad = np.zeros(strings.size, dtype=bool)
+        if column.data_type == "boolean":
+            return np.isin(np.char.lower(strings), TRUE_STRINGS).tolist(), bad
+        
+        target = np.int64 if column.data_type == "integer" else np.float64
+        try:
+            return strings.astype(target).tolist(), bad
+        except (ValueError, OverflowError):
+            pass
+        
+        parsed = []
+        for index, value in enumerate(strings.tolist()):
+            try:
+                parsed.append(column.parse(value))
+            except ValueError:
+                bad[index] = True
+        return parsed, bad
+    
+    @staticmethod
+    def _int_array(values: np.ndarray) -> Optional[np.ndarray]:
+        """Python ints as an int64 array, None if any does not fit"""
+        try:
+            return np.array(values.tolist(), dtype=np.int64)
+        except OverflowError:
+            return None
+    
+    @staticmethod
+    def _report(count: int, errors: List[Tuple[Optional[str], str, np.ndarray]]) -> Dict[str, Any]:
+        """Compact error report: one entry per (column, message) with its row numbers"""
+        invalid_rows = np.zeros(count, dtype=bool)
+        groups = []
+        for name, message, mask in errors:
+            rows = np.flatnonzero(mask)
+            invalid_rows |= mask
+            groups.append({
+                "column": name,
+                "message": message,
+                "count": int(rows.size),
+                "rows": rows[:MAX_REPORTED_ROWS].tolist()
+            })
+        invalid = int(invalid_rows.sum())
+        return {
+            "rows": count,
+            "valid_rows": count - invalid,
+            "invalid_rows": invalid,
+            "error_count": sum(group["count"] for group in groups),
+            "errors": groups
+        }
@@ -2,10 +2,17 @@
 Data validator
 Validates cell values against column definitions
 """
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from app.domain.value_objects.data_types import DataType, DataTypeDefinition
 from app.core.exceptions import ValidationError
 
+# String parsers of the types that are not stored as text
+_PARSERS = {
+    DataType.INTEGER: int,
+    DataType.FLOAT: float,
+    DataType.BOOLEAN: lambda value: value.lower() in ("true", "1", "yes")
+}
+
 
 class DataValidator:
     """Data validator"""
@@ -44,22 +51,20 @@ class DataValidator:
         return True
     
     @staticmethod
-    def parse_value(value: str, data_type: str) -> Any:
-        """Parse string value to appropriate type"""
-        if value is None or value == "":
-            return None
-        
+    def parser_for(data_type: str) -> Optional[Callable[[str], Any]]:
+        """Get the string parser of a data type (None for types kept as strings)"""
         try:
             data_type_enum = DataType.from_string(data_type)
         except ValueError:
             raise ValidationError(f"Invalid data type: {data_type}")
+        return _PARSERS.get(data_type_enum)
+    
+    @staticmethod
+    def parse_value(value: str, data_type: str) -> Any:
+        """Parse string value to appropriate type"""
+        if value is None or value == "":
+            return None
         
-        if data_type_enum == DataType.INTEGER:
-            return int(value)
-        elif data_type_enum == DataType.FLOAT:
-            return float(value)
-        elif data_type_enum == DataType.BOOLEAN:
-            return value.lower() in ("true", "1", "yes")
-        else:
-            return value
+        parser = DataValidator.parser_for(data_type)
+        return parser(value) if parser is not None else value
 
@@ -0,0 +1,87 @@
+"""
+Row query parser
+Parses the `filter`, `sort` and `fields` parameters of a table read against the
+table's columns, typing filter values with the column's compiled coercer
+"""
+import re
+from typing import List, Optional
+from app.core.exceptions import ValidationError
+from app.domain.entities.table import Table
+from app.domain.value_objects.row_query import RowQuery, RowFilter, RowSort, FILTER_OPERATORS
+from app.application.validators.row_validator import get_row_validator
+
+# Column name, operator, value - the first operator wins, so names cannot contain one
+FILTER_PATTERN = re.compile(
+    r"^\s*(?P<column>[^<>=!~]+?)\s*(?P<operator>" + "|".join(re.escape(op) for op in FILTER_OPERATORS) + r")(?P<value>.*)$",
+    re.DOTALL
+)
+
+# Filter value meaning "no value"
+NULL_LITERAL = "null"
+
+# Operators that make sense for each data type (others compare with all of them)
+TYPE_OPERATORS = {
+    "boolean": ("=", "!="),
+    "reference": ("=", "!=", ">", ">=", "<", "<="),
+    "integer": ("=", "!=", ">", ">=", "<", "<="),
+    "float": ("=", "!=", ">", ">=", "<", "<=")
+}
+
+
+def parse_row_query(
+    table: Table,
+    filters: Optional[List[str]] = None,
+    sort: Optional[str] = None,
+    fields: Optional[str] = None
+) -> RowQuery:
+    """
+    Parse query parameters into a RowQuery
+    `filters` are expressions like "Damage>50" or "Name~sword" (all must match), `sort` a comma
+    separated list of column names ("-" prefix for descending), `fields` a comma separated list
+    of the columns to return
+    """
+    validator = get_row_validator(table)
+    columns = {column.name: column for column in table.columns}
+    
+    def column_of(name: str, parameter: str):
+        if name not in columns:
+            raise ValidationError(f"Unknown column '{name}' in {parameter}")
+        return columns[name]
+    
+    query = RowQuery()
+    for expression in filters or []:
+        match = FILTER_PATTERN.match(expression)
+        if not match:
+            raise ValidationError(f"Invalid filter '{expression}', expected <column><operator><value>")
+        column = column_of(match.group("column"), "filter")
+        operator, raw = match.group("operator"), match.group("value").strip()
+        if operator not in TYPE_OPERATORS.get(column.data_type, FILTER_OPERATORS):
+            raise ValidationError(f"Operator '{operator}' cannot be used on {column.data_type} column '{column.name}'")
+        
+        if raw == NULL_LITERAL:
+            if operator not in ("=", "!="):
+                raise ValidationError(f"Invalid filter '{expression}': null only compares with = and !=")
+            query.filters.append(RowFilter(column, operator))
+            continue
+        if operator == "~":
+            query.filters.append(RowFilter(column, operator, raw))
+            continue
+        compiled = validator.by_name[column.name]
+        try:
+            value = compiled.parse(raw) if compiled.parse is not None else raw
+        except ValueError:
+            raise ValidationError(f"Invalid filter '{expression}': {raw} is not a valid {column.data_type}")
+        if not compiled.check(value):
+            raise ValidationError(f"Invalid filter '{expression}': {raw} is not a valid {column.data_type}")
+        query.filters.append(RowFilter(column, operator, value))
+    
+    for name in (sort or "").split(","):
+        name = name.strip()
+        if name:
+            descending = name.startswith("-")
+            query.sorts.append(RowSort(column_of(name.lstrip("-+"), "sort"), descending))
+    
+    if fields is not None:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        query.fields = [column_of(name, "fields") for name in dict.fromkeys(names)]
+    return query
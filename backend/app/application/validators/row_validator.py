@@ -0,0 +1,152 @@
+"""
+Row validator
+Compiles a table's column definitions once into per-column coercers and type
+checks, so validating a row is a dict lookup and one or two calls per value
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import get_settings
+from app.core.exceptions import ValidationError
+from app.domain.entities.table import Table, Column
+from app.domain.value_objects.data_types import DataType, DataTypeDefinition
+from app.application.validators.data_validator import DataValidator
+from app.infrastructure.cache.cache_manager import cache_manager
+from app.infrastructure.cache.invalidation import schema_tag
+
+settings = get_settings()
+
+
+class CompiledColumn:
+    """A column definition compiled into its coercer and type check"""
+    
+    __slots__ = ("id", "name", "data_type", "required", "default", "enum_values", "reference_table_id", "parse", "check")
+    
+    def __init__(self, column: Column):
+        self.id = column.id
+        self.name = column.name
+        self.data_type = column.data_type
+        self.required = column.is_required
+        self.enum_values = tuple(column.enum_values or ())
+        self.reference_table_id = column.reference_table_id
+        self.parse: Optional[Callable[[str], Any]] = DataValidator.parser_for(column.data_type)
+        self.check: Callable[[Any], bool] = DataTypeDefinition(
+            DataType.from_string(column.data_type),
+            enum_values=column.enum_values,
+            reference_table_id=column.reference_table_id
+        ).check
+        self.default = None
+        if column.default_value is not None:
+            try:
+                self.default = self.coerce(column.default_value)
+            except ValidationError:
+                self.default = column.default_value  # stored as given, like before
+    
+    def coerce(self, value: Any) -> Any:
+        """Parse string input of typed columns and type-check a non-null value"""
+        if self.parse is not None and isinstance(value, str):
+            try:
+                value = self.parse(value) if value != "" else None
+            except ValueError:
+                raise ValidationError(f"Value {value} does not match data type {self.data_type}")
+        if value is None:
+            if self.required:
+                raise ValidationError("Required field cannot be null")
+            return None
+        if not self.check(value):
+            raise ValidationError(f"Value {value} does not match data type {self.data_type}")
+        return value
+
+
+class RowValidator:
+    """
+    Validator/coercer of a table's rows, compiled from its columns
+    Rows are checked with O(1) work per value; errors are (column name, message) pairs
+    """
+    
+    def __init__(self, columns: List[Column]):
+        self.fingerprint = self.fingerprint_of(columns)
+        self.columns = tuple(CompiledColumn(column) for column in columns)
+        self.by_name: Dict[str, CompiledColumn] = {column.name: column for column in self.columns}
+        self.by_id: Dict[int, CompiledColumn] = {column.id: column for column in self.columns}
+        # A full row starts from the defaults; required columns without one must be supplied
+        self._template: Dict[int, Any] = {column.id: column.default for column in self.columns}
+        self._required = tuple(column for column in self.columns if column.required and column.default is None)
+        # Columns whose values must name an existing row of another table
+        self.references = tuple(column for column in self.columns if column.reference_table_id is not None)
+    
+    @staticmethod
+    def fingerprint_of(columns: List[Column]) -> tuple:
+        """Everything about the columns that affects validation"""
+        return tuple(
+            (
+                column.id,
+                column.name,
+                column.data_type,
+                column.is_required,
+                column.default_value,
+                tuple(column.enum_values or ()),
+                column.reference_table_id
+            )
+            for column in columns
+        )
+    
+    @staticmethod
+    def describe(error: Tuple[str, str]) -> str:
+        """Message of a validation error, naming its column"""
+        name, message = error
+        return message if message.startswith("Column '") else f"Column '{name}': {message}"
+    
+    def reference_values(self, values: Dict[int, Any]) -> List[Tuple[CompiledColumn, Any]]:
+        """Non-null reference values of a validated row, as (column, value)"""
+        return [
+            (column, values[column.id]) for column in self.references
+            if values.get(column.id) is not None
+        ]
+    
+    def validate_row(self, cells: Dict[str, Any], partial: bool = False) -> Tuple[Dict[int, Any], List[Tuple[str, str]]]:
+        """
+        Validate and coerce a row given by column name, returns (column_id -> value, errors)
+        A full row gets every column (defaults for missing values); a partial row
+        (an update) only the columns it names. Unknown names are ignored
+        """
+        errors: List[Tuple[str, str]] = []
+        if partial:
+            values: Dict[int, Any] = {}
+        else:
+            values = dict(self._template)
+            for column in self._required:
+                if cells.get(column.name) is None:
+                    errors.append((column.name, f"Column '{column.name}' is required"))
+        
+        by_name = self.by_name
+        for name, value in cells.items():
+            column = by_name.get(name)
+            if column is None:
+                continue
+            if value is None:
+                if partial:
+                    if column.required:
+                        errors.append((name, f"Column '{name}' is required"))
+                    else:
+                        values[column.id] = None
+                continue
+            try:
+                values[column.id] = column.coerce(value)
+            except ValidationError as e:
+                errors.append((name, e.message))
+        return values, errors
+
+
+def get_row_validator(table: Table) -> RowValidator:
+    """
+    Get the compiled validator of a table - O(c) to fingerprint c columns, compiled on a miss
+    Entries carry the table's schema tag (evicted by column writes, not data writes) and
+    are only reused while the columns still match their fingerprint
+    """
+    key = f"row_validator:{table.id}"
+    validator = cache_manager.get(key)
+    if validator is not None and validator.fingerprint == RowValidator.fingerprint_of(table.columns):
+        return validator
+    
+    validator = RowValidator(table.columns)
+    cache_manager.set(key, validator, settings.ROW_VALIDATOR_CACHE_TTL_SECONDS, tags=[schema_tag(table.id)])
+    return validator
@@ -11,8 +11,16 @@ settings = get_settings()
 # Determine database URL - use SQLite for development if PostgreSQL not available
 database_url = settings.DATABASE_URL
 
+# An explicit SQLite URL (e.g. a test database) is used as is
+if database_url.startswith("sqlite"):
+    engine = create_async_engine(
+        database_url,
+        echo=settings.DATABASE_ECHO,
+        future=True,
+        connect_args={"check_same_thread": False}
+    )
 # Check if we should use SQLite (for development without PostgreSQL)
-if os.getenv("USE_SQLITE", "false").lower() == "true" or "postgresql" not in database_url.lower():
+elif os.getenv("USE_SQLITE", "false").lower() == "true" or "postgresql" not in database_url.lower():
     # Use SQLite for development
     database_url = "sqlite+aiosqlite:///./gdh.db"
     engine = create_async_engine(
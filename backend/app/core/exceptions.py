@@ -50,3 +50,23 @@ class ConflictError(GDHException):
     def __init__(self, message: str):
         super().__init__(message, status_code=409)
 
+
+class ServiceUnavailableError(GDHException):
+    """Temporarily overloaded exception"""
+    
+    def __init__(self, message: str = "Service temporarily unavailable"):
+        super().__init__(message, status_code=503)
+
+
+class PreconditionFailedError(GDHException):
+    """Conditional request precondition (If-Match) failed"""
+    
+    def __init__(self, message: str):
+        super().__init__(message, status_code=412)
+
+
+class UnsupportedOperationError(GDHException):
+    """Operation not available with the configured storage backend"""
+    
+    def __init__(self, message: str):
+        super().__init__(message, status_code=400)
@@ -0,0 +1,79 @@
+"""
+Bounded worker pool for password hashing
+bcrypt is deliberately slow (~250ms per call); running it inline blocks the
+event loop, so hashing and verification run on a small dedicated thread pool
+(bcrypt releases the GIL) with a cap on queued jobs
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+from app.core.config import get_settings
+from app.core.exceptions import ServiceUnavailableError
+
+settings = get_settings()
+
+T = TypeVar('T')
+
+
+class PasswordHashPool:
+    """
+    Size-limited executor for bcrypt work
+    At most `max_workers` hashes run at once and at most `max_queue` wait;
+    further calls are rejected with ServiceUnavailableError instead of piling up
+    """
+    
+    def __init__(self, max_workers: int = settings.PASSWORD_HASH_WORKERS, max_queue: int = settings.PASSWORD_HASH_MAX_QUEUE):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._max_workers = max_workers
+        self._max_pending = max_workers + max_queue
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+        self._max_wait_seconds = 0.0
+    
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run `fn(*args)` on the pool without blocking the event loop"""
+        # Only touched from the event loop thread, so no lock is needed
+        if self._pending >= self._max_pending:
+            self._rejected += 1
+            raise ServiceUnavailableError("Too many concurrent authentication requests, please retry")
+        
+        self._pending += 1
+        submitted_at = time.perf_counter()
+        
+        def timed():
+            started_at = time.perf_counter()
+            return fn(*args), started_at, time.perf_counter()
+        
+        try:
+            result, started_at, finished_at = await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+        
+        wait_seconds = started_at - submitted_at
+        self._completed += 1
+        self._wait_seconds += wait_seconds
+        self._run_seconds += finished_at - started_at
+        self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+        return result
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get pool counters and average timings"""
+        completed = self._completed
+        return {
+            "workers": self._max_workers,
+            "max_pending": self._max_pending,
+            "pending": self._pending,
+            "completed": completed,
+            "rejected": self._rejected,
+            "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2) if completed else 0.0,
+            "avg_run_ms": round(self._run_seconds / completed * 1000, 2) if completed else 0.0,
+            "max_wait_ms": round(self._max_wait_seconds * 1000, 2)
+        }
+
+
+# Global password hashing pool
+password_hash_pool = PasswordHashPool()
@@ -6,6 +6,7 @@ from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
 from app.core.config import get_settings
+from app.core.password_hashing import password_hash_pool
 
 settings = get_settings()
 
@@ -29,6 +30,16 @@ def get_password_hash(password: str) -> str:
     return hashed.decode('utf-8')
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool (never blocks the event loop)"""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool (never blocks the event loop)"""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
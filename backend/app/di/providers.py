@@ -1,7 +1,12 @@
 """
 Service providers for dependency injection
 """
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
 from app.di.container import container
+from app.domain.interfaces.repositories import IDataRepository
+from app.infrastructure.repositories.data_repository import DataRepository
+from app.infrastructure.repositories.packed_data_repository import PackedDataRepository
 
 
 def get_auth_service():
@@ -33,3 +38,13 @@ def get_code_generation_service():
     """Get code generation service"""
     return container.get_service('code_generation')
 
+
+
+def get_data_repository(session: AsyncSession) -> IDataRepository:
+    """Get the row storage backend selected by DATA_STORAGE_BACKEND (per-request)"""
+    backend = get_settings().DATA_STORAGE_BACKEND.lower()
+    if backend == "packed":
+        return PackedDataRepository(session)
+    if backend == "eav":
+        return DataRepository(session)
+    raise ValueError(f"Unknown data storage backend: {backend}")
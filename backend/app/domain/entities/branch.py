@@ -0,0 +1,39 @@
+"""
+Branch domain entities
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Any
+
+
+@dataclass
+class Branch:
+    """Data branch domain entity - overrides on top of a base table"""
+    id: Optional[int] = None
+    table_id: int = 0
+    name: str = ""
+    description: Optional[str] = None
+    created_by: int = 0
+    base_version_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    def __post_init__(self):
+        """Validate branch"""
+        if not self.name:
+            raise ValueError("Branch name cannot be empty")
+        if self.table_id <= 0:
+            raise ValueError("Branch must belong to a table")
+
+
+@dataclass
+class BranchCell:
+    """Cell overridden on a branch"""
+    branch_id: int
+    row_id: int
+    column_id: int
+    value: Optional[Any] = None
+    base_value: Optional[Any] = None  # Base table value when first overridden (or at the last merge)
+    cell_id: Optional[int] = None  # Base table cell, None if the base row has no such cell
+    current_value: Optional[Any] = None  # Live base table value
+    updated_at: Optional[datetime] = None
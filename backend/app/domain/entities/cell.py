@@ -13,6 +13,7 @@ class Cell:
     row_id: int = 0
     column_id: int = 0
     value: Optional[Any] = None
+    version: int = 1  # Incremented by every write, for conditional updates
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -36,6 +37,7 @@ class Row:
     id: Optional[int] = None
     table_id: int = 0
     cells: dict = None  # column_id -> Cell mapping
+    version: int = 1  # Incremented by every write to the row or its cells
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -63,3 +65,15 @@ class Row:
                 value=value
             )
 
+
+@dataclass
+class CellChange:
+    """Old and new value of a cell captured by a write"""
+    cell_id: Optional[int] = None  # None on storage backends without cell identity
+    row_id: int = 0
+    column_id: int = 0
+    old_value: Optional[Any] = None
+    new_value: Optional[Any] = None
+    version: Optional[int] = None  # Cell version after the write
+    is_new: bool = False  # The write created the cell (with its row)
+    is_deleted: bool = False  # The write deleted the cell (with its row)
@@ -0,0 +1,25 @@
+"""
+Table snapshot domain entity
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple
+
+
+@dataclass
+class TableSnapshot:
+    """Full cell state of a table right after a version"""
+    id: Optional[int] = None
+    table_id: int = 0
+    version_id: int = 0
+    cells: Dict[int, Tuple[int, int, Any]] = None  # cell_id -> (row_id, column_id, value)
+    created_at: Optional[datetime] = None
+    
+    def __post_init__(self):
+        """Validate snapshot"""
+        if self.table_id <= 0:
+            raise ValueError("Snapshot must belong to a table")
+        if self.version_id <= 0:
+            raise ValueError("Snapshot must belong to a version")
+        if self.cells is None:
+            self.cells = {}
@@ -35,3 +35,49 @@ class Version:
             "new_value": new_value
         }
 
+
+@dataclass
+class VersionChange:
+    """One changed cell of a version, with the version's metadata for history views"""
+    version_id: int
+    cell_id: int
+    table_id: Optional[int] = None
+    row_id: Optional[int] = None
+    column_id: Optional[int] = None
+    old_value: Optional[Any] = None
+    new_value: Optional[Any] = None
+    is_new: bool = False
+    is_deleted: bool = False
+    message: str = ""
+    author_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
+@dataclass
+class CellBlame:
+    """Last version that changed a cell"""
+    cell_id: int
+    row_id: int
+    column_id: int
+    version_id: int
+    author_id: int
+    author_username: Optional[str] = None
+    message: str = ""
+    changed_at: Optional[datetime] = None
+
+
+@dataclass
+class StagedChange:
+    """Captured cell change waiting in a user's buffer for the next commit"""
+    id: Optional[int] = None
+    user_id: int = 0
+    table_id: int = 0
+    cell_id: int = 0
+    row_id: Optional[int] = None
+    column_id: Optional[int] = None
+    old_value: Optional[Any] = None
+    new_value: Optional[Any] = None
+    is_new: bool = False  # Staged by the cell's creation: it has no committed value yet
+    is_deleted: bool = False  # Staged by the cell's deletion
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
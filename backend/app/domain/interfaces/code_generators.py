@@ -25,4 +25,8 @@ class ICodeGenerator(ABC):
     def get_mime_type(self) -> str:
         """Get MIME type for generated code"""
         pass
+    
+    def get_template_revision(self) -> str:
+        """Identify the template the output is rendered with (empty when none is used)"""
+        return ""
 
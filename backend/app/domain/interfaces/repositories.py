@@ -3,11 +3,15 @@ Repository interfaces
 Abstract interfaces following Dependency Inversion Principle
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List, Generic, TypeVar
+from typing import Optional, List, Dict, Any, AsyncIterator, Generic, TypeVar, Set, Tuple
 from app.domain.entities.project import Project
 from app.domain.entities.table import Table, Column
-from app.domain.entities.cell import Row, Cell
-from app.domain.entities.version import Version
+from app.domain.entities.cell import Row, Cell, CellChange
+from app.domain.entities.version import Version, VersionChange, CellBlame, StagedChange
+from app.domain.entities.snapshot import TableSnapshot
+from app.domain.entities.branch import Branch, BranchCell
+from app.domain.value_objects.row_query import RowQuery
+from app.core.exceptions import UnsupportedOperationError
 
 T = TypeVar('T')
 
@@ -62,14 +66,146 @@ class ITableRepository(IRepository[Table]):
     async def get_columns_by_table_id(self, table_id: int) -> List[Column]:
         """Get columns by table ID"""
         pass
+    
+    @abstractmethod
+    async def get_referencing_columns(self, table_id: int) -> List[Column]:
+        """Get the reference columns (of any table) that point at a table"""
+        pass
 
 
 class IDataRepository(IRepository[Row]):
     """Data repository interface"""
     
+    # Whether cells have IDs of their own - cell-addressed writes, version history,
+    # snapshots and branches are built on them
+    supports_cell_ids: bool = True
+    
+    def require_cell_ids(self, feature: str):
+        """Reject a feature that addresses cells by ID when the backend has no cell identity"""
+        if not self.supports_cell_ids:
+            raise UnsupportedOperationError(
+                f"{feature} requires the EAV storage backend (DATA_STORAGE_BACKEND=eav)"
+            )
+    
+    @abstractmethod
+    async def get_rows_by_table_id(
+        self,
+        table_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Row]:
+        """Get rows by table ID ordered by ID (keyset seek when after_id is given)"""
+        pass
+    
+    @abstractmethod
+    def stream_rows_by_table_id(self, table_id: int, chunk_size: int = 1000) -> AsyncIterator[List[Row]]:
+        """Stream all rows of a table in ID order, chunk by chunk, through a server-side cursor"""
+        pass
+    
+    @abstractmethod
+    async def get_row_by_id(self, row_id: int) -> Optional[Row]:
+        """Get row by ID with its cells"""
+        pass
+    
+    @abstractmethod
+    async def get_rows_by_ids(
+        self,
+        table_id: int,
+        row_ids: List[int],
+        column_ids: Optional[List[int]] = None
+    ) -> List[Row]:
+        """
+        Get the rows of a table with the given IDs (in that order), with the values of `column_ids`
+        (all columns if None); IDs that are not rows of the table are skipped
+        """
+        pass
+    
     @abstractmethod
-    async def get_rows_by_table_id(self, table_id: int, skip: int = 0, limit: int = 100) -> List[Row]:
-        """Get rows by table ID"""
+    async def query_rows(
+        self,
+        table_id: int,
+        query: RowQuery,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Row]:
+        """Get one page of the rows matching a query's filters, in its sort order (then by ID)"""
+        pass
+    
+    @abstractmethod
+    async def create_row(self, row: Row) -> Row:
+        """Create a new row with cells"""
+        pass
+    
+    @abstractmethod
+    async def create_rows(self, table_id: int, rows: List[Dict[int, Any]]) -> List[int]:
+        """Create many rows (column_id -> value each) in one set-based write, returns row IDs"""
+        pass
+    
+    @abstractmethod
+    async def update_row(self, row: Row) -> Row:
+        """Update row and its cells"""
+        pass
+    
+    @abstractmethod
+    async def delete_row(self, row_id: int) -> bool:
+        """Delete row by ID"""
+        pass
+    
+    @abstractmethod
+    async def delete_rows(self, row_ids: List[int]) -> int:
+        """Delete many rows (with their cells), returning how many were deleted"""
+        pass
+    
+    @abstractmethod
+    async def restore_rows(self, rows: List[Row]) -> Set[int]:
+        """Re-insert deleted rows and cells with their original IDs, returning the affected table IDs"""
+        pass
+    
+    @abstractmethod
+    async def get_row_table_id(self, row_id: int) -> Optional[int]:
+        """Get the table ID a row belongs to"""
+        pass
+    
+    @abstractmethod
+    async def get_data_revision(self, table_id: int) -> str:
+        """Get a token that changes with every row write, insert and delete of a table"""
+        pass
+    
+    @abstractmethod
+    async def get_row_ids(self, table_id: int) -> List[int]:
+        """Get every row ID of a table in ascending order"""
+        pass
+    
+    @abstractmethod
+    async def filter_row_ids(self, table_id: int, row_ids: List[int]) -> Set[int]:
+        """Get the subset of `row_ids` that are rows of the table"""
+        pass
+    
+    @abstractmethod
+    async def get_column_values(self, table_id: int, column_ids: List[int]) -> List[Tuple[int, int, Any]]:
+        """Get the non-null values of some columns of a table as (row_id, column_id, value)"""
+        pass
+    
+    @abstractmethod
+    async def find_references(
+        self,
+        columns: List[Column],
+        row_ids: List[int],
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, int, Any]]:
+        """Find values of reference columns pointing at `row_ids`, as (row_id, column_id, value)"""
+        pass
+    
+    @abstractmethod
+    async def get_cell_locations(self, cell_ids: List[int]) -> Dict[int, Tuple[int, int, int]]:
+        """Map cell IDs to (table_id, row_id, column_id); unknown cells are absent"""
+        pass
+    
+    @abstractmethod
+    async def get_row_cell_ids(self, row_ids: List[int]) -> Dict[int, Tuple[int, Dict[int, int]]]:
+        """Map row IDs to (table_id, {column_id: cell_id}); unknown rows are absent"""
         pass
     
     @abstractmethod
@@ -81,6 +217,40 @@ class IDataRepository(IRepository[Row]):
     async def update_cell(self, cell: Cell) -> Cell:
         """Update cell value"""
         pass
+    
+    @abstractmethod
+    async def update_cell_values(
+        self,
+        values: Dict[int, Any],
+        expected_versions: Optional[Dict[int, int]] = None
+    ) -> List[CellChange]:
+        """Set cell values by cell ID (conditionally on their versions), capturing old values"""
+        pass
+    
+    @abstractmethod
+    async def write_row_cells(
+        self,
+        row_id: int,
+        values: Dict[int, Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[List[CellChange]]:
+        """Set a row's values by column ID (creating missing cells), capturing old values; None on version mismatch"""
+        pass
+    
+    @abstractmethod
+    async def get_cells_by_ids(self, cell_ids: List[int]) -> List[Cell]:
+        """Get many cells by ID"""
+        pass
+    
+    @abstractmethod
+    async def update_cells(self, cells: List[Cell]) -> Set[int]:
+        """Write many cell values at once, returning the affected table IDs"""
+        pass
+    
+    @abstractmethod
+    async def get_table_cells(self, table_id: int) -> List[Cell]:
+        """Get every cell of a table"""
+        pass
 
 
 class IVersionRepository(IRepository[Version]):
@@ -95,4 +265,132 @@ class IVersionRepository(IRepository[Version]):
     async def get_by_table_id(self, table_id: int, skip: int = 0, limit: int = 100) -> List[Version]:
         """Get versions by table ID"""
         pass
+    
+    @abstractmethod
+    async def get_table_versions_between(
+        self,
+        table_id: int,
+        after_id: int,
+        up_to_id: int,
+        limit: Optional[int] = None
+    ) -> List[Version]:
+        """Get a table's versions with after_id < id <= up_to_id, oldest first"""
+        pass
+    
+    @abstractmethod
+    async def get_latest_table_version_id(self, table_id: int) -> Optional[int]:
+        """Get the ID of a table's most recent version"""
+        pass
+    
+    @abstractmethod
+    async def get_table_changes_between(self, table_id: int, after_id: int, up_to_id: int) -> List[VersionChange]:
+        """Get the change log entries of a table's versions with after_id < id <= up_to_id, oldest first"""
+        pass
+    
+    @abstractmethod
+    async def record_changes(self, version: Version) -> int:
+        """Write a version's changes to the normalized change log"""
+        pass
+    
+    @abstractmethod
+    async def get_change_history(
+        self,
+        cell_id: Optional[int] = None,
+        row_id: Optional[int] = None,
+        column_id: Optional[int] = None,
+        table_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[VersionChange]:
+        """Get change log entries for a cell, row, column or table, newest first"""
+        pass
+    
+    @abstractmethod
+    async def get_table_blame(
+        self,
+        table_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[CellBlame]:
+        """Get blame for the cells of one page of a table's rows"""
+        pass
+    
+    @abstractmethod
+    async def rebuild_blame(self) -> int:
+        """Rebuild the blame index from the change log"""
+        pass
+
+
+class IStagedChangeRepository(IRepository[StagedChange]):
+    """Staged change repository interface"""
+    
+    @abstractmethod
+    async def stage(self, user_id: int, table_id: int, changes: List[CellChange]) -> int:
+        """Add captured changes to a user's buffer"""
+        pass
+    
+    @abstractmethod
+    async def get_staged(self, user_id: int, project_id: int, table_id: Optional[int] = None) -> List[StagedChange]:
+        """Get a user's staged changes"""
+        pass
+    
+    @abstractmethod
+    async def pop_staged(self, user_id: int, project_id: int, table_id: Optional[int] = None) -> List[StagedChange]:
+        """Remove and return a user's staged changes"""
+        pass
+    
+    @abstractmethod
+    async def discard_cells(self, cell_ids: List[int]) -> List[StagedChange]:
+        """Remove and return every user's staged changes of some cells"""
+        pass
+
+
+class ISnapshotRepository(IRepository[TableSnapshot]):
+    """Table snapshot repository interface"""
+    
+    @abstractmethod
+    async def get_latest_version_id(self, table_id: int) -> Optional[int]:
+        """Get the version ID of a table's most recent snapshot"""
+        pass
+    
+    @abstractmethod
+    async def get_latest_up_to(self, table_id: int, version_id: int) -> Optional[TableSnapshot]:
+        """Get a table's most recent snapshot taken at or before a version"""
+        pass
 
+
+class IBranchRepository(IRepository[Branch]):
+    """Branch repository interface"""
+    
+    @abstractmethod
+    async def get_by_table_id(self, table_id: int) -> List[Branch]:
+        """Get branches of a table"""
+        pass
+    
+    @abstractmethod
+    async def set_cells(self, branch_id: int, row_id: int, values: Dict[int, Any]) -> int:
+        """Override a row's cells on a branch"""
+        pass
+    
+    @abstractmethod
+    async def get_overrides(self, branch_id: int) -> List[BranchCell]:
+        """Get all cells overridden on a branch, with the live base values"""
+        pass
+    
+    @abstractmethod
+    async def mark_merged(self, branch_id: int, version_id: Optional[int]) -> int:
+        """Make the branch's current values the base of its next merge"""
+        pass
+    
+    @abstractmethod
+    async def get_rows(
+        self,
+        branch_id: int,
+        table_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Row]:
+        """Get one page of a table's rows as seen on a branch"""
+        pass
@@ -2,7 +2,7 @@
 Service interfaces
 """
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, AsyncIterator
 from app.domain.entities.project import Project
 from app.domain.entities.table import Table
 from app.domain.entities.cell import Row, Cell
@@ -21,6 +21,11 @@ class IAuthService(ABC):
     async def register(self, username: str, email: str, password: str) -> dict:
         """Register new user"""
         pass
+    
+    @abstractmethod
+    async def set_user_active(self, user_id: int, is_active: bool) -> bool:
+        """Activate or deactivate a user"""
+        pass
 
 
 class IProjectService(ABC):
@@ -55,22 +60,58 @@ class IDataService(ABC):
     """Data service interface"""
     
     @abstractmethod
-    async def update_cell_value(self, cell_id: int, new_value: any, user_id: int) -> Cell:
+    async def update_cell_value(self, cell_id: int, new_value: any, user_id: int, expected_version: Optional[int] = None) -> Cell:
         """Update cell value with validation"""
         pass
     
     @abstractmethod
-    async def get_table_data(self, table_id: int, skip: int = 0, limit: int = 100) -> List[Row]:
+    async def get_table_data(self, table_id: int, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Row]:
         """Get table data (rows)"""
         pass
+    
+    @abstractmethod
+    def stream_table_data(self, table_id: int, chunk_size: int = 1000) -> AsyncIterator[List[Row]]:
+        """Stream all rows of a table in chunks"""
+        pass
+    
+    @abstractmethod
+    async def create_rows(
+        self,
+        table_id: int,
+        rows: List[Dict[str, Any]],
+        chunk_size: int = 1000,
+        user_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Validate and bulk insert rows, returns ingestion statistics"""
+        pass
+    
+    @abstractmethod
+    async def validate_rows(self, table_id: int, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate a batch of rows without writing it, returns the error report"""
+        pass
+    
+    @abstractmethod
+    async def patch_cells(self, operations: List[Dict[str, Any]], user_id: Optional[int] = None) -> Dict[str, Any]:
+        """Validate and apply many cell writes, returns a result per operation"""
+        pass
+    
+    @abstractmethod
+    async def find_dangling_references(self, table_id: int, limit: int = 1000) -> Dict[str, Any]:
+        """Find reference values of a table pointing at rows that do not exist"""
+        pass
 
 
 class IVersionService(ABC):
     """Version service interface"""
     
     @abstractmethod
-    async def create_commit(self, project_id: int, table_id: Optional[int], message: str, author_id: int, changes: dict) -> Version:
-        """Create a new version/commit"""
+    async def create_commit(self, project_id: int, table_id: Optional[int], message: str, author_id: int) -> Version:
+        """Create a new version/commit from the author's staged changes"""
+        pass
+    
+    @abstractmethod
+    async def record_commit(self, project_id: int, table_id: Optional[int], message: str, author_id: int, changes: dict) -> Version:
+        """Record a version from a diff built server-side"""
         pass
     
     @abstractmethod
@@ -79,7 +120,7 @@ class IVersionService(ABC):
         pass
     
     @abstractmethod
-    async def rollback(self, version_id: int, user_id: int) -> bool:
-        """Rollback to a version"""
+    async def rollback(self, version_id: int, user_id: int, chunk_size: int = 1000) -> dict:
+        """Rollback a version, returning rollback statistics"""
         pass
 
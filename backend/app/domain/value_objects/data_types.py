@@ -3,7 +3,7 @@ Data type value objects
 Immutable value objects for data type definitions
 """
 from enum import Enum
-from typing import List, Optional, Any
+from typing import Callable, List, Optional, Any
 
 
 class DataType(Enum):
@@ -37,6 +37,7 @@ class DataTypeDefinition:
         self._enum_values = tuple(enum_values) if enum_values else None
         self._reference_table_id = reference_table_id
         self._validate()
+        self._check = self._build_check()
     
     def _validate(self):
         """Validate data type definition"""
@@ -60,23 +61,38 @@ class DataTypeDefinition:
         """Get reference table ID"""
         return self._reference_table_id
     
+    @property
+    def check(self) -> Callable[[Any], bool]:
+        """Type check of non-null values, specialized for this definition"""
+        return self._check
+    
     def validate_value(self, value: Any) -> bool:
         """Validate a value against this data type"""
         if value is None:
             return True  # Null values handled separately
-        
+        return self._check(value)
+    
+    def _build_check(self) -> Callable[[Any], bool]:
+        """Build the type check once, so validating a value is a single call"""
         if self._data_type == DataType.STRING:
-            return isinstance(value, str)
+            return lambda value: isinstance(value, str)
         elif self._data_type == DataType.INTEGER:
-            return isinstance(value, int)
+            return lambda value: isinstance(value, int)
         elif self._data_type == DataType.FLOAT:
-            return isinstance(value, (int, float))
+            return lambda value: isinstance(value, (int, float))
         elif self._data_type == DataType.BOOLEAN:
-            return isinstance(value, bool)
+            return lambda value: isinstance(value, bool)
         elif self._data_type == DataType.ENUM:
-            return value in self._enum_values
+            members = frozenset(self._enum_values)
+            
+            def is_member(value: Any) -> bool:
+                try:
+                    return value in members
+                except TypeError:  # unhashable values are never members
+                    return False
+            return is_member
         elif self._data_type == DataType.REFERENCE:
-            return isinstance(value, int) and value > 0
+            return lambda value: isinstance(value, int) and value > 0
         
-        return False
+        return lambda value: False
 
@@ -0,0 +1,39 @@
+"""
+Row query value objects
+Filters, sort keys and a column projection of a table read, resolved to columns
+and typed values so storage backends can compile them to SQL
+"""
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+from app.domain.entities.table import Column
+
+# Comparison operators of a filter; "~" is a case-insensitive substring match
+FILTER_OPERATORS = (">=", "<=", "!=", "=", ">", "<", "~")
+
+
+@dataclass
+class RowFilter:
+    """One condition on a column - `value` is typed by the column, None compares with null"""
+    column: Column
+    operator: str
+    value: Any = None
+
+
+@dataclass
+class RowSort:
+    """One sort key (nulls always sort last)"""
+    column: Column
+    descending: bool = False
+
+
+@dataclass
+class RowQuery:
+    """Filters (all must match), sort keys and the columns to return (None: all of them)"""
+    filters: List[RowFilter] = field(default_factory=list)
+    sorts: List[RowSort] = field(default_factory=list)
+    fields: Optional[List[Column]] = None
+    
+    @property
+    def column_ids(self) -> Optional[List[int]]:
+        """IDs of the projected columns, None for all"""
+        return [column.id for column in self.fields] if self.fields is not None else None
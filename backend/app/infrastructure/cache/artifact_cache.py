@@ -0,0 +1,67 @@
+"""
+Content-addressed cache for generated code artifacts
+Keys are derived from everything that determines the output - table ID, schema
+hash, data revision, format and template - so an unchanged table is never re-rendered
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from app.infrastructure.cache.cache_manager import CacheManager, cache_manager
+from app.infrastructure.cache.invalidation import table_tag
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """Generated artifact with its strong ETag"""
+    content: str
+    etag: str
+
+
+class ArtifactCache:
+    """
+    Artifact cache keyed by (table_id, schema hash, data revision, format, template revision)
+    O(1) lookups; artifacts carry their table's tag, so any write to the table evicts them
+    """
+    
+    def __init__(self, cache: Optional[CacheManager] = None, ttl_seconds: int = 3600):
+        self._cache = cache if cache is not None else cache_manager
+        self._ttl_seconds = ttl_seconds
+    
+    @staticmethod
+    def schema_hash(columns: List[Dict[str, Any]]) -> str:
+        """Stable hash of a table schema (column dicts)"""
+        payload = json.dumps(columns, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    
+    @staticmethod
+    def make_key(table_id: int, schema_hash: str, data_revision: str, format: str, template_revision: str = "") -> str:
+        """Build the content address of an artifact"""
+        return f"artifact:{table_id}:{schema_hash}:{data_revision}:{format.lower()}:{template_revision}"
+    
+    @staticmethod
+    def etag_for(key: str) -> str:
+        """Strong ETag for an artifact key (same key -> byte-identical content)"""
+        return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+    
+    def get(self, key: str) -> Optional[Artifact]:
+        """Get artifact - O(1)"""
+        return self._cache.get(key)
+    
+    def set(self, table_id: int, key: str, artifact: Artifact):
+        """Store artifact - O(1)"""
+        self._cache.set(
+            key,
+            artifact,
+            self._ttl_seconds,
+            size=len(artifact.content.encode("utf-8")),
+            tags=[table_tag(table_id)]
+        )
+    
+    def invalidate_table(self, table_id: int):
+        """Drop all artifacts of a table - O(k) where k is artifacts of the table"""
+        self._cache.invalidate_tags(table_tag(table_id))
+
+
+# Global artifact cache instance
+artifact_cache = ArtifactCache()
@@ -1,67 +1,300 @@
 """
-Simple in-memory cache manager
+Bounded in-memory cache manager
+LRU eviction by entry count and approximate size, TTL expiry on a monotonic clock
 For production, consider Redis or similar
 """
-from typing import Any, Optional, Dict
-from datetime import datetime, timedelta
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict, deque
+from datetime import date, time as time_of_day, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional, Dict, Iterable, Set, Tuple
+from app.core.config import get_settings
+
+settings = get_settings()
 
 
 class CacheEntry:
     """Cache entry with expiration"""
     
-    def __init__(self, value: Any, ttl_seconds: int = 300):
+    __slots__ = ("value", "expires_at", "size", "tags")
+    
+    def __init__(self, value: Any, ttl_seconds: float = 300, size: int = 0, tags: Tuple[str, ...] = ()):
         self.value = value
-        self.expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+        self.expires_at = time.monotonic() + ttl_seconds
+        self.size = size
+        self.tags = tags
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """Check if entry is expired"""
-        return datetime.utcnow() > self.expires_at
+        return (now if now is not None else time.monotonic()) > self.expires_at
+
+
+# Objects shared with the rest of the process rather than owned by a cached value
+UNSIZED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+# Leaf types: sys.getsizeof already covers their whole payload
+ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None), date, time_of_day, timedelta, Decimal)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Memory footprint of a value in bytes - O(n) in the objects it reaches
+    Walks containers, instance __dict__s and __slots__ to any depth; each object is
+    counted once, so shared values (and cycles) are not counted twice
+    """
+    getsizeof = sys.getsizeof
+    size = 0
+    seen: Set[int] = set()
+    pending = [value]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, UNSIZED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += getsizeof(obj)
+        if isinstance(obj, ATOMIC_TYPES):
+            continue
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            pending.extend(obj)
+        else:
+            attributes = getattr(obj, "__dict__", None)
+            if attributes is not None and id(attributes) not in seen:
+                # Attribute names are interned and shared by every instance: only values count
+                seen.add(id(attributes))
+                size += getsizeof(attributes)
+                pending.extend(attributes.values())
+            for name in _slot_names(type(obj)):
+                if hasattr(obj, name):
+                    pending.append(getattr(obj, name))
+    return size
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """Names of the __slots__ attributes declared by a class and its bases"""
+    names = []
+    for base in cls.__mro__:
+        slots = base.__dict__.get("__slots__", ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return tuple(name for name in names if name not in ("__dict__", "__weakref__"))
 
 
 class CacheManager:
     """
-    Simple in-memory cache manager
-    O(1) get/set operations
+    Bounded in-memory cache manager
+    O(1) get/set/delete, LRU eviction when max_entries or max_bytes is exceeded
+    Thread-safe; expired entries are dropped on access and by an optional background sweeper
+    Entries can carry tags (e.g. "table:5") and be invalidated together by tag; each
+    invalidation stamps its tags with a new sequence number, kept for at most
+    max_entries tags (older stamps fold into a floor that counts for every tag)
     """
     
-    def __init__(self):
-        self._cache: Dict[str, CacheEntry] = {}
+    def __init__(
+        self,
+        max_entries: int = settings.CACHE_MAX_ENTRIES,
+        max_bytes: int = settings.CACHE_MAX_BYTES
+    ):
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._tag_versions: "OrderedDict[str, int]" = OrderedDict()
+        self._tag_sequence = 0
+        self._tag_version_floor = 0
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_stop = threading.Event()
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache - O(1)"""
-        entry = self._cache.get(key)
-        if entry is None:
-            return None
-        
-        if entry.is_expired():
-            del self._cache[key]
-            return None
-        
-        return entry.value
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            
+            if entry.is_expired():
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return entry.value
+    
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: float = 300,
+        size: Optional[int] = None,
+        tags: Iterable[str] = (),
+        if_tag_versions: Optional[Dict[str, int]] = None
+    ) -> bool:
+        """
+        Set value in cache - O(1) amortized; `size` overrides the estimated byte size
+        With `if_tag_versions` (from tag_versions() taken before loading the value) the
+        value is only stored if none of its tags were invalidated in the meantime
+        Returns whether the value was stored
+        """
+        entry_size = size if size is not None else estimate_size(value)
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            
+            # Never keep a single value larger than the whole budget
+            if entry_size > self._max_bytes:
+                return False
+            
+            # A write invalidated the data while it was being loaded - storing it would be stale
+            if if_tag_versions is not None and any(
+                self._tag_version(tag) != version for tag, version in if_tag_versions.items()
+            ):
+                return False
+            
+            self._cache[key] = CacheEntry(value, ttl_seconds, entry_size, tags)
+            self._bytes += entry_size
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            self._evict()
+            return True
     
-    def set(self, key: str, value: Any, ttl_seconds: int = 300):
-        """Set value in cache - O(1)"""
-        self._cache[key] = CacheEntry(value, ttl_seconds)
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Snapshot the invalidation stamps of tags - O(k)"""
+        with self._lock:
+            return {tag: self._tag_version(tag) for tag in tags}
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry carrying any of the tags - O(k) where k is matching entries"""
+        removed = 0
+        with self._lock:
+            self._tag_sequence += 1
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_sequence
+                self._tag_versions.move_to_end(tag)
+                for key in list(self._tag_index.get(tag, ())):
+                    if key in self._cache:
+                        self._remove(key)
+                        removed += 1
+                self._tag_index.pop(tag, None)
+            self._invalidations += removed
+            # Stamps are in ascending order, so the oldest one dropped is the new floor
+            while len(self._tag_versions) > self._max_entries:
+                _, self._tag_version_floor = self._tag_versions.popitem(last=False)
+        return removed
     
     def delete(self, key: str):
         """Delete key from cache - O(1)"""
-        if key in self._cache:
-            del self._cache[key]
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
     
     def clear(self):
-        """Clear all cache"""
-        self._cache.clear()
-    
-    def cleanup_expired(self):
-        """Remove expired entries - O(n)"""
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if entry.is_expired()
-        ]
-        for key in expired_keys:
-            del self._cache[key]
+        """Clear all cache; values being loaded when it is cleared are not stored"""
+        with self._lock:
+            self._cache.clear()
+            self._tag_index.clear()
+            self._tag_versions.clear()
+            self._tag_sequence += 1
+            self._tag_version_floor = self._tag_sequence
+            self._bytes = 0
+    
+    def cleanup_expired(self) -> int:
+        """Remove expired entries - O(n), returns number of removed entries"""
+        now = time.monotonic()
+        with self._lock:
+            expired_keys = [
+                key for key, entry in self._cache.items()
+                if entry.is_expired(now)
+            ]
+            for key in expired_keys:
+                self._remove(key)
+            self._expirations += len(expired_keys)
+        return len(expired_keys)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters and current size"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._cache),
+                "bytes": self._bytes,
+                "max_entries": self._max_entries,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "tags": len(self._tag_index),
+                "tag_versions": len(self._tag_versions)
+            }
+    
+    def start_sweeper(self, interval_seconds: float = settings.CACHE_SWEEP_INTERVAL_SECONDS):
+        """Start a daemon thread that removes expired entries every `interval_seconds`"""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._sweeper_stop.clear()
+        
+        def sweep():
+            while not self._sweeper_stop.wait(interval_seconds):
+                self.cleanup_expired()
+        
+        self._sweeper = threading.Thread(target=sweep, name="cache-sweeper", daemon=True)
+        self._sweeper.start()
+    
+    def stop_sweeper(self):
+        """Stop the background sweeper"""
+        self._sweeper_stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=1)
+            self._sweeper = None
+    
+    def __len__(self) -> int:
+        return len(self._cache)
+    
+    def _tag_version(self, tag: str) -> int:
+        """Stamp of a tag's last invalidation, or the floor if it was dropped (caller holds the lock)"""
+        return self._tag_versions.get(tag, self._tag_version_floor)
+    
+    def _remove(self, key: str):
+        """Remove an entry and release its size (caller holds the lock)"""
+        entry = self._cache.pop(key)
+        self._release(key, entry)
+    
+    def _release(self, key: str, entry: CacheEntry):
+        """Release an entry's size and tag index slots (caller holds the lock)"""
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+    
+    def _evict(self):
+        """Evict least recently used entries until within bounds (caller holds the lock)"""
+        while self._cache and (len(self._cache) > self._max_entries or self._bytes > self._max_bytes):
+            key, entry = self._cache.popitem(last=False)
+            self._release(key, entry)
+            self._evictions += 1
 
 
 # Global cache instance
 cache_manager = CacheManager()
-
@@ -0,0 +1,89 @@
+"""
+Tag-based cache invalidation
+Repository writes emit invalidation events for the project/table/row IDs they
+touch; every cache entry tagged with one of those IDs is evicted right away and
+once more when the surrounding transaction ends, so a read that raced the write
+cannot leave stale data behind
+"""
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.infrastructure.cache.cache_manager import CacheManager, cache_manager
+
+# Session.info key holding tags to evict again when the transaction ends
+PENDING_TAGS_KEY = "cache_invalidation_tags"
+
+
+def project_tag(project_id: int) -> str:
+    """Cache tag for a project"""
+    return f"project:{project_id}"
+
+
+def table_tag(table_id: int) -> str:
+    """Cache tag for a table"""
+    return f"table:{table_id}"
+
+
+def schema_tag(table_id: int) -> str:
+    """Cache tag for a table's column definitions (not evicted by data writes)"""
+    return f"schema:{table_id}"
+
+
+def row_tag(row_id: int) -> str:
+    """Cache tag for a row"""
+    return f"row:{row_id}"
+
+
+def user_tag(user_id: int) -> str:
+    """Cache tag for a user (principal)"""
+    return f"user:{user_id}"
+
+
+def build_tags(
+    project_ids: Iterable[Optional[int]] = (),
+    table_ids: Iterable[Optional[int]] = (),
+    row_ids: Iterable[Optional[int]] = ()
+) -> List[str]:
+    """Build the tag list for the given IDs (None IDs are skipped)"""
+    tags = [project_tag(id) for id in project_ids if id is not None]
+    tags.extend(table_tag(id) for id in table_ids if id is not None)
+    tags.extend(row_tag(id) for id in row_ids if id is not None)
+    return tags
+
+
+def emit_invalidation(
+    session: Optional[AsyncSession] = None,
+    project_ids: Iterable[Optional[int]] = (),
+    table_ids: Iterable[Optional[int]] = (),
+    row_ids: Iterable[Optional[int]] = (),
+    cache: Optional[CacheManager] = None,
+    tags: Iterable[str] = ()
+) -> int:
+    """
+    Evict every cache entry tagged with the affected IDs (or extra `tags`) - O(k) where k is matching entries
+    With a session the tags are evicted again after its commit/rollback
+    Returns the number of entries evicted now
+    """
+    tags = build_tags(project_ids, table_ids, row_ids) + list(tags)
+    if not tags:
+        return 0
+    
+    cache = cache if cache is not None else cache_manager
+    if session is not None:
+        pending: Set[str] = session.sync_session.info.setdefault(PENDING_TAGS_KEY, set())
+        pending.update(tags)
+    return cache.invalidate_tags(*tags)
+
+
+def _flush_pending_tags(session: Session):
+    """Evict tags recorded during the transaction that just ended"""
+    tags = session.info.pop(PENDING_TAGS_KEY, None)
+    if tags:
+        cache_manager.invalidate_tags(*tags)
+
+
+# Readers that loaded data between the write and its commit see the old rows;
+# a second eviction once the transaction is over drops whatever they cached
+event.listen(Session, "after_commit", _flush_pending_tags)
+event.listen(Session, "after_rollback", _flush_pending_tags)
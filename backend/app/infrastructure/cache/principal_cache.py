@@ -0,0 +1,84 @@
+"""
+Authenticated principal cache
+Keeps decoded JWT payloads (until the token's `exp`) and short-lived user
+snapshots keyed by the token `sub`, so authenticated requests skip the JWT
+verification and the users query on hot paths
+"""
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.core.security import decode_access_token
+from app.infrastructure.cache.cache_manager import CacheManager, cache_manager
+from app.infrastructure.cache.invalidation import emit_invalidation, user_tag
+from app.infrastructure.models.user import UserModel
+
+settings = get_settings()
+
+# Columns kept in the snapshot; the password hash never leaves the database layer
+SNAPSHOT_EXCLUDED_COLUMNS = {"hashed_password"}
+
+
+class PrincipalCache:
+    """
+    Principal cache on top of CacheManager - O(1) lookups
+    Entries carry the user's tag, so invalidate_user() drops both the snapshot
+    and every memoized token of that user
+    """
+    
+    def __init__(self, cache: Optional[CacheManager] = None, ttl_seconds: int = settings.PRINCIPAL_CACHE_TTL_SECONDS):
+        self._cache = cache if cache is not None else cache_manager
+        self._ttl_seconds = ttl_seconds
+    
+    def decode_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """Decode a JWT, memoized per token until it expires"""
+        key = f"jwt:{token}"
+        payload = self._cache.get(key)
+        if payload is not None:
+            return payload
+        
+        payload = decode_access_token(token)
+        if payload is None:
+            return None
+        
+        # Tokens without `exp` never expire in jose; keep them for the snapshot TTL only
+        exp = payload.get("exp")
+        ttl_seconds = exp - time.time() if exp is not None else self._ttl_seconds
+        if ttl_seconds > 0:
+            tags = [user_tag(payload["sub"])] if payload.get("sub") is not None else []
+            self._cache.set(key, payload, ttl_seconds, tags=tags)
+        return payload
+    
+    async def get_user(
+        self,
+        user_id: int,
+        loader: Callable[[], Awaitable[Optional[UserModel]]]
+    ) -> Optional[UserModel]:
+        """
+        Get a user, from the cache as a transient (session-less) model or via `loader`
+        A snapshot loaded while the user was being invalidated is not stored
+        """
+        key = f"principal:{user_id}"
+        snapshot = self._cache.get(key)
+        if snapshot is not None:
+            return UserModel(**snapshot)
+        
+        tags = [user_tag(user_id)]
+        versions = self._cache.tag_versions(tags)
+        user = await loader()
+        if user is not None:
+            snapshot = {
+                column.key: getattr(user, column.key)
+                for column in UserModel.__table__.columns
+                if column.key not in SNAPSHOT_EXCLUDED_COLUMNS
+            }
+            self._cache.set(key, snapshot, self._ttl_seconds, tags=tags, if_tag_versions=versions)
+        return user
+    
+    def invalidate_user(self, user_id: int, session: Optional[AsyncSession] = None):
+        """Drop a user's snapshot and tokens (again after `session` commits, if given)"""
+        emit_invalidation(session, tags=[user_tag(user_id)], cache=self._cache)
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache()
@@ -0,0 +1,99 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key share one in-flight computation
+instead of each running the same queries
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, Optional, TypeVar
+from app.infrastructure.cache.cache_manager import CacheManager, cache_manager
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """
+    Async single-flight group
+    The first caller for a key runs the loader; callers arriving while it runs await its result
+    """
+    
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._calls = 0
+        self._shared = 0
+    
+    async def do(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        """Run `loader` once for all concurrent callers of `key`"""
+        self._calls += 1
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                return await self._lead(key, loader)
+            
+            self._shared += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leader was cancelled (e.g. its client disconnected) - take over
+                if future.cancelled():
+                    continue
+                raise
+    
+    async def _lead(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        """Run the loader and publish its outcome to waiting callers"""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+    
+    async def do_cached(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        ttl_seconds: float,
+        tags: Iterable[str] = (),
+        cache: Optional[CacheManager] = None
+    ) -> T:
+        """
+        Serve `key` from the cache; on a miss run `loader` once for all concurrent callers
+        The result is stored under `tags` unless one of them was invalidated while loading
+        """
+        cache = cache if cache is not None else cache_manager
+        value = cache.get(key)
+        if value is not None:
+            return value
+        
+        tags = tuple(tags)
+        
+        async def load() -> T:
+            versions = cache.tag_versions(tags)
+            result = await loader()
+            cache.set(key, result, ttl_seconds, tags=tags, if_tag_versions=versions)
+            return result
+        
+        return await self.do(key, load)
+    
+    def stats(self) -> Dict[str, int]:
+        """Get coalescing counters"""
+        return {
+            "calls": self._calls,
+            "shared": self._shared,
+            "in_flight": len(self._inflight)
+        }
+
+
+# Global single-flight group
+single_flight = SingleFlight()
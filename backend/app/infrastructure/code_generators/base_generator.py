@@ -5,7 +5,7 @@ Abstract base class following Template Method pattern
 from abc import abstractmethod
 from typing import Dict, Any
 from app.domain.interfaces.code_generators import ICodeGenerator
-from jinja2 import Template
+from app.infrastructure.code_generators.template_environment import get_template_environment
 
 
 class BaseCodeGenerator(ICodeGenerator):
@@ -26,10 +26,17 @@ class BaseCodeGenerator(ICodeGenerator):
         """Get MIME type"""
         pass
     
+    def get_template_name(self) -> str:
+        """Get generator name used to key compiled templates and template overrides"""
+        return type(self).__name__.replace("Generator", "").lower()
+    
+    def get_template_revision(self) -> str:
+        """Identify the template (built-in source or override file) the output is rendered with"""
+        return get_template_environment().get_template_revision(self.get_template_name(), self.get_template())
+    
     def generate(self, table_data: Dict[str, Any], schema: Dict[str, Any]) -> str:
         """Generate code from table data and schema"""
-        template_str = self.get_template()
-        template = Template(template_str)
+        template = get_template_environment().get_template(self.get_template_name(), self.get_template())
         
         # Prepare context
         context = {
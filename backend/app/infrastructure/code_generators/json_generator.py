@@ -50,6 +50,10 @@ class JSONGenerator(BaseCodeGenerator):
         """Not used for JSON generator"""
         return ""
     
+    def get_template_revision(self) -> str:
+        """No template is rendered"""
+        return ""
+    
     def get_file_extension(self) -> str:
         """Get file extension"""
         return ".json"
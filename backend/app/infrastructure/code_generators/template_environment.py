@@ -0,0 +1,120 @@
+"""
+Shared Jinja2 environment for code generators
+Templates are compiled once and reused: built-in template strings are registered
+under a name keyed by generator and template hash, so each distinct template is
+parsed/compiled a single time per process (and persisted by the bytecode cache)
+"""
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+from jinja2 import (
+    BaseLoader,
+    ChoiceLoader,
+    DictLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    TemplateNotFound,
+)
+from app.core.config import get_settings
+
+# File name pattern for user-provided template overrides in CODE_GENERATION_TEMPLATES_DIR
+OVERRIDE_TEMPLATE_PATTERN = "{generator}.j2"
+
+
+class TemplateEnvironment:
+    """
+    Jinja2 environment wrapper - O(1) template lookup after first compile
+    Lookup order: <templates_dir>/<generator>.j2 override, then the built-in template
+    """
+    
+    def __init__(self, templates_dir: Optional[str] = None, auto_reload: bool = False):
+        self._builtin_sources: Dict[str, str] = {}
+        self._builtin_names: Dict[Tuple[str, str], str] = {}
+        self._missing_overrides: Set[str] = set()
+        self._lock = threading.Lock()
+        self._templates_dir = templates_dir
+        self._has_templates_dir = bool(templates_dir) and os.path.isdir(templates_dir)
+        
+        loaders: List[BaseLoader] = []
+        if self._has_templates_dir:
+            loaders.append(FileSystemLoader(templates_dir))
+        loaders.append(DictLoader(self._builtin_sources))
+        
+        self._auto_reload = auto_reload
+        self._env = Environment(
+            loader=ChoiceLoader(loaders),
+            auto_reload=auto_reload,
+            bytecode_cache=FileSystemBytecodeCache(),
+            cache_size=400,
+        )
+    
+    @property
+    def environment(self) -> Environment:
+        """Get the underlying Jinja2 environment"""
+        return self._env
+    
+    def get_template(self, generator_name: str, template_str: str) -> Template:
+        """Get the compiled template for a generator"""
+        override = self._get_override(generator_name)
+        if override is not None:
+            return override
+        return self._env.get_template(self._builtin_name(generator_name, template_str))
+    
+    def get_template_revision(self, generator_name: str, template_str: str) -> str:
+        """
+        Identify the template a generator renders with, for cache keys of its output
+        An override is identified by its file's mtime and size (so edits picked up by
+        auto-reload change it), a built-in template by its source hash
+        """
+        name = OVERRIDE_TEMPLATE_PATTERN.format(generator=generator_name)
+        known_missing = not self._auto_reload and name in self._missing_overrides
+        if self._has_templates_dir and not known_missing:
+            try:
+                stat = os.stat(os.path.join(self._templates_dir, name))
+            except OSError:
+                pass
+            else:
+                return f"override-{stat.st_mtime_ns}-{stat.st_size}"
+        return self._builtin_name(generator_name, template_str)
+    
+    def _builtin_name(self, generator_name: str, template_str: str) -> str:
+        """Register a built-in template source, returns its name (keyed by source hash)"""
+        # Python caches str hashes, so this lookup avoids re-hashing the template source
+        name = self._builtin_names.get((generator_name, template_str))
+        if name is None:
+            digest = hashlib.sha256(template_str.encode("utf-8")).hexdigest()[:16]
+            name = f"builtin/{generator_name}-{digest}.j2"
+            with self._lock:
+                self._builtin_sources.setdefault(name, template_str)
+                self._builtin_names[(generator_name, template_str)] = name
+        return name
+    
+    def _get_override(self, generator_name: str) -> Optional[Template]:
+        """Get the template override from the templates directory, if one exists"""
+        if not self._has_templates_dir:
+            return None
+        
+        name = OVERRIDE_TEMPLATE_PATTERN.format(generator=generator_name)
+        # Without auto-reload a missing override stays missing - skip the filesystem check
+        if not self._auto_reload and name in self._missing_overrides:
+            return None
+        
+        try:
+            return self._env.get_template(name)
+        except TemplateNotFound:
+            self._missing_overrides.add(name)
+            return None
+
+
+@lru_cache()
+def get_template_environment() -> TemplateEnvironment:
+    """Get the shared template environment (auto-reloads templates in debug mode)"""
+    settings = get_settings()
+    return TemplateEnvironment(
+        templates_dir=settings.CODE_GENERATION_TEMPLATES_DIR,
+        auto_reload=settings.DEBUG,
+    )
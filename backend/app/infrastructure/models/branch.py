@@ -0,0 +1,35 @@
+"""
+Branch models
+"""
+from sqlalchemy import Column, Integer, ForeignKey, String, Text, UniqueConstraint
+from app.infrastructure.models.base import BaseModel
+
+
+class BranchModel(BaseModel):
+    """Data branch ORM model - a named copy-on-write view of a table"""
+    __tablename__ = "branches"
+    __table_args__ = (
+        UniqueConstraint("table_id", "name", name="uq_branches_table_id_name"),
+    )
+    
+    table_id = Column(Integer, ForeignKey("tables.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Latest version of the table when the branch was created or last merged
+    base_version_id = Column(Integer, ForeignKey("versions.id"), nullable=True)
+
+
+class BranchCellModel(BaseModel):
+    """Branch overlay cell ORM model - only cells overridden on the branch are stored"""
+    __tablename__ = "branch_cells"
+    __table_args__ = (
+        # Overlay lookups and upserts: (branch_id, row_id, column_id)
+        UniqueConstraint("branch_id", "row_id", "column_id", name="uq_branch_cells_branch_id_row_id_column_id"),
+    )
+    
+    branch_id = Column(Integer, ForeignKey("branches.id", ondelete="CASCADE"), nullable=False)
+    row_id = Column(Integer, ForeignKey("rows.id", ondelete="CASCADE"), nullable=False, index=True)
+    column_id = Column(Integer, ForeignKey("columns.id", ondelete="CASCADE"), nullable=False)
+    value = Column(Text, nullable=True)  # Same text storage form as cells.value
+    base_value = Column(Text, nullable=True)  # Base table value when first overridden, branch value after a merge
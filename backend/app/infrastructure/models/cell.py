@@ -1,16 +1,41 @@
 """
 Row and Cell models
 """
-from sqlalchemy import Column, Integer, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, ForeignKey, Text, JSON, Numeric, Index, text, case, cast, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.elements import Grouping
 from app.infrastructure.models.base import BaseModel
 
+# Cell text that reads as a number (values of integer, float and reference columns)
+NUMERIC_VALUE_PATTERN = r"^-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?$"
+
+
+def numeric_value(value):
+    """
+    Cell text as NUMERIC when it reads as a number, NULL otherwise (PostgreSQL)
+    Never fails on text of other columns, so it can back one index over all cells;
+    queries must use this exact expression for the index to apply
+    """
+    return case(
+        (value.op("~")(literal_column(f"'{NUMERIC_VALUE_PATTERN}'")), cast(value, Numeric)),
+        else_=None
+    )
+
 
 class RowModel(BaseModel):
     """Row ORM model"""
     __tablename__ = "rows"
+    __table_args__ = (
+        # Keyset pagination: WHERE table_id = :t AND id > :after ORDER BY id
+        Index("ix_rows_table_id_id", "table_id", "id"),
+    )
     
     table_id = Column(Integer, ForeignKey("tables.id"), nullable=False, index=True)
+    # Row-packed storage: {column_id: typed value}, used by the "packed" storage backend
+    values = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    # Optimistic concurrency: incremented by every write to the row or its cells
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
     
     # Relationships
     table = relationship("TableModel", back_populates="rows")
@@ -20,12 +45,27 @@ class RowModel(BaseModel):
 class CellModel(BaseModel):
     """Cell ORM model"""
     __tablename__ = "cells"
+    __table_args__ = (
+        # Typed filters and sorts join one cell per row: ON row_id = rows.id AND column_id = :c
+        Index("ix_cells_row_id_column_id", "row_id", "column_id"),
+    )
     
     row_id = Column(Integer, ForeignKey("rows.id"), nullable=False, index=True)
     column_id = Column(Integer, ForeignKey("columns.id"), nullable=False, index=True)
     value = Column(Text, nullable=True)  # Store as text, parse based on column type
+    # Optimistic concurrency: incremented by every write to the cell
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
     
     # Relationships
     row = relationship("RowModel", back_populates="cells")
     column = relationship("ColumnModel")
 
+
+# Typed filters and sorts of numeric columns: WHERE column_id = :c AND <numeric value> > :v
+# (PostgreSQL only accepts an expression that is not a function call in parentheses)
+Index(
+    "ix_cells_column_id_numeric_value",
+    CellModel.column_id,
+    Grouping(numeric_value(CellModel.value))
+).ddl_if(dialect="postgresql")
+
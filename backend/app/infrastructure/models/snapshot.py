@@ -0,0 +1,19 @@
+"""
+Table snapshot model
+"""
+from sqlalchemy import Column, Integer, ForeignKey, LargeBinary, Index
+from app.infrastructure.models.base import BaseModel
+
+
+class TableSnapshotModel(BaseModel):
+    """Full-table snapshot ORM model - cell state right after a version"""
+    __tablename__ = "table_snapshots"
+    __table_args__ = (
+        # Nearest snapshot: WHERE table_id = :t AND version_id <= :v ORDER BY version_id DESC
+        Index("ix_table_snapshots_table_id_version_id", "table_id", "version_id"),
+    )
+    
+    table_id = Column(Integer, ForeignKey("tables.id"), nullable=False)
+    version_id = Column(Integer, ForeignKey("versions.id"), nullable=False)
+    cell_count = Column(Integer, nullable=False, default=0)
+    data = Column(LargeBinary, nullable=False)  # zlib-compressed JSON: [[cell_id, row_id, column_id, value], ...]
@@ -0,0 +1,24 @@
+"""
+Staged change model
+"""
+from sqlalchemy import Column, Integer, Boolean, ForeignKey, JSON, UniqueConstraint
+from app.infrastructure.models.base import BaseModel
+
+
+class StagedChangeModel(BaseModel):
+    """Staged (uncommitted) cell change ORM model - one entry per user and cell"""
+    __tablename__ = "staged_changes"
+    __table_args__ = (
+        UniqueConstraint("user_id", "cell_id", name="uq_staged_changes_user_id_cell_id"),
+    )
+    
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    table_id = Column(Integer, ForeignKey("tables.id"), nullable=False, index=True)
+    # No foreign key on the cell: a staged deletion outlives the cell until it is committed
+    cell_id = Column(Integer, nullable=False, index=True)
+    row_id = Column(Integer, nullable=True)
+    column_id = Column(Integer, nullable=True)
+    old_value = Column(JSON, nullable=True)  # Value before the first uncommitted write
+    new_value = Column(JSON, nullable=True)  # Value after the latest uncommitted write
+    is_new = Column(Boolean, default=False, nullable=False)
+    is_deleted = Column(Boolean, default=False, nullable=False)
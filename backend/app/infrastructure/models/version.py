@@ -1,7 +1,7 @@
 """
 Version/Commit model
 """
-from sqlalchemy import Column, Integer, ForeignKey, String, Text, JSON
+from sqlalchemy import Column, Integer, Boolean, ForeignKey, String, Text, JSON, Index, DateTime
 from app.infrastructure.models.base import BaseModel
 
 
@@ -13,5 +13,44 @@ class VersionModel(BaseModel):
     table_id = Column(Integer, ForeignKey("tables.id"), nullable=True, index=True)
     message = Column(String(500), nullable=False)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    changes = Column(JSON, nullable=False)  # {cell_id: {old_value, new_value}}
+    changes = Column(JSON, nullable=False)  # {cell_id: {old_value, new_value, row_id, column_id, ...}}
 
+
+class VersionChangeModel(BaseModel):
+    """Normalized version change ORM model - one entry per changed cell of a version"""
+    __tablename__ = "version_changes"
+    __table_args__ = (
+        # History lookups: WHERE <key> = :k ORDER BY version_id DESC
+        Index("ix_version_changes_cell_id_version_id", "cell_id", "version_id"),
+        Index("ix_version_changes_row_id_version_id", "row_id", "version_id"),
+        Index("ix_version_changes_column_id_version_id", "column_id", "version_id"),
+        Index("ix_version_changes_table_id_version_id", "table_id", "version_id"),
+    )
+    
+    version_id = Column(Integer, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False, index=True)
+    # No foreign keys on the cell location: history outlives deleted rows and columns
+    table_id = Column(Integer, nullable=True)
+    row_id = Column(Integer, nullable=True)
+    column_id = Column(Integer, nullable=True)
+    cell_id = Column(Integer, nullable=False)
+    old_value = Column(JSON, nullable=True)
+    new_value = Column(JSON, nullable=True)
+    is_new = Column(Boolean, default=False, nullable=False)
+    is_deleted = Column(Boolean, default=False, nullable=False)
+
+
+class CellBlameModel(BaseModel):
+    """Cell blame ORM model - the last version (and author) that changed each cell"""
+    __tablename__ = "cell_blame"
+    __table_args__ = (
+        # Blame for a page of rows: WHERE row_id IN (page)
+        Index("ix_cell_blame_row_id", "row_id"),
+    )
+    
+    cell_id = Column(Integer, ForeignKey("cells.id", ondelete="CASCADE"), nullable=False, unique=True)
+    table_id = Column(Integer, ForeignKey("tables.id"), nullable=False, index=True)
+    row_id = Column(Integer, nullable=False)
+    column_id = Column(Integer, nullable=False)
+    version_id = Column(Integer, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
+    author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    changed_at = Column(DateTime, nullable=False)
@@ -2,12 +2,13 @@
 Generic base repository implementation
 DRY principle - reduces code duplication
 """
-from typing import Optional, List, TypeVar, Generic, Type
+from typing import Optional, List, TypeVar, Generic, Type, Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, update
 from sqlalchemy.orm import selectinload
 from app.domain.interfaces.repositories import IRepository
 from app.infrastructure.models.base import BaseModel
+from app.infrastructure.cache.invalidation import emit_invalidation
 
 T = TypeVar('T', bound=BaseModel)
 D = TypeVar('D')  # Domain entity type
@@ -73,6 +74,24 @@ class BaseRepository(Generic[T, D], IRepository[D]):
         await self.session.flush()
         return result.rowcount > 0
     
+    async def commit(self):
+        """Commit the current unit of work (used to bound long batch operations)"""
+        await self.session.commit()
+    
+    def _invalidate(
+        self,
+        project_ids: Iterable[Optional[int]] = (),
+        table_ids: Iterable[Optional[int]] = (),
+        row_ids: Iterable[Optional[int]] = (),
+        tags: Iterable[str] = ()
+    ):
+        """Evict cache entries tagged with the IDs touched by a write (or extra `tags`)"""
+        emit_invalidation(self.session, project_ids=project_ids, table_ids=table_ids, row_ids=row_ids, tags=tags)
+    
+    def _dialect_name(self) -> str:
+        """Name of the SQL dialect behind the session (e.g. 'postgresql', 'sqlite')"""
+        return self.session.get_bind().dialect.name
+    
     def _to_domain(self, model: T) -> D:
         """Convert model to domain entity - must be implemented by subclasses"""
         raise NotImplementedError("Subclass must implement _to_domain")
@@ -0,0 +1,210 @@
+"""
+Branch repository implementation
+"""
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, update, and_, case, cast, exists, null, union_all, Integer
+from sqlalchemy.dialects import postgresql, sqlite
+from app.domain.entities.branch import Branch, BranchCell
+from app.domain.entities.cell import Row, Cell
+from app.domain.interfaces.repositories import IBranchRepository
+from app.infrastructure.models.branch import BranchModel, BranchCellModel
+from app.infrastructure.models.cell import RowModel, CellModel
+from app.infrastructure.repositories.base_repository import BaseRepository
+
+
+class BranchRepository(BaseRepository[BranchModel, Branch], IBranchRepository):
+    """Branch repository implementation - branches store only their overridden cells"""
+    
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, BranchModel, Branch)
+    
+    async def get_by_table_id(self, table_id: int) -> List[Branch]:
+        """Get branches of a table - O(n) where n is number of branches"""
+        stmt = select(BranchModel).where(BranchModel.table_id == table_id).order_by(BranchModel.id)
+        result = await self.session.execute(stmt)
+        return [self._to_domain(model) for model in result.scalars().all()]
+    
+    async def delete(self, id: int) -> bool:
+        """Delete a branch and its overlay - O(n) where n is overridden cells"""
+        await self.session.execute(delete(BranchCellModel).where(BranchCellModel.branch_id == id))
+        return await super().delete(id)
+    
+    async def set_cells(self, branch_id: int, row_id: int, values: Dict[int, Any]) -> int:
+        """
+        Override a row's cells (by column ID) on a branch - one read of the base
+        values plus one upsert; a cell overridden again keeps its first base value
+        """
+        if not values:
+            return 0
+        
+        result = await self.session.execute(
+            select(CellModel.column_id, CellModel.value).where(
+                CellModel.row_id == row_id,
+                CellModel.column_id.in_(list(values))
+            )
+        )
+        base_values = dict(result.all())
+        
+        now = datetime.utcnow()
+        records = [
+            {
+                "branch_id": branch_id,
+                "row_id": row_id,
+                "column_id": column_id,
+                # Same text storage form as cells.value
+                "value": str(value) if value is not None else None,
+                "base_value": base_values.get(column_id),
+                "created_at": now,
+                "updated_at": now
+            }
+            for column_id, value in values.items()
+        ]
+        dialect = postgresql if self._dialect_name() == "postgresql" else sqlite
+        stmt = dialect.insert(BranchCellModel).values(records)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BranchCellModel.branch_id, BranchCellModel.row_id, BranchCellModel.column_id],
+            set_={"value": stmt.excluded.value, "updated_at": now}
+        )
+        await self.session.execute(stmt)
+        return len(records)
+    
+    async def get_overrides(self, branch_id: int) -> List[BranchCell]:
+        """
+        Get all cells overridden on a branch with the live base values - one query,
+        O(n) where n is overridden cells
+        """
+        stmt = select(BranchCellModel, CellModel.id, CellModel.value).outerjoin(
+            CellModel,
+            and_(CellModel.row_id == BranchCellModel.row_id, CellModel.column_id == BranchCellModel.column_id)
+        ).where(
+            BranchCellModel.branch_id == branch_id
+        ).order_by(BranchCellModel.row_id, BranchCellModel.column_id)
+        result = await self.session.execute(stmt)
+        return [
+            BranchCell(
+                branch_id=model.branch_id,
+                row_id=model.row_id,
+                column_id=model.column_id,
+                value=model.value,
+                base_value=model.base_value,
+                cell_id=cell_id,
+                current_value=current_value,
+                updated_at=model.updated_at
+            )
+            for model, cell_id, current_value in result.all()
+        ]
+    
+    async def mark_merged(self, branch_id: int, version_id: Optional[int]) -> int:
+        """
+        Make the branch's current values the base of its next merge, so merged (or
+        deliberately discarded) edits are not offered again - one UPDATE
+        """
+        result = await self.session.execute(
+            update(BranchCellModel).where(
+                BranchCellModel.branch_id == branch_id
+            ).values(base_value=BranchCellModel.value, updated_at=datetime.utcnow())
+        )
+        if version_id is not None:
+            await self.session.execute(
+                update(BranchModel).where(BranchModel.id == branch_id).values(base_version_id=version_id)
+            )
+        return result.rowcount
+    
+    async def get_rows(
+        self,
+        branch_id: int,
+        table_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Row]:
+        """
+        Get one page of a table's rows as seen on a branch - a single query:
+        base cells LEFT JOIN the overlay (override wins), UNION ALL overlay cells
+        the base row does not have; paging is the same keyset/offset as the base table
+        """
+        page = select(RowModel.id).where(RowModel.table_id == table_id)
+        if after_id is not None:
+            page = page.where(RowModel.id > after_id).order_by(RowModel.id).limit(limit)
+        else:
+            page = page.order_by(RowModel.id).offset(skip).limit(limit)
+        page = page.cte("page")
+        
+        overlay = BranchCellModel.__table__
+        cells = CellModel.__table__
+        base_cells = select(
+            cells.c.row_id,
+            cells.c.column_id,
+            cells.c.id.label("cell_id"),
+            case((overlay.c.id.is_not(None), overlay.c.value), else_=cells.c.value).label("value")
+        ).join(
+            page, page.c.id == cells.c.row_id
+        ).outerjoin(
+            overlay,
+            and_(
+                overlay.c.branch_id == branch_id,
+                overlay.c.row_id == cells.c.row_id,
+                overlay.c.column_id == cells.c.column_id
+            )
+        )
+        overlay_only = select(
+            overlay.c.row_id,
+            overlay.c.column_id,
+            cast(null(), Integer).label("cell_id"),
+            overlay.c.value
+        ).join(
+            page, page.c.id == overlay.c.row_id
+        ).where(
+            overlay.c.branch_id == branch_id,
+            ~exists().where(cells.c.row_id == overlay.c.row_id, cells.c.column_id == overlay.c.column_id)
+        )
+        merged = union_all(base_cells, overlay_only).subquery("merged")
+        
+        stmt = select(
+            page.c.id, merged.c.column_id, merged.c.cell_id, merged.c.value
+        ).select_from(page).outerjoin(
+            merged, merged.c.row_id == page.c.id
+        ).order_by(page.c.id)
+        result = await self.session.execute(stmt)
+        
+        rows: Dict[int, Row] = {}
+        for row_id, column_id, cell_id, value in result.all():
+            row = rows.get(row_id)
+            if row is None:
+                row = rows[row_id] = Row(id=row_id, table_id=table_id, cells={})
+            if column_id is not None:
+                row.cells[column_id] = Cell(id=cell_id, row_id=row_id, column_id=column_id, value=value)
+        return list(rows.values())
+    
+    def _to_domain(self, model: BranchModel) -> Branch:
+        """Convert model to domain entity"""
+        return Branch(
+            id=model.id,
+            table_id=model.table_id,
+            name=model.name,
+            description=model.description,
+            created_by=model.created_by,
+            base_version_id=model.base_version_id,
+            created_at=model.created_at,
+            updated_at=model.updated_at
+        )
+    
+    def _to_model(self, domain: Branch) -> BranchModel:
+        """Convert domain entity to model"""
+        return BranchModel(
+            id=domain.id,
+            table_id=domain.table_id,
+            name=domain.name,
+            description=domain.description,
+            created_by=domain.created_by,
+            base_version_id=domain.base_version_id,
+            created_at=domain.created_at,
+            updated_at=domain.updated_at
+        )
+    
+    def _update_model_from_domain(self, model: BranchModel, domain: Branch):
+        """Update model from domain entity"""
+        model.name = domain.name
+        model.description = domain.description
@@ -7,6 +7,7 @@ from sqlalchemy import select, delete
 from app.domain.entities.table import Column
 from app.infrastructure.models.table import ColumnModel
 from app.infrastructure.repositories.base_repository import BaseRepository
+from app.infrastructure.cache.invalidation import schema_tag
 
 
 class ColumnRepository(BaseRepository[ColumnModel, Column]):
@@ -22,11 +23,33 @@ class ColumnRepository(BaseRepository[ColumnModel, Column]):
         models = result.scalars().all()
         return [self._to_domain(model) for model in models]
     
+    async def create(self, entity: Column) -> Column:
+        """Create new column - O(1)"""
+        column = await super().create(entity)
+        self._invalidate(table_ids=[column.table_id], tags=[schema_tag(column.table_id)])
+        return column
+    
+    async def update(self, entity: Column) -> Column:
+        """Update existing column - O(1)"""
+        column = await super().update(entity)
+        self._invalidate(table_ids=[column.table_id], tags=[schema_tag(column.table_id)])
+        return column
+    
+    async def delete(self, id: int) -> bool:
+        """Delete column by ID - O(1)"""
+        result = await self.session.execute(select(ColumnModel.table_id).where(ColumnModel.id == id))
+        table_id = result.scalar_one_or_none()
+        deleted = await super().delete(id)
+        if deleted:
+            self._invalidate(table_ids=[table_id], tags=[schema_tag(table_id)])
+        return deleted
+    
     async def delete_by_table_id(self, table_id: int) -> int:
         """Delete all columns for a table - O(n)"""
         stmt = delete(ColumnModel).where(ColumnModel.table_id == table_id)
         result = await self.session.execute(stmt)
         await self.session.flush()
+        self._invalidate(table_ids=[table_id], tags=[schema_tag(table_id)])
         return result.rowcount
     
     async def _to_domain_async(self, model: ColumnModel) -> Column:
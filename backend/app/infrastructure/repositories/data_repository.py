@@ -1,14 +1,44 @@
 """
 Data repository implementation
 """
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Dict, Any, AsyncIterator, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from app.domain.entities.cell import Row, Cell
+from sqlalchemy import select, insert, update, delete, values, column, bindparam, any_, and_, cast, func, Integer, Float, Text
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import selectinload, aliased
+from app.domain.entities.cell import Row, Cell, CellChange
+from app.domain.entities.table import Column
+from app.domain.value_objects.row_query import RowQuery, RowFilter
 from app.domain.interfaces.repositories import IDataRepository
-from app.infrastructure.models.cell import RowModel, CellModel
+from app.infrastructure.models.cell import RowModel, CellModel, numeric_value
 from app.infrastructure.repositories.base_repository import BaseRepository
+from app.infrastructure.repositories.row_query_compiler import NUMERIC_TYPES, query_clauses, order_clauses, query_columns
+
+
+# Elements per IN (...) list on dialects without array binds
+IN_CHUNK_SIZE = 500
+
+
+async def read_data_revision(session: AsyncSession, table_id: int) -> str:
+    """
+    Data revision of a table from its rows alone - O(n) over the (table_id, id) index
+    Every write bumps its row's version and updated_at and inserts/deletes change the
+    count or the highest ID, so no shared counter has to be updated (and locked) per write
+    """
+    result = await session.execute(
+        select(
+            func.count(RowModel.id),
+            func.max(RowModel.id),
+            func.sum(RowModel.version),
+            func.max(RowModel.updated_at)
+        ).where(RowModel.table_id == table_id)
+    )
+    count, max_id, versions, updated_at = result.one()
+    if not count:
+        return "0"
+    return f"{count}.{max_id}.{versions}.{updated_at}"
 
 
 class DataRepository(BaseRepository[RowModel, Row], IDataRepository):
@@ -17,26 +47,136 @@ class DataRepository(BaseRepository[RowModel, Row], IDataRepository):
     def __init__(self, session: AsyncSession):
         super().__init__(session, RowModel, Row)
     
-    async def get_rows_by_table_id(self, table_id: int, skip: int = 0, limit: int = 100) -> List[Row]:
-        """Get rows by table ID - O(n) where n is limit"""
+    async def get_rows_by_table_id(
+        self,
+        table_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Row]:
+        """
+        Get rows by table ID ordered by row ID - O(n) where n is limit
+        With `after_id` a keyset seek on (table_id, id) is used instead of OFFSET,
+        so every page costs the same regardless of depth
+        """
         stmt = select(RowModel).where(
             RowModel.table_id == table_id
         ).options(
             selectinload(RowModel.cells)
-        ).offset(skip).limit(limit)
+        ).order_by(RowModel.id)
+        
+        if after_id is not None:
+            stmt = stmt.where(RowModel.id > after_id).limit(limit)
+        else:
+            stmt = stmt.offset(skip).limit(limit)
         result = await self.session.execute(stmt)
         models = result.scalars().all()
         return [self._to_domain(model) for model in models]
     
+    async def stream_rows_by_table_id(self, table_id: int, chunk_size: int = 1000) -> AsyncIterator[List[Row]]:
+        """
+        Stream rows by table ID - O(chunk_size) memory
+        Uses a server-side cursor (yield_per); cells are loaded per partition
+        """
+        stmt = select(RowModel).where(
+            RowModel.table_id == table_id
+        ).options(
+            selectinload(RowModel.cells)
+        ).order_by(RowModel.id).execution_options(yield_per=chunk_size)
+        
+        result = await self.session.stream_scalars(stmt)
+        async for partition in result.partitions():
+            yield [self._to_domain(model) for model in partition]
+    
     async def get_row_by_id(self, row_id: int) -> Optional[Row]:
         """Get row by ID - O(1)"""
-        model = await self.session.get(RowModel, row_id)
+        # Writes are set-based statements, so reload instead of trusting the identity map
+        model = await self.session.get(RowModel, row_id, populate_existing=True)
         if model:
             # Load cells
             await self.session.refresh(model, ["cells"])
             return self._to_domain(model)
         return None
     
+    async def get_rows_by_ids(
+        self,
+        table_id: int,
+        row_ids: List[int],
+        column_ids: Optional[List[int]] = None
+    ) -> List[Row]:
+        """
+        Get the rows of a table with the given IDs, with their cells (of `column_ids` only, if
+        given) - one outer join query per IN_CHUNK_SIZE IDs (no per-row cell loads)
+        """
+        ids = list(dict.fromkeys(row_ids))
+        rows: Dict[int, Row] = {}
+        joined = CellModel.row_id == RowModel.id
+        if column_ids is not None:
+            joined = and_(joined, CellModel.column_id.in_(column_ids))
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            result = await self.session.execute(
+                select(RowModel.id, RowModel.version, CellModel.id, CellModel.column_id, CellModel.value).outerjoin(
+                    CellModel, joined
+                ).where(
+                    RowModel.table_id == table_id,
+                    RowModel.id.in_(ids[start:start + IN_CHUNK_SIZE])
+                )
+            )
+            for row_id, version, cell_id, column_id, value in result.all():
+                row = rows.get(row_id)
+                if row is None:
+                    row = rows[row_id] = Row(id=row_id, table_id=table_id, version=version or 1)
+                if cell_id is not None:
+                    row.cells[column_id] = Cell(id=cell_id, row_id=row_id, column_id=column_id, value=value)
+        return [rows[row_id] for row_id in ids if row_id in rows]
+    
+    async def query_rows(
+        self,
+        table_id: int,
+        query: RowQuery,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Row]:
+        """
+        Get one page of rows matching a query - one statement selects the page's row IDs
+        (an outer join of the cells of each column filtered or sorted on, compared as their
+        column's type), then only the projected cells of those rows are loaded
+        """
+        stmt = select(RowModel.id).where(RowModel.table_id == table_id)
+        expressions = {}
+        for table_column in query_columns(query):
+            cell = aliased(CellModel)
+            stmt = stmt.outerjoin(cell, and_(cell.row_id == RowModel.id, cell.column_id == table_column.id))
+            expressions[table_column.id] = self._typed_value(cell.value, table_column.data_type)
+        
+        stmt = stmt.where(*query_clauses(query, expressions, self._filter_value)).order_by(
+            *order_clauses(query, expressions), RowModel.id
+        )
+        if after_id is not None:
+            stmt = stmt.where(RowModel.id > after_id).limit(limit)
+        else:
+            stmt = stmt.offset(skip).limit(limit)
+        result = await self.session.execute(stmt)
+        return await self.get_rows_by_ids(table_id, list(result.scalars().all()), query.column_ids)
+    
+    def _typed_value(self, value: ColumnElement, data_type: str) -> ColumnElement:
+        """
+        Cell text as its column's type: numbers are cast (on PostgreSQL with the expression
+        of ix_cells_column_id_numeric_value), everything else compares as stored text
+        """
+        if data_type not in NUMERIC_TYPES:
+            return value
+        if self._dialect_name() == "postgresql":
+            return numeric_value(value)
+        return cast(value, Float if data_type == "float" else Integer)
+    
+    def _filter_value(self, row_filter: RowFilter) -> Any:
+        """A filter's value in the form _typed_value compares it with"""
+        if row_filter.column.data_type in NUMERIC_TYPES or row_filter.operator == "~":
+            return row_filter.value
+        return self._serialize_value(row_filter.value)
+    
     async def create_row(self, row: Row) -> Row:
         """Create a new row with cells - O(n) where n is number of cells"""
         model = self._to_model(row)
@@ -49,7 +189,7 @@ class DataRepository(BaseRepository[RowModel, Row], IDataRepository):
             cell_model = CellModel(
                 row_id=model.id,
                 column_id=column_id,
-                value=str(cell.value) if cell.value is not None else None
+                value=self._serialize_value(cell.value)
             )
             self.session.add(cell_model)
             # Update cell entity with row_id
@@ -57,8 +197,62 @@ class DataRepository(BaseRepository[RowModel, Row], IDataRepository):
         
         await self.session.flush()
         await self.session.refresh(model, ["cells"])
+        self._invalidate(table_ids=[model.table_id])
         return self._to_domain(model)
     
+    async def create_rows(self, table_id: int, rows: List[Dict[int, Any]]) -> List[int]:
+        """
+        Create many rows with their cells using set-based inserts - O(n) statements per chunk
+        Rows go in as one multi-row INSERT ... RETURNING; cells use COPY on PostgreSQL
+        and a multi-row INSERT elsewhere. `rows` maps column_id -> value per row.
+        """
+        if not rows:
+            return []
+        
+        now = datetime.utcnow()
+        stmt = insert(RowModel).returning(RowModel.id, sort_by_parameter_order=True)
+        result = await self.session.execute(
+            stmt,
+            [{"table_id": table_id, "created_at": now, "updated_at": now} for _ in rows]
+        )
+        row_ids = list(result.scalars().all())
+        
+        cell_records = [
+            (row_id, column_id, self._serialize_value(value), now, now)
+            for row_id, values in zip(row_ids, rows)
+            for column_id, value in values.items()
+        ]
+        if cell_records:
+            if self._dialect_name() == "postgresql":
+                await self._copy_cells(cell_records)
+            else:
+                await self.session.execute(
+                    insert(CellModel),
+                    [
+                        {
+                            "row_id": row_id,
+                            "column_id": column_id,
+                            "value": value,
+                            "created_at": created_at,
+                            "updated_at": updated_at
+                        }
+                        for row_id, column_id, value, created_at, updated_at in cell_records
+                    ]
+                )
+        
+        self._invalidate(table_ids=[table_id])
+        return row_ids
+    
+    async def _copy_cells(self, records: List[tuple]):
+        """Stream cell records with COPY on the session's own connection (PostgreSQL only)"""
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            CellModel.__tablename__,
+            records=records,
+            columns=["row_id", "column_id", "value", "created_at", "updated_at"]
+        )
+    
     async def update_row(self, row: Row) -> Row:
         """Update row and its cells - O(n) where n is number of cells"""
         model = await self.session.get(RowModel, row.id)
@@ -79,27 +273,212 @@ class DataRepository(BaseRepository[RowModel, Row], IDataRepository):
             
             if existing_cell:
                 # Update existing cell
-                existing_cell.value = str(cell.value) if cell.value is not None else None
+                existing_cell.value = self._serialize_value(cell.value)
+                existing_cell.version = CellModel.version + 1
             else:
                 # Create new cell
                 cell_model = CellModel(
                     row_id=row.id,
                     column_id=column_id,
-                    value=str(cell.value) if cell.value is not None else None
+                    value=self._serialize_value(cell.value)
                 )
                 self.session.add(cell_model)
         
+        model.version = RowModel.version + 1
+        model.updated_at = datetime.utcnow()
         await self.session.flush()
+        await self.session.refresh(model)
         await self.session.refresh(model, ["cells"])
+        self._invalidate(table_ids=[model.table_id], row_ids=[row.id])
         return self._to_domain(model)
     
     async def delete_row(self, row_id: int) -> bool:
-        """Delete row by ID - O(1)"""
-        return await self.delete(row_id)
+        """Delete a row and its cells - O(c) where c is cells of the row"""
+        table_id = await self.get_row_table_id(row_id)
+        if table_id is None:
+            return False
+        # Cells go first: they reference the row, and leftovers would still read as live values
+        await self.session.execute(delete(CellModel).where(CellModel.row_id == row_id))
+        deleted = await self.delete(row_id)
+        if deleted:
+            self._invalidate(table_ids=[table_id], row_ids=[row_id])
+        return deleted
+    
+    async def delete_rows(self, row_ids: List[int]) -> int:
+        """Delete many rows and their cells - two DELETE statements per IN_CHUNK_SIZE rows"""
+        ids = list(dict.fromkeys(row_ids))
+        table_ids: Set[int] = set()
+        deleted = 0
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            chunk = ids[start:start + IN_CHUNK_SIZE]
+            await self.session.execute(delete(CellModel).where(CellModel.row_id.in_(chunk)))
+            result = await self.session.execute(
+                delete(RowModel).where(RowModel.id.in_(chunk)).returning(RowModel.table_id)
+            )
+            tables = result.scalars().all()
+            table_ids.update(tables)
+            deleted += len(tables)
+        if deleted:
+            self._invalidate(table_ids=table_ids, row_ids=ids)
+        return deleted
+    
+    async def restore_rows(self, rows: List[Row]) -> Set[int]:
+        """
+        Re-insert deleted rows and their cells with their original IDs - multi-row INSERTs,
+        so version history, blame and snapshots keep pointing at them. Rows that still exist
+        only get their cells inserted; cells must not exist yet
+        """
+        if not rows:
+            return set()
+        
+        now = datetime.utcnow()
+        existing: Set[int] = set()
+        ids = [row.id for row in rows]
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            result = await self.session.execute(
+                select(RowModel.id).where(RowModel.id.in_(ids[start:start + IN_CHUNK_SIZE]))
+            )
+            existing.update(result.scalars().all())
+        
+        missing = [
+            {"id": row.id, "table_id": row.table_id, "created_at": now, "updated_at": now}
+            for row in rows
+            if row.id not in existing
+        ]
+        if missing:
+            await self.session.execute(insert(RowModel), missing)
+        cell_records = [
+            {
+                "id": cell.id,
+                "row_id": row.id,
+                "column_id": column_id,
+                "value": self._serialize_value(cell.value),
+                "created_at": now,
+                "updated_at": now
+            }
+            for row in rows
+            for column_id, cell in row.cells.items()
+        ]
+        if cell_records:
+            await self.session.execute(insert(CellModel), cell_records)
+        
+        return await self._touch_rows(set(ids))
+    
+    async def get_row_table_id(self, row_id: int) -> Optional[int]:
+        """Get the table ID a row belongs to - O(1)"""
+        result = await self.session.execute(select(RowModel.table_id).where(RowModel.id == row_id))
+        return result.scalar_one_or_none()
+    
+    async def get_data_revision(self, table_id: int) -> str:
+        """Get a token that changes with every row write, insert and delete of a table - O(n)"""
+        return await read_data_revision(self.session, table_id)
+    
+    async def get_row_ids(self, table_id: int) -> List[int]:
+        """Get every row ID of a table in ascending order - O(n), an index-only scan of (table_id, id)"""
+        result = await self.session.execute(
+            select(RowModel.id).where(RowModel.table_id == table_id).order_by(RowModel.id)
+        )
+        return list(result.scalars().all())
+    
+    async def filter_row_ids(self, table_id: int, row_ids: List[int]) -> Set[int]:
+        """Get the subset of `row_ids` that are rows of the table - one query per IN_CHUNK_SIZE IDs"""
+        ids = list(dict.fromkeys(row_ids))
+        existing: Set[int] = set()
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            result = await self.session.execute(
+                select(RowModel.id).where(
+                    RowModel.table_id == table_id,
+                    RowModel.id.in_(ids[start:start + IN_CHUNK_SIZE])
+                )
+            )
+            existing.update(result.scalars().all())
+        return existing
+    
+    async def get_column_values(self, table_id: int, column_ids: List[int]) -> List[Tuple[int, int, Any]]:
+        """Get the non-null values of some columns as (row_id, column_id, text value) - one query"""
+        if not column_ids:
+            return []
+        result = await self.session.execute(
+            select(CellModel.row_id, CellModel.column_id, CellModel.value).join(
+                RowModel, RowModel.id == CellModel.row_id
+            ).where(
+                RowModel.table_id == table_id,
+                CellModel.column_id.in_(column_ids),
+                CellModel.value.isnot(None)
+            ).order_by(CellModel.row_id, CellModel.column_id)
+        )
+        return [tuple(record) for record in result.all()]
+    
+    async def find_references(
+        self,
+        columns: List[Column],
+        row_ids: List[int],
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, int, Any]]:
+        """
+        Find cells of reference columns pointing at `row_ids`, as (row_id, column_id, text value)
+        Values are stored as text, so the IDs are matched in their serialized form - one query
+        per IN_CHUNK_SIZE IDs on the cells' column_id index, joined to the live rows of the
+        columns' tables
+        """
+        column_ids = [column.id for column in columns]
+        table_ids = list({column.table_id for column in columns})
+        values = [self._serialize_value(row_id) for row_id in dict.fromkeys(row_ids)]
+        found: List[Tuple[int, int, Any]] = []
+        if not column_ids:
+            return found
+        for start in range(0, len(values), IN_CHUNK_SIZE):
+            stmt = select(CellModel.row_id, CellModel.column_id, CellModel.value).join(
+                RowModel, RowModel.id == CellModel.row_id
+            ).where(
+                RowModel.table_id.in_(table_ids),
+                CellModel.column_id.in_(column_ids),
+                CellModel.value.in_(values[start:start + IN_CHUNK_SIZE])
+            ).order_by(CellModel.row_id, CellModel.column_id)
+            if limit is not None:
+                stmt = stmt.limit(limit - len(found))
+            result = await self.session.execute(stmt)
+            found.extend(tuple(record) for record in result.all())
+            if limit is not None and len(found) >= limit:
+                break
+        return found
+    
+    async def get_cell_locations(self, cell_ids: List[int]) -> Dict[int, Tuple[int, int, int]]:
+        """Map cell IDs to (table_id, row_id, column_id) - one join query per IN_CHUNK_SIZE cells"""
+        ids = list(dict.fromkeys(cell_ids))
+        locations: Dict[int, Tuple[int, int, int]] = {}
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            result = await self.session.execute(
+                select(CellModel.id, RowModel.table_id, CellModel.row_id, CellModel.column_id).join(
+                    RowModel, CellModel.row_id == RowModel.id
+                ).where(CellModel.id.in_(ids[start:start + IN_CHUNK_SIZE]))
+            )
+            for cell_id, table_id, row_id, column_id in result.all():
+                locations[cell_id] = (table_id, row_id, column_id)
+        return locations
+    
+    async def get_row_cell_ids(self, row_ids: List[int]) -> Dict[int, Tuple[int, Dict[int, int]]]:
+        """
+        Map row IDs to (table_id, {column_id: cell_id}) - one outer join query per
+        IN_CHUNK_SIZE rows; rows without cells map to an empty dict
+        """
+        ids = list(dict.fromkeys(row_ids))
+        rows: Dict[int, Tuple[int, Dict[int, int]]] = {}
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            result = await self.session.execute(
+                select(RowModel.id, RowModel.table_id, CellModel.column_id, CellModel.id).outerjoin(
+                    CellModel, CellModel.row_id == RowModel.id
+                ).where(RowModel.id.in_(ids[start:start + IN_CHUNK_SIZE]))
+            )
+            for row_id, table_id, column_id, cell_id in result.all():
+                _, cells = rows.setdefault(row_id, (table_id, {}))
+                if cell_id is not None:
+                    cells[column_id] = cell_id
+        return rows
     
     async def get_cell_by_id(self, cell_id: int) -> Optional[Cell]:
         """Get cell by ID - O(1)"""
-        model = await self.session.get(CellModel, cell_id)
+        model = await self.session.get(CellModel, cell_id, populate_existing=True)
         if model:
             return self._cell_to_domain(model)
         return None
@@ -110,11 +489,263 @@ class DataRepository(BaseRepository[RowModel, Row], IDataRepository):
         if not model:
             raise ValueError(f"Cell with ID {cell.id} not found")
         
-        model.value = str(cell.value) if cell.value is not None else None
+        model.value = self._serialize_value(cell.value)
+        model.version = CellModel.version + 1
         await self.session.flush()
         await self.session.refresh(model)
+        await self._touch_rows({model.row_id})
         return self._cell_to_domain(model)
     
+    async def get_cells_by_ids(self, cell_ids: List[int]) -> List[Cell]:
+        """
+        Get many cells by ID - one query on PostgreSQL (ids bound as a single array),
+        IN lists of IN_CHUNK_SIZE elsewhere to stay under bind parameter limits
+        """
+        if not cell_ids:
+            return []
+        
+        if self._dialect_name() == "postgresql":
+            ids_param = bindparam("cell_ids", list(cell_ids), type_=ARRAY(Integer))
+            result = await self.session.execute(select(CellModel).where(CellModel.id == any_(ids_param)))
+            return [self._cell_to_domain(model) for model in result.scalars().all()]
+        
+        cells = []
+        for start in range(0, len(cell_ids), IN_CHUNK_SIZE):
+            chunk = cell_ids[start:start + IN_CHUNK_SIZE]
+            result = await self.session.execute(select(CellModel).where(CellModel.id.in_(chunk)))
+            cells.extend(self._cell_to_domain(model) for model in result.scalars().all())
+        return cells
+    
+    async def update_cells(self, cells: List[Cell]) -> Set[int]:
+        """
+        Write many cell values with one statement - O(n)
+        PostgreSQL gets UPDATE ... FROM (VALUES ...); other dialects an executemany
+        UPDATE by primary key. Returns the IDs of the tables the cells belong to.
+        """
+        if not cells:
+            return set()
+        
+        now = datetime.utcnow()
+        cells_table = CellModel.__table__
+        if self._dialect_name() == "postgresql":
+            new_values = values(
+                column("id", Integer),
+                column("value", Text),
+                name="new_values"
+            ).data([(cell.id, self._serialize_value(cell.value)) for cell in cells])
+            stmt = update(cells_table).where(cells_table.c.id == new_values.c.id).values(
+                value=new_values.c.value,
+                version=cells_table.c.version + 1,
+                updated_at=now
+            )
+            await self.session.execute(stmt)
+        else:
+            stmt = update(cells_table).where(cells_table.c.id == bindparam("b_id")).values(
+                value=bindparam("b_value"),
+                version=cells_table.c.version + 1,
+                updated_at=now
+            )
+            await self.session.execute(
+                stmt,
+                [{"b_id": cell.id, "b_value": self._serialize_value(cell.value)} for cell in cells]
+            )
+        
+        return await self._touch_rows({cell.row_id for cell in cells})
+    
+    async def update_cell_values(
+        self,
+        values: Dict[int, Any],
+        expected_versions: Optional[Dict[int, int]] = None
+    ) -> List[CellChange]:
+        """
+        Set cell values by cell ID, capturing the old values in the same statement - O(n)
+        Cells listed in `expected_versions` are only written if their version still
+        matches (WHERE version = :v in the UPDATE itself). Cells that do not exist or
+        fail the version check are skipped (absent from the result)
+        """
+        serialized = {cell_id: self._serialize_value(value) for cell_id, value in values.items()}
+        expected_versions = expected_versions or {}
+        conditional = [cell_id for cell_id in serialized if cell_id in expected_versions]
+        unconditional = [cell_id for cell_id in serialized if cell_id not in expected_versions]
+        
+        changes: List[CellChange] = []
+        for cell_ids, expected in ((unconditional, None), (conditional, expected_versions)):
+            for start in range(0, len(cell_ids), IN_CHUNK_SIZE):
+                chunk = {cell_id: serialized[cell_id] for cell_id in cell_ids[start:start + IN_CHUNK_SIZE]}
+                changes.extend(await self._update_capturing("id", chunk, expected=expected))
+        
+        if changes:
+            await self._touch_rows({change.row_id for change in changes})
+        return changes
+    
+    async def write_row_cells(
+        self,
+        row_id: int,
+        values: Dict[int, Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[List[CellChange]]:
+        """
+        Set a row's values by column ID, capturing old values - O(n) where n is number of cells
+        The row's version is bumped first, conditionally on `expected_version` when given
+        (single UPDATE ... WHERE version = :v); returns None if that check fails.
+        Existing cells are updated in one statement; missing ones are inserted (old value None)
+        """
+        row_update = update(RowModel).where(RowModel.id == row_id)
+        if expected_version is not None:
+            row_update = row_update.where(RowModel.version == expected_version)
+        result = await self.session.execute(
+            row_update.values(version=RowModel.version + 1, updated_at=datetime.utcnow()).execution_options(
+                synchronize_session=False
+            )
+        )
+        if expected_version is not None and result.rowcount == 0:
+            return None
+        if not values:
+            return []
+        
+        serialized = {column_id: self._serialize_value(value) for column_id, value in values.items()}
+        changes = await self._update_capturing("column_id", serialized, CellModel.__table__.c.row_id == row_id)
+        
+        updated_columns = {change.column_id for change in changes}
+        missing = [column_id for column_id in serialized if column_id not in updated_columns]
+        if missing:
+            now = datetime.utcnow()
+            stmt = insert(CellModel).returning(CellModel.id, CellModel.column_id, sort_by_parameter_order=True)
+            result = await self.session.execute(
+                stmt,
+                [
+                    {
+                        "row_id": row_id,
+                        "column_id": column_id,
+                        "value": serialized[column_id],
+                        "created_at": now,
+                        "updated_at": now
+                    }
+                    for column_id in missing
+                ]
+            )
+            changes.extend(
+                CellChange(cell_id=cell_id, row_id=row_id, column_id=column_id, new_value=serialized[column_id], version=1)
+                for cell_id, column_id in result.all()
+            )
+        
+        await self._rows_changed({row_id})
+        return changes
+    
+    async def _update_capturing(
+        self,
+        key: str,
+        new_values: Dict[int, Optional[str]],
+        *criteria,
+        expected: Optional[Dict[int, int]] = None
+    ) -> List[CellChange]:
+        """
+        UPDATE cells matched on `key` ("id" or "column_id") and `criteria`, returning old and new values
+        With `expected` ({key: version}) only cells still at that version are written.
+        PostgreSQL does it in one UPDATE ... FROM (VALUES ...), (locked old values) ... RETURNING;
+        SQLite's RETURNING cannot reference other tables, so it reads the old values first and
+        makes the UPDATE conditional on the version it read
+        """
+        if not new_values:
+            return []
+        
+        cells = CellModel.__table__
+        key_column = cells.c[key]
+        now = datetime.utcnow()
+        
+        if self._dialect_name() == "postgresql":
+            incoming_columns = [column("key", Integer), column("value", Text)]
+            if expected is not None:
+                incoming_columns.append(column("expected", Integer))
+            incoming = values(*incoming_columns, name="incoming").data([
+                (k, v, expected[k]) if expected is not None else (k, v)
+                for k, v in new_values.items()
+            ])
+            version_check = [cells.c.version == incoming.c.expected] if expected is not None else []
+            old = select(cells.c.id, cells.c.value.label("old_value")).where(
+                key_column.in_(list(new_values)), *criteria
+            ).with_for_update().subquery("old")
+            stmt = update(cells).where(
+                cells.c.id == old.c.id,
+                key_column == incoming.c.key,
+                *version_check
+            ).values(
+                value=incoming.c.value,
+                version=cells.c.version + 1,
+                updated_at=now
+            ).returning(cells.c.id, cells.c.row_id, cells.c.column_id, old.c.old_value, cells.c.value, cells.c.version)
+            records = (await self.session.execute(stmt)).all()
+        else:
+            result = await self.session.execute(
+                select(cells.c.id, cells.c.row_id, cells.c.column_id, cells.c.value, cells.c.version).where(
+                    key_column.in_(list(new_values)), *criteria
+                )
+            )
+            records = []
+            for cell_id, row_id, column_id, old_value, version in result.all():
+                record_key = cell_id if key == "id" else column_id
+                if expected is not None and expected[record_key] != version:
+                    continue
+                records.append((cell_id, row_id, column_id, old_value, new_values[record_key], version + 1))
+            if records:
+                stmt = update(cells).where(
+                    cells.c.id == bindparam("b_id"),
+                    cells.c.version == bindparam("b_version")
+                ).values(
+                    value=bindparam("b_value"),
+                    version=cells.c.version + 1,
+                    updated_at=now
+                )
+                await self.session.execute(
+                    stmt,
+                    [{"b_id": record[0], "b_version": record[5] - 1, "b_value": record[4]} for record in records]
+                )
+        
+        return [
+            CellChange(
+                cell_id=cell_id,
+                row_id=row_id,
+                column_id=column_id,
+                old_value=old_value,
+                new_value=new_value,
+                version=version
+            )
+            for cell_id, row_id, column_id, old_value, new_value, version in records
+        ]
+    
+    async def _touch_rows(self, row_ids: Set[int]) -> Set[int]:
+        """Bump version and updated_at of rows whose cells were written, returns their table IDs"""
+        now = datetime.utcnow()
+        ids = list(row_ids)
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            await self.session.execute(
+                update(RowModel).where(
+                    RowModel.id.in_(ids[start:start + IN_CHUNK_SIZE])
+                ).values(version=RowModel.version + 1, updated_at=now).execution_options(synchronize_session=False)
+            )
+        return await self._rows_changed(row_ids)
+    
+    async def _rows_changed(self, row_ids: Set[int]) -> Set[int]:
+        """Invalidate cached data of changed rows and their tables, returns the table IDs"""
+        table_ids = set((await self.session.execute(
+            select(RowModel.table_id).where(RowModel.id.in_(row_ids)).distinct()
+        )).scalars().all())
+        self._invalidate(table_ids=table_ids, row_ids=row_ids)
+        return table_ids
+    
+    async def get_table_cells(self, table_id: int) -> List[Cell]:
+        """Get every cell of a table - O(n), one join query"""
+        stmt = select(CellModel).join(RowModel, CellModel.row_id == RowModel.id).where(
+            RowModel.table_id == table_id
+        ).order_by(CellModel.row_id, CellModel.column_id)
+        result = await self.session.execute(stmt)
+        return [self._cell_to_domain(model) for model in result.scalars().all()]
+    
+    @staticmethod
+    def _serialize_value(value: Any) -> Optional[str]:
+        """Serialize a cell value to its text storage form"""
+        return str(value) if value is not None else None
+    
     def _to_domain(self, model: RowModel) -> Row:
         """Convert model to domain entity"""
         cells_dict = {}
@@ -126,6 +757,7 @@ class DataRepository(BaseRepository[RowModel, Row], IDataRepository):
             id=model.id,
             table_id=model.table_id,
             cells=cells_dict,
+            version=model.version or 1,
             created_at=model.created_at,
             updated_at=model.updated_at
         )
@@ -152,6 +784,7 @@ class DataRepository(BaseRepository[RowModel, Row], IDataRepository):
             row_id=model.row_id,
             column_id=model.column_id,
             value=value,
+            version=model.version or 1,
             created_at=model.created_at,
             updated_at=model.updated_at
         )
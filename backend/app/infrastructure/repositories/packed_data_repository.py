@@ -0,0 +1,475 @@
+"""
+Row-packed data repository implementation
+Stores each row's values as one JSON(B) document on the rows table instead of
+one `cells` record per value - a full read is one object per row and values
+keep their JSON types, so no parsing is needed after the load
+"""
+from datetime import datetime
+from typing import Optional, List, Dict, Any, AsyncIterator, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.orm import noload
+from app.domain.entities.cell import Row, Cell, CellChange
+from app.domain.entities.table import Column
+from app.domain.value_objects.row_query import RowQuery
+from app.domain.interfaces.repositories import IDataRepository
+from app.infrastructure.models.cell import RowModel, CellModel
+from app.infrastructure.repositories.base_repository import BaseRepository
+from app.infrastructure.repositories.data_repository import IN_CHUNK_SIZE, read_data_revision
+from app.infrastructure.repositories.row_query_compiler import query_clauses, order_clauses, query_columns
+from app.application.validators.data_validator import DataValidator
+
+# Optimistic read-modify-write attempts of a row document before giving up
+WRITE_ATTEMPTS = 3
+
+
+class PackedDataRepository(BaseRepository[RowModel, Row], IDataRepository):
+    """
+    Data repository backed by RowModel.values
+    Cells have no identity of their own here: cell-addressed operations
+    (get_cell_by_id / update_cell) are only available on the EAV backend
+    """
+    
+    supports_cell_ids = False
+    
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, RowModel, Row)
+    
+    async def get_by_id(self, id: int) -> Optional[Row]:
+        """Get row by ID - O(1)"""
+        return await self.get_row_by_id(id)
+    
+    async def get_rows_by_table_id(
+        self,
+        table_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Row]:
+        """Get rows by table ID ordered by row ID - O(n) where n is limit"""
+        stmt = select(RowModel).where(
+            RowModel.table_id == table_id
+        ).options(
+            noload(RowModel.cells)
+        ).order_by(RowModel.id)
+        
+        if after_id is not None:
+            stmt = stmt.where(RowModel.id > after_id).limit(limit)
+        else:
+            stmt = stmt.offset(skip).limit(limit)
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        return [self._to_domain(model) for model in models]
+    
+    async def stream_rows_by_table_id(self, table_id: int, chunk_size: int = 1000) -> AsyncIterator[List[Row]]:
+        """Stream rows by table ID through a server-side cursor - O(chunk_size) memory"""
+        stmt = select(RowModel).where(
+            RowModel.table_id == table_id
+        ).options(
+            noload(RowModel.cells)
+        ).order_by(RowModel.id).execution_options(yield_per=chunk_size)
+        
+        result = await self.session.stream_scalars(stmt)
+        async for partition in result.partitions():
+            yield [self._to_domain(model) for model in partition]
+    
+    async def get_row_by_id(self, row_id: int) -> Optional[Row]:
+        """Get row by ID - O(1)"""
+        stmt = select(RowModel).where(RowModel.id == row_id).options(
+            noload(RowModel.cells)
+        ).execution_options(populate_existing=True)
+        result = await self.session.execute(stmt)
+        model = result.scalar_one_or_none()
+        if model:
+            return self._to_domain(model)
+        return None
+    
+    async def get_rows_by_ids(
+        self,
+        table_id: int,
+        row_ids: List[int],
+        column_ids: Optional[List[int]] = None
+    ) -> List[Row]:
+        """
+        Get the rows of a table with the given IDs - one query per IN_CHUNK_SIZE IDs
+        Documents are read whole; values outside `column_ids` are dropped afterwards
+        """
+        ids = list(dict.fromkeys(row_ids))
+        rows: Dict[int, Row] = {}
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            result = await self.session.execute(
+                select(RowModel).where(
+                    RowModel.table_id == table_id,
+                    RowModel.id.in_(ids[start:start + IN_CHUNK_SIZE])
+                ).options(noload(RowModel.cells))
+            )
+            for model in result.scalars().all():
+                row = self._to_domain(model)
+                if column_ids is not None:
+                    row.cells = {column_id: row.cells[column_id] for column_id in column_ids if column_id in row.cells}
+                rows[model.id] = row
+        return [rows[row_id] for row_id in ids if row_id in rows]
+    
+    async def query_rows(
+        self,
+        table_id: int,
+        query: RowQuery,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Row]:
+        """
+        Get one page of rows matching a query - one statement over the documents, comparing
+        each filtered or sorted value extracted as its column's JSON type
+        """
+        expressions = {column.id: self._typed_value(column) for column in query_columns(query)}
+        stmt = select(RowModel.id).where(
+            RowModel.table_id == table_id,
+            *query_clauses(query, expressions)
+        ).order_by(*order_clauses(query, expressions), RowModel.id)
+        if after_id is not None:
+            stmt = stmt.where(RowModel.id > after_id).limit(limit)
+        else:
+            stmt = stmt.offset(skip).limit(limit)
+        result = await self.session.execute(stmt)
+        return await self.get_rows_by_ids(table_id, list(result.scalars().all()), query.column_ids)
+    
+    @staticmethod
+    def _typed_value(column: Column):
+        """A column's value extracted from the row document as its JSON type"""
+        value = RowModel.values[str(column.id)]
+        if column.data_type in ("integer", "reference"):
+            return value.as_integer()
+        if column.data_type == "float":
+            return value.as_float()
+        if column.data_type == "boolean":
+            return value.as_boolean()
+        return value.as_string()
+    
+    async def create_row(self, row: Row) -> Row:
+        """Create a new row - O(1), a single INSERT regardless of column count"""
+        model = self._to_model(row)
+        self.session.add(model)
+        await self.session.flush()
+        self._invalidate(table_ids=[model.table_id])
+        return self._to_domain(model)
+    
+    async def create_rows(self, table_id: int, rows: List[Dict[int, Any]]) -> List[int]:
+        """Create many rows with one multi-row INSERT ... RETURNING"""
+        if not rows:
+            return []
+        
+        now = datetime.utcnow()
+        stmt = insert(RowModel).returning(RowModel.id, sort_by_parameter_order=True)
+        result = await self.session.execute(
+            stmt,
+            [
+                {
+                    "table_id": table_id,
+                    "values": self._pack(values),
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for values in rows
+            ]
+        )
+        self._invalidate(table_ids=[table_id])
+        return list(result.scalars().all())
+    
+    async def update_row(self, row: Row) -> Row:
+        """Update row values - O(1), merges the changed columns into the document"""
+        stmt = select(RowModel).where(RowModel.id == row.id).options(noload(RowModel.cells))
+        result = await self.session.execute(stmt)
+        model = result.scalar_one_or_none()
+        if not model:
+            raise ValueError(f"Row with ID {row.id} not found")
+        
+        values = dict(model.values or {})
+        values.update(self._pack({column_id: cell.value for column_id, cell in row.cells.items()}))
+        # Assign a new dict so the JSON column is flagged as modified
+        model.values = values
+        model.version = RowModel.version + 1
+        model.updated_at = datetime.utcnow()
+        await self.session.flush()
+        await self.session.refresh(model)
+        self._invalidate(table_ids=[model.table_id], row_ids=[row.id])
+        return self._to_domain(model)
+    
+    async def delete_row(self, row_id: int) -> bool:
+        """Delete row by ID - O(1)"""
+        table_id = await self.get_row_table_id(row_id)
+        deleted = await self.delete(row_id)
+        if deleted:
+            self._invalidate(table_ids=[table_id], row_ids=[row_id])
+        return deleted
+    
+    async def delete_rows(self, row_ids: List[int]) -> int:
+        """Delete many rows - one DELETE statement per IN_CHUNK_SIZE rows"""
+        ids = list(dict.fromkeys(row_ids))
+        table_ids: Set[int] = set()
+        deleted = 0
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            result = await self.session.execute(
+                delete(RowModel).where(RowModel.id.in_(ids[start:start + IN_CHUNK_SIZE])).returning(RowModel.table_id)
+            )
+            tables = result.scalars().all()
+            table_ids.update(tables)
+            deleted += len(tables)
+        if deleted:
+            self._invalidate(table_ids=table_ids, row_ids=ids)
+        return deleted
+    
+    async def restore_rows(self, rows: List[Row]) -> Set[int]:
+        """Cells are not addressable in packed storage"""
+        raise ValueError("Restoring cells requires the EAV storage backend")
+    
+    async def get_row_table_id(self, row_id: int) -> Optional[int]:
+        """Get the table ID a row belongs to - O(1)"""
+        result = await self.session.execute(select(RowModel.table_id).where(RowModel.id == row_id))
+        return result.scalar_one_or_none()
+    
+    async def get_data_revision(self, table_id: int) -> str:
+        """Get a token that changes with every row write, insert and delete of a table - O(n)"""
+        return await read_data_revision(self.session, table_id)
+    
+    async def get_row_ids(self, table_id: int) -> List[int]:
+        """Get every row ID of a table in ascending order - O(n), an index-only scan of (table_id, id)"""
+        result = await self.session.execute(
+            select(RowModel.id).where(RowModel.table_id == table_id).order_by(RowModel.id)
+        )
+        return list(result.scalars().all())
+    
+    async def filter_row_ids(self, table_id: int, row_ids: List[int]) -> Set[int]:
+        """Get the subset of `row_ids` that are rows of the table - one query per IN_CHUNK_SIZE IDs"""
+        ids = list(dict.fromkeys(row_ids))
+        existing: Set[int] = set()
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            result = await self.session.execute(
+                select(RowModel.id).where(
+                    RowModel.table_id == table_id,
+                    RowModel.id.in_(ids[start:start + IN_CHUNK_SIZE])
+                )
+            )
+            existing.update(result.scalars().all())
+        return existing
+    
+    async def get_column_values(self, table_id: int, column_ids: List[int]) -> List[Tuple[int, int, Any]]:
+        """Get the non-null values of some columns as (row_id, column_id, value) - one pass over the documents"""
+        if not column_ids:
+            return []
+        keys = [(column_id, str(column_id)) for column_id in column_ids]
+        result = await self.session.execute(
+            select(RowModel.id, RowModel.values).where(RowModel.table_id == table_id).order_by(RowModel.id)
+        )
+        found: List[Tuple[int, int, Any]] = []
+        for row_id, values in result.all():
+            values = values or {}
+            for column_id, key in keys:
+                if values.get(key) is not None:
+                    found.append((row_id, column_id, values[key]))
+        return found
+    
+    async def find_references(
+        self,
+        columns: List[Column],
+        row_ids: List[int],
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, int, Any]]:
+        """
+        Find document values of reference columns pointing at `row_ids`, as (row_id, column_id, value)
+        One query per column and IN_CHUNK_SIZE IDs, on the value extracted from the JSON document
+        """
+        ids = list(dict.fromkeys(row_ids))
+        found: List[Tuple[int, int, Any]] = []
+        for column in columns:
+            value = RowModel.values[str(column.id)].as_integer()
+            for start in range(0, len(ids), IN_CHUNK_SIZE):
+                stmt = select(RowModel.id, value).where(
+                    RowModel.table_id == column.table_id,
+                    value.in_(ids[start:start + IN_CHUNK_SIZE])
+                ).order_by(RowModel.id)
+                if limit is not None:
+                    stmt = stmt.limit(limit - len(found))
+                result = await self.session.execute(stmt)
+                found.extend((row_id, column.id, referenced) for row_id, referenced in result.all())
+                if limit is not None and len(found) >= limit:
+                    return found
+        return found
+    
+    async def get_cell_locations(self, cell_ids: List[int]) -> Dict[int, Tuple[int, int, int]]:
+        """Cells are not addressable in packed storage"""
+        return {}
+    
+    async def get_row_cell_ids(self, row_ids: List[int]) -> Dict[int, Tuple[int, Dict[int, int]]]:
+        """Map row IDs to (table_id, {}) - values live in the row document, so there are no cell IDs"""
+        ids = list(dict.fromkeys(row_ids))
+        rows: Dict[int, Tuple[int, Dict[int, int]]] = {}
+        for start in range(0, len(ids), IN_CHUNK_SIZE):
+            result = await self.session.execute(
+                select(RowModel.id, RowModel.table_id).where(RowModel.id.in_(ids[start:start + IN_CHUNK_SIZE]))
+            )
+            for row_id, table_id in result.all():
+                rows[row_id] = (table_id, {})
+        return rows
+    
+    async def get_cell_by_id(self, cell_id: int) -> Optional[Cell]:
+        """Cells are not addressable in packed storage"""
+        return None
+    
+    async def update_cell(self, cell: Cell) -> Cell:
+        """Cells are not addressable in packed storage"""
+        raise ValueError("Cell-level updates require the EAV storage backend; update the row instead")
+    
+    async def update_cell_values(
+        self,
+        values: Dict[int, Any],
+        expected_versions: Optional[Dict[int, int]] = None
+    ) -> List[CellChange]:
+        """Cells are not addressable in packed storage"""
+        raise ValueError("Cell-level updates require the EAV storage backend; update the row instead")
+    
+    async def write_row_cells(
+        self,
+        row_id: int,
+        values: Dict[int, Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[List[CellChange]]:
+        """
+        Merge values into the row document, capturing old values - O(1) statements
+        The read-modify-write is guarded by the row version (UPDATE ... WHERE version = :read),
+        so concurrent writers never lose each other's columns: without `expected_version`
+        the merge is retried on a newer document; with it, a mismatch returns None
+        """
+        for _ in range(WRITE_ATTEMPTS):
+            stmt = select(RowModel).where(RowModel.id == row_id).options(
+                noload(RowModel.cells)
+            ).execution_options(populate_existing=True)
+            model = (await self.session.execute(stmt)).scalar_one_or_none()
+            if not model:
+                raise ValueError(f"Row with ID {row_id} not found")
+            if expected_version is not None and model.version != expected_version:
+                return None
+            
+            document = dict(model.values or {})
+            changes = [
+                CellChange(
+                    row_id=row_id,
+                    column_id=column_id,
+                    old_value=document.get(str(column_id)),
+                    new_value=value,
+                    version=model.version + 1
+                )
+                for column_id, value in values.items()
+            ]
+            document.update(self._pack(values))
+            result = await self.session.execute(
+                update(RowModel).where(
+                    RowModel.id == row_id,
+                    RowModel.version == model.version
+                ).values(
+                    values=document,
+                    version=model.version + 1,
+                    updated_at=datetime.utcnow()
+                ).execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                self._invalidate(table_ids=[model.table_id], row_ids=[row_id])
+                return changes
+            if expected_version is not None:
+                return None
+        raise ValueError(f"Row with ID {row_id} kept changing concurrently; retry the update")
+    
+    async def get_cells_by_ids(self, cell_ids: List[int]) -> List[Cell]:
+        """Cells are not addressable in packed storage"""
+        return []
+    
+    async def update_cells(self, cells: List[Cell]) -> Set[int]:
+        """Cells are not addressable in packed storage"""
+        raise ValueError("Cell-level updates require the EAV storage backend; update the row instead")
+    
+    async def get_table_cells(self, table_id: int) -> List[Cell]:
+        """Cells are not addressable in packed storage"""
+        return []
+    
+    async def pack_table(self, table_id: int, columns: List[Column], chunk_size: int = 1000) -> int:
+        """
+        Migrate a table from the cells layout into row documents - O(n) in chunks
+        Text values are parsed to their column types; the cells are left in place
+        so the EAV backend keeps working until they are dropped
+        """
+        data_types = {column.id: column.data_type for column in columns}
+        packed = 0
+        last_id = 0
+        
+        while True:
+            stmt = select(RowModel.id).where(
+                RowModel.table_id == table_id,
+                RowModel.id > last_id
+            ).order_by(RowModel.id).limit(chunk_size)
+            row_ids = list((await self.session.execute(stmt)).scalars().all())
+            if not row_ids:
+                break
+            
+            documents: Dict[int, Dict[str, Any]] = {row_id: {} for row_id in row_ids}
+            cells_stmt = select(CellModel.row_id, CellModel.column_id, CellModel.value).where(
+                CellModel.row_id.in_(row_ids)
+            )
+            for row_id, column_id, value in (await self.session.execute(cells_stmt)).all():
+                data_type = data_types.get(column_id)
+                if data_type is None:
+                    continue
+                try:
+                    parsed = DataValidator.parse_value(value, data_type)
+                except ValueError:
+                    parsed = value
+                documents[row_id][str(column_id)] = parsed
+            
+            await self.session.execute(
+                update(RowModel),
+                [{"id": row_id, "values": values} for row_id, values in documents.items()]
+            )
+            self._invalidate(table_ids=[table_id])
+            await self.commit()
+            packed += len(row_ids)
+            last_id = row_ids[-1]
+        
+        return packed
+    
+    @staticmethod
+    def _pack(values: Dict[int, Any]) -> Dict[str, Any]:
+        """Convert column_id -> value into the stored document (JSON keys are strings)"""
+        return {str(column_id): value for column_id, value in values.items()}
+    
+    def _to_domain(self, model: RowModel) -> Row:
+        """Convert model to domain entity"""
+        cells_dict = {}
+        for column_id_str, value in (model.values or {}).items():
+            column_id = int(column_id_str)
+            cells_dict[column_id] = Cell(
+                row_id=model.id,
+                column_id=column_id,
+                value=value
+            )
+        
+        return Row(
+            id=model.id,
+            table_id=model.table_id,
+            cells=cells_dict,
+            version=model.version or 1,
+            created_at=model.created_at,
+            updated_at=model.updated_at
+        )
+    
+    def _to_model(self, domain: Row) -> RowModel:
+        """Convert domain entity to model"""
+        return RowModel(
+            id=domain.id,
+            table_id=domain.table_id,
+            values=self._pack({column_id: cell.value for column_id, cell in domain.cells.items()}),
+            created_at=domain.created_at,
+            updated_at=domain.updated_at
+        )
+    
+    def _update_model_from_domain(self, model: RowModel, domain: Row):
+        """Update model from domain entity"""
+        model.updated_at = domain.updated_at
@@ -0,0 +1,63 @@
+"""
+Row query compiler
+Turns RowQuery filters and sort keys into SQL clauses over typed value
+expressions; each storage backend supplies the expression of a column's value
+"""
+from typing import Any, Callable, Dict, List
+from sqlalchemy import or_
+from sqlalchemy.sql.elements import ColumnElement
+from app.domain.value_objects.row_query import RowQuery, RowFilter
+
+# Data types compared as numbers
+NUMERIC_TYPES = ("integer", "float", "reference")
+
+
+def filter_clause(expression: ColumnElement, row_filter: RowFilter, value: Any) -> ColumnElement:
+    """
+    Condition of one filter on a typed value expression (`value` in the expression's form)
+    != also matches rows without a value, like a spreadsheet filter would
+    """
+    operator = row_filter.operator
+    if row_filter.value is None:
+        return expression.is_(None) if operator == "=" else expression.isnot(None)
+    if operator == "~":
+        return expression.icontains(value, autoescape=True)
+    if operator == "=":
+        return expression == value
+    if operator == "!=":
+        return or_(expression.is_(None), expression != value)
+    if operator == ">":
+        return expression > value
+    if operator == ">=":
+        return expression >= value
+    if operator == "<":
+        return expression < value
+    return expression <= value
+
+
+def query_clauses(
+    query: RowQuery,
+    expressions: Dict[int, ColumnElement],
+    value_of: Callable[[RowFilter], Any] = lambda row_filter: row_filter.value
+) -> List[ColumnElement]:
+    """WHERE clauses of a query's filters, given the value expression of each column used"""
+    return [
+        filter_clause(expressions[row_filter.column.id], row_filter, value_of(row_filter))
+        for row_filter in query.filters
+    ]
+
+
+def order_clauses(query: RowQuery, expressions: Dict[int, ColumnElement]) -> List[ColumnElement]:
+    """ORDER BY clauses of a query's sort keys (nulls last in both directions)"""
+    return [
+        (expressions[sort.column.id].desc() if sort.descending else expressions[sort.column.id].asc()).nulls_last()
+        for sort in query.sorts
+    ]
+
+
+def query_columns(query: RowQuery) -> list:
+    """Distinct columns a query filters or sorts on, in first-use order"""
+    columns = {}
+    for column in [row_filter.column for row_filter in query.filters] + [sort.column for sort in query.sorts]:
+        columns.setdefault(column.id, column)
+    return list(columns.values())
@@ -0,0 +1,90 @@
+"""
+Table snapshot repository implementation
+"""
+import json
+import zlib
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.domain.entities.snapshot import TableSnapshot
+from app.domain.interfaces.repositories import ISnapshotRepository
+from app.infrastructure.models.snapshot import TableSnapshotModel
+from app.infrastructure.repositories.base_repository import BaseRepository
+
+
+class SnapshotRepository(BaseRepository[TableSnapshotModel, TableSnapshot], ISnapshotRepository):
+    """Snapshot repository implementation - cell state is stored as compressed JSON"""
+    
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, TableSnapshotModel, TableSnapshot)
+    
+    async def get_latest_version_id(self, table_id: int) -> Optional[int]:
+        """Get the version ID of a table's most recent snapshot - O(log n) with index"""
+        return await self._get_version_id(
+            select(TableSnapshotModel.version_id).where(
+                TableSnapshotModel.table_id == table_id
+            ).order_by(TableSnapshotModel.version_id.desc()).limit(1)
+        )
+    
+    async def get_latest_up_to(self, table_id: int, version_id: int) -> Optional[TableSnapshot]:
+        """Get a table's most recent snapshot taken at or before a version - O(log n) with index"""
+        return await self._get_one(
+            select(TableSnapshotModel).where(
+                TableSnapshotModel.table_id == table_id,
+                TableSnapshotModel.version_id <= version_id
+            ).order_by(TableSnapshotModel.version_id.desc()).limit(1)
+        )
+    
+    async def _get_one(self, stmt) -> Optional[TableSnapshot]:
+        """Execute a single-snapshot query"""
+        result = await self.session.execute(stmt)
+        model = result.scalar_one_or_none()
+        if model:
+            return self._to_domain(model)
+        return None
+    
+    async def _get_version_id(self, stmt) -> Optional[int]:
+        """Execute a version ID query"""
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    @staticmethod
+    def _compress(snapshot: TableSnapshot) -> bytes:
+        """Serialize snapshot cells to compressed JSON"""
+        records = [
+            [cell_id, row_id, column_id, value]
+            for cell_id, (row_id, column_id, value) in snapshot.cells.items()
+        ]
+        return zlib.compress(json.dumps(records, separators=(",", ":"), default=str).encode("utf-8"))
+    
+    @staticmethod
+    def _decompress(data: bytes) -> dict:
+        """Deserialize compressed JSON snapshot cells"""
+        records = json.loads(zlib.decompress(data).decode("utf-8"))
+        return {cell_id: (row_id, column_id, value) for cell_id, row_id, column_id, value in records}
+    
+    def _to_domain(self, model: TableSnapshotModel) -> TableSnapshot:
+        """Convert model to domain entity"""
+        return TableSnapshot(
+            id=model.id,
+            table_id=model.table_id,
+            version_id=model.version_id,
+            cells=self._decompress(model.data),
+            created_at=model.created_at
+        )
+    
+    def _to_model(self, domain: TableSnapshot) -> TableSnapshotModel:
+        """Convert domain entity to model"""
+        return TableSnapshotModel(
+            id=domain.id,
+            table_id=domain.table_id,
+            version_id=domain.version_id,
+            cell_count=len(domain.cells),
+            data=self._compress(domain),
+            created_at=domain.created_at
+        )
+    
+    def _update_model_from_domain(self, model: TableSnapshotModel, domain: TableSnapshot):
+        """Update model from domain entity"""
+        model.cell_count = len(domain.cells)
+        model.data = self._compress(domain)
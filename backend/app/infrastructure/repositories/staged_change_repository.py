@@ -0,0 +1,151 @@
+"""
+Staged change repository implementation
+"""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from app.domain.entities.cell import CellChange
+from app.domain.entities.version import StagedChange
+from app.domain.interfaces.repositories import IStagedChangeRepository
+from app.infrastructure.models.staged_change import StagedChangeModel
+from app.infrastructure.models.table import TableModel
+from app.infrastructure.repositories.base_repository import BaseRepository
+from app.infrastructure.repositories.data_repository import IN_CHUNK_SIZE
+
+
+class StagedChangeRepository(BaseRepository[StagedChangeModel, StagedChange], IStagedChangeRepository):
+    """Staged change repository implementation - a per-user buffer of captured cell changes"""
+    
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, StagedChangeModel, StagedChange)
+    
+    async def stage(self, user_id: int, table_id: int, changes: List[CellChange]) -> int:
+        """
+        Add captured changes to a user's buffer - one upsert statement per IN_CHUNK_SIZE changes
+        A cell staged again keeps its first old value (and whether it was created
+        uncommitted) and takes the latest new value
+        """
+        now = datetime.utcnow()
+        records = [
+            {
+                "user_id": user_id,
+                "table_id": table_id,
+                "cell_id": change.cell_id,
+                "row_id": change.row_id,
+                "column_id": change.column_id,
+                "old_value": change.old_value,
+                "new_value": change.new_value,
+                "is_new": change.is_new,
+                "is_deleted": change.is_deleted,
+                "created_at": now,
+                "updated_at": now
+            }
+            for change in changes
+            if change.cell_id is not None
+        ]
+        
+        dialect = postgresql if self._dialect_name() == "postgresql" else sqlite
+        for start in range(0, len(records), IN_CHUNK_SIZE):
+            stmt = dialect.insert(StagedChangeModel).values(records[start:start + IN_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[StagedChangeModel.user_id, StagedChangeModel.cell_id],
+                set_={
+                    "row_id": stmt.excluded.row_id,
+                    "column_id": stmt.excluded.column_id,
+                    "new_value": stmt.excluded.new_value,
+                    "is_deleted": stmt.excluded.is_deleted,
+                    "updated_at": now
+                }
+            )
+            await self.session.execute(stmt)
+        return len(records)
+    
+    async def get_staged(self, user_id: int, project_id: int, table_id: Optional[int] = None) -> List[StagedChange]:
+        """Get a user's staged changes in a project (optionally one table) - O(n)"""
+        stmt = select(StagedChangeModel).where(
+            *self._scope(user_id, project_id, table_id)
+        ).order_by(StagedChangeModel.id)
+        result = await self.session.execute(stmt)
+        return [self._to_domain(model) for model in result.scalars().all()]
+    
+    async def pop_staged(self, user_id: int, project_id: int, table_id: Optional[int] = None) -> List[StagedChange]:
+        """Remove and return a user's staged changes - one DELETE ... RETURNING"""
+        return await self._delete_returning(self._scope(user_id, project_id, table_id))
+    
+    async def discard_cells(self, cell_ids: List[int]) -> List[StagedChange]:
+        """
+        Remove and return every user's staged changes of some cells, oldest first -
+        one DELETE ... RETURNING per IN_CHUNK_SIZE cells
+        """
+        staged: List[StagedChange] = []
+        for start in range(0, len(cell_ids), IN_CHUNK_SIZE):
+            staged.extend(await self._delete_returning(
+                [StagedChangeModel.cell_id.in_(cell_ids[start:start + IN_CHUNK_SIZE])]
+            ))
+        return sorted(staged, key=lambda change: change.id)
+    
+    async def _delete_returning(self, criteria: list) -> List[StagedChange]:
+        """Delete the staged changes matching some criteria, returns them ordered by ID"""
+        stmt = delete(StagedChangeModel).where(*criteria).returning(
+            StagedChangeModel.id,
+            StagedChangeModel.user_id,
+            StagedChangeModel.table_id,
+            StagedChangeModel.cell_id,
+            StagedChangeModel.row_id,
+            StagedChangeModel.column_id,
+            StagedChangeModel.old_value,
+            StagedChangeModel.new_value,
+            StagedChangeModel.is_new,
+            StagedChangeModel.is_deleted
+        ).execution_options(synchronize_session=False)
+        result = await self.session.execute(stmt)
+        staged = [StagedChange(**row._mapping) for row in result.all()]
+        return sorted(staged, key=lambda change: change.id)
+    
+    @staticmethod
+    def _scope(user_id: int, project_id: int, table_id: Optional[int]) -> list:
+        """WHERE clauses selecting a user's buffer for a project or table"""
+        if table_id is not None:
+            return [StagedChangeModel.user_id == user_id, StagedChangeModel.table_id == table_id]
+        project_tables = select(TableModel.id).where(TableModel.project_id == project_id)
+        return [StagedChangeModel.user_id == user_id, StagedChangeModel.table_id.in_(project_tables)]
+    
+    def _to_domain(self, model: StagedChangeModel) -> StagedChange:
+        """Convert model to domain entity"""
+        return StagedChange(
+            id=model.id,
+            user_id=model.user_id,
+            table_id=model.table_id,
+            cell_id=model.cell_id,
+            row_id=model.row_id,
+            column_id=model.column_id,
+            old_value=model.old_value,
+            new_value=model.new_value,
+            is_new=model.is_new,
+            is_deleted=model.is_deleted,
+            created_at=model.created_at,
+            updated_at=model.updated_at
+        )
+    
+    def _to_model(self, domain: StagedChange) -> StagedChangeModel:
+        """Convert domain entity to model"""
+        return StagedChangeModel(
+            id=domain.id,
+            user_id=domain.user_id,
+            table_id=domain.table_id,
+            cell_id=domain.cell_id,
+            row_id=domain.row_id,
+            column_id=domain.column_id,
+            old_value=domain.old_value,
+            new_value=domain.new_value,
+            is_new=domain.is_new,
+            is_deleted=domain.is_deleted,
+            created_at=domain.created_at,
+            updated_at=domain.updated_at
+        )
+    
+    def _update_model_from_domain(self, model: StagedChangeModel, domain: StagedChange):
+        """Update model from domain entity"""
+        model.new_value = domain.new_value
@@ -9,6 +9,7 @@ from app.domain.entities.table import Table, Column
 from app.domain.interfaces.repositories import ITableRepository
 from app.infrastructure.models.table import TableModel, ColumnModel
 from app.infrastructure.repositories.base_repository import BaseRepository
+from app.infrastructure.cache.invalidation import schema_tag
 
 
 class TableRepository(BaseRepository[TableModel, Table], ITableRepository):
@@ -44,6 +45,33 @@ class TableRepository(BaseRepository[TableModel, Table], ITableRepository):
         models = result.scalars().all()
         return [self._column_to_domain(model) for model in models]
     
+    async def get_referencing_columns(self, table_id: int) -> List[Column]:
+        """Get the reference columns pointing at a table - O(n) where n is number of such columns"""
+        stmt = select(ColumnModel).where(ColumnModel.reference_table_id == table_id).order_by(ColumnModel.id)
+        result = await self.session.execute(stmt)
+        return [self._column_to_domain(model) for model in result.scalars().all()]
+    
+    async def create(self, entity: Table) -> Table:
+        """Create new table - O(1)"""
+        table = await super().create(entity)
+        self._invalidate(project_ids=[table.project_id])
+        return table
+    
+    async def update(self, entity: Table) -> Table:
+        """Update existing table - O(1)"""
+        table = await super().update(entity)
+        self._invalidate(project_ids=[table.project_id], table_ids=[table.id])
+        return table
+    
+    async def delete(self, id: int) -> bool:
+        """Delete table by ID - O(1)"""
+        result = await self.session.execute(select(TableModel.project_id).where(TableModel.id == id))
+        project_id = result.scalar_one_or_none()
+        deleted = await super().delete(id)
+        if deleted:
+            self._invalidate(project_ids=[project_id], table_ids=[id], tags=[schema_tag(id)])
+        return deleted
+    
     async def _to_domain_async(self, model: TableModel) -> Table:
         """Convert model to domain entity (async version)"""
         # For newly created tables, columns will be empty
@@ -1,13 +1,18 @@
 """
 Version repository implementation
 """
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Dict, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.domain.entities.version import Version
+from sqlalchemy import select, insert, delete, func, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from app.domain.entities.version import Version, VersionChange, CellBlame
 from app.domain.interfaces.repositories import IVersionRepository
-from app.infrastructure.models.version import VersionModel
+from app.infrastructure.models.version import VersionModel, VersionChangeModel, CellBlameModel
+from app.infrastructure.models.cell import RowModel, CellModel
+from app.infrastructure.models.user import UserModel
 from app.infrastructure.repositories.base_repository import BaseRepository
+from app.infrastructure.repositories.data_repository import IN_CHUNK_SIZE
 
 
 class VersionRepository(BaseRepository[VersionModel, Version], IVersionRepository):
@@ -16,6 +21,12 @@ class VersionRepository(BaseRepository[VersionModel, Version], IVersionRepositor
     def __init__(self, session: AsyncSession):
         super().__init__(session, VersionModel, Version)
     
+    async def create(self, entity: Version) -> Version:
+        """Create a version with its change log and blame entries - O(n) where n is changed cells"""
+        version = await super().create(entity)
+        await self.record_changes(version)
+        return version
+    
     async def get_by_project_id(self, project_id: int, skip: int = 0, limit: int = 100) -> List[Version]:
         """Get versions by project ID - O(n) where n is limit"""
         stmt = select(VersionModel).where(
@@ -34,6 +45,251 @@ class VersionRepository(BaseRepository[VersionModel, Version], IVersionRepositor
         models = result.scalars().all()
         return [self._to_domain(model) for model in models]
     
+    async def get_table_versions_between(
+        self,
+        table_id: int,
+        after_id: int,
+        up_to_id: int,
+        limit: Optional[int] = None
+    ) -> List[Version]:
+        """Get a table's versions with after_id < id <= up_to_id, oldest first - O(n) where n is versions in range"""
+        stmt = select(VersionModel).where(
+            VersionModel.table_id == table_id,
+            VersionModel.id > after_id,
+            VersionModel.id <= up_to_id
+        ).order_by(VersionModel.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        return [self._to_domain(model) for model in models]
+    
+    async def get_table_changes_between(self, table_id: int, after_id: int, up_to_id: int) -> List[VersionChange]:
+        """
+        Get the change log entries of a table's versions with after_id < id <= up_to_id, in the
+        order they were committed - one range scan of the (table_id, version_id) index
+        """
+        stmt = select(VersionChangeModel).where(
+            VersionChangeModel.table_id == table_id,
+            VersionChangeModel.version_id > after_id,
+            VersionChangeModel.version_id <= up_to_id
+        ).order_by(VersionChangeModel.version_id, VersionChangeModel.id)
+        result = await self.session.execute(stmt)
+        return [self._change_to_domain(change) for change in result.scalars().all()]
+    
+    async def get_latest_table_version_id(self, table_id: int) -> Optional[int]:
+        """Get the ID of a table's most recent version - O(log n) with index"""
+        stmt = select(VersionModel.id).where(
+            VersionModel.table_id == table_id
+        ).order_by(VersionModel.id.desc()).limit(1)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    async def record_changes(self, version: Version) -> int:
+        """
+        Write a version's changes to the normalized change log and the blame index -
+        one location lookup per IN_CHUNK_SIZE cells, one multi-row INSERT and one
+        upsert per chunk. Entries without their own location (versions written before
+        diffs carried one) take the live cell's; cells that no longer exist are then
+        logged without a row/column
+        """
+        if not version.changes:
+            return 0
+        
+        cell_ids = [int(cell_id_str) for cell_id_str in version.changes]
+        locations = await self._get_cell_locations(cell_ids)
+        records = []
+        for cell_id in cell_ids:
+            change = version.changes[str(cell_id)]
+            table_id, row_id, column_id = locations.get(cell_id, (version.table_id, None, None))
+            if change.get("row_id") is not None:
+                row_id, column_id = change["row_id"], change.get("column_id")
+                table_id = change.get("table_id") or table_id
+            records.append({
+                "version_id": version.id,
+                "table_id": table_id,
+                "row_id": row_id,
+                "column_id": column_id,
+                "cell_id": cell_id,
+                "old_value": change.get("old_value"),
+                "new_value": change.get("new_value"),
+                "is_new": bool(change.get("is_new")),
+                "is_deleted": bool(change.get("is_deleted"))
+            })
+        
+        await self.session.execute(insert(VersionChangeModel), records)
+        await self._upsert_blame(version, locations)
+        return len(records)
+    
+    async def _upsert_blame(self, version: Version, locations: Dict[int, Tuple[int, int, int]]):
+        """Make a version the last writer of its (still existing) cells - one upsert per chunk"""
+        now = datetime.utcnow()
+        records = [
+            {
+                "cell_id": cell_id,
+                "table_id": table_id,
+                "row_id": row_id,
+                "column_id": column_id,
+                "version_id": version.id,
+                "author_id": version.author_id,
+                "changed_at": version.created_at or now,
+                "created_at": now,
+                "updated_at": now
+            }
+            for cell_id, (table_id, row_id, column_id) in locations.items()
+        ]
+        dialect = postgresql if self._dialect_name() == "postgresql" else sqlite
+        for start in range(0, len(records), IN_CHUNK_SIZE):
+            stmt = dialect.insert(CellBlameModel).values(records[start:start + IN_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CellBlameModel.cell_id],
+                set_={
+                    "version_id": stmt.excluded.version_id,
+                    "author_id": stmt.excluded.author_id,
+                    "changed_at": stmt.excluded.changed_at,
+                    "updated_at": now
+                },
+                # Backfills may replay old versions; never let them overwrite a newer writer
+                where=CellBlameModel.version_id <= stmt.excluded.version_id
+            )
+            await self.session.execute(stmt)
+    
+    async def rebuild_blame(self) -> int:
+        """Rebuild the blame index from the change log - one DELETE plus one INSERT ... SELECT"""
+        latest = select(
+            VersionChangeModel.cell_id,
+            func.max(VersionChangeModel.version_id).label("version_id")
+        ).group_by(VersionChangeModel.cell_id).subquery()
+        now = datetime.utcnow()
+        source = select(
+            CellModel.id,
+            RowModel.table_id,
+            CellModel.row_id,
+            CellModel.column_id,
+            VersionModel.id,
+            VersionModel.author_id,
+            VersionModel.created_at,
+            literal(now),
+            literal(now)
+        ).select_from(latest).join(
+            CellModel, CellModel.id == latest.c.cell_id
+        ).join(
+            RowModel, RowModel.id == CellModel.row_id
+        ).join(
+            VersionModel, VersionModel.id == latest.c.version_id
+        )
+        
+        await self.session.execute(delete(CellBlameModel))
+        result = await self.session.execute(insert(CellBlameModel).from_select(
+            ["cell_id", "table_id", "row_id", "column_id", "version_id", "author_id", "changed_at", "created_at", "updated_at"],
+            source
+        ))
+        return result.rowcount
+    
+    async def get_table_blame(
+        self,
+        table_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[CellBlame]:
+        """
+        Get blame for the cells of one page of a table's rows (same paging as the
+        data endpoint) - a single query joining the row page, versions and authors
+        """
+        page = select(RowModel.id).where(RowModel.table_id == table_id)
+        if after_id is not None:
+            page = page.where(RowModel.id > after_id).order_by(RowModel.id).limit(limit)
+        else:
+            page = page.order_by(RowModel.id).offset(skip).limit(limit)
+        page = page.subquery()
+        
+        stmt = select(
+            CellBlameModel, UserModel.username, VersionModel.message
+        ).join(
+            page, page.c.id == CellBlameModel.row_id
+        ).join(
+            VersionModel, VersionModel.id == CellBlameModel.version_id
+        ).outerjoin(
+            UserModel, UserModel.id == CellBlameModel.author_id
+        ).order_by(CellBlameModel.row_id, CellBlameModel.column_id)
+        result = await self.session.execute(stmt)
+        return [
+            CellBlame(
+                cell_id=blame.cell_id,
+                row_id=blame.row_id,
+                column_id=blame.column_id,
+                version_id=blame.version_id,
+                author_id=blame.author_id,
+                author_username=username,
+                message=message,
+                changed_at=blame.changed_at
+            )
+            for blame, username, message in result.all()
+        ]
+    
+    async def _get_cell_locations(self, cell_ids: List[int]) -> Dict[int, Tuple[int, int, int]]:
+        """Map cell IDs to (table_id, row_id, column_id) - O(n)"""
+        locations = {}
+        for start in range(0, len(cell_ids), IN_CHUNK_SIZE):
+            chunk = cell_ids[start:start + IN_CHUNK_SIZE]
+            stmt = select(
+                CellModel.id, RowModel.table_id, CellModel.row_id, CellModel.column_id
+            ).join(RowModel, RowModel.id == CellModel.row_id).where(CellModel.id.in_(chunk))
+            result = await self.session.execute(stmt)
+            for cell_id, table_id, row_id, column_id in result.all():
+                locations[cell_id] = (table_id, row_id, column_id)
+        return locations
+    
+    async def get_change_history(
+        self,
+        cell_id: Optional[int] = None,
+        row_id: Optional[int] = None,
+        column_id: Optional[int] = None,
+        table_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[VersionChange]:
+        """
+        Get change log entries for a cell, row, column or table, newest first -
+        O(log n + limit) with the (<key>, version_id) indexes
+        """
+        criteria = [
+            getattr(VersionChangeModel, key) == value
+            for key, value in (
+                ("cell_id", cell_id), ("row_id", row_id), ("column_id", column_id), ("table_id", table_id)
+            )
+            if value is not None
+        ]
+        stmt = select(
+            VersionChangeModel, VersionModel.message, VersionModel.author_id, VersionModel.created_at
+        ).join(
+            VersionModel, VersionModel.id == VersionChangeModel.version_id
+        ).where(*criteria).order_by(
+            VersionChangeModel.version_id.desc(), VersionChangeModel.id
+        ).offset(skip).limit(limit)
+        result = await self.session.execute(stmt)
+        return [
+            self._change_to_domain(change, message=message, author_id=author_id, created_at=created_at)
+            for change, message, author_id, created_at in result.all()
+        ]
+    
+    @staticmethod
+    def _change_to_domain(model: VersionChangeModel, **version) -> VersionChange:
+        """Convert a change log model to a domain entity, with optional version metadata"""
+        return VersionChange(
+            version_id=model.version_id,
+            cell_id=model.cell_id,
+            table_id=model.table_id,
+            row_id=model.row_id,
+            column_id=model.column_id,
+            old_value=model.old_value,
+            new_value=model.new_value,
+            is_new=model.is_new,
+            is_deleted=model.is_deleted,
+            **version
+        )
+    
     def _to_domain(self, model: VersionModel) -> Version:
         """Convert model to domain entity"""
         return Version(
@@ -7,8 +7,11 @@ from fastapi.responses import JSONResponse
 
 from app.core.config import get_settings
 from app.core.exceptions import GDHException
-from app.api.v1 import auth, projects, tables, data, versions, columns, code
-from app.di.container import Container
+from app.core.password_hashing import password_hash_pool
+from app.api.v1 import auth, projects, tables, data, versions, branches, columns, code
+from app.di.container import container
+from app.infrastructure.cache.cache_manager import cache_manager
+from app.infrastructure.cache.single_flight import single_flight
 
 # Initialize settings
 settings = get_settings()
@@ -32,10 +35,19 @@ app.add_middleware(
 )
 
 # Initialize DI container (for stateless services only)
-container = Container()
 container.wire()
 
 
+@app.on_event("startup")
+async def start_cache_sweeper():
+    cache_manager.start_sweeper()
+
+
+@app.on_event("shutdown")
+async def stop_cache_sweeper():
+    cache_manager.stop_sweeper()
+
+
 # Exception handler
 @app.exception_handler(GDHException)
 async def gdh_exception_handler(request, exc: GDHException):
@@ -52,6 +64,7 @@ app.include_router(tables.router, prefix="/api/v1/tables", tags=["Tables"])
 app.include_router(columns.router, prefix="/api/v1", tags=["Columns"])
 app.include_router(data.router, prefix="/api/v1/data", tags=["Data"])
 app.include_router(versions.router, prefix="/api/v1/versions", tags=["Versions"])
+app.include_router(branches.router, prefix="/api/v1/branches", tags=["Branches"])
 app.include_router(code.router, prefix="/api/v1/code", tags=["Code Generation"])
 
 
@@ -64,3 +77,15 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+
+@app.get("/health/cache")
+async def cache_stats():
+    return {
+        **cache_manager.stats(),
+        "single_flight": single_flight.stats()
+    }
+
+
+@app.get("/health/auth")
+async def auth_stats():
+    return {"password_hashing": password_hash_pool.stats()}
@@ -0,0 +1,23 @@
+"""
+Branch request schemas
+"""
+from pydantic import BaseModel
+from typing import Optional, Dict, Any, Literal
+
+
+class CreateBranchRequest(BaseModel):
+    """Create branch request"""
+    table_id: int
+    name: str
+    description: Optional[str] = None
+
+
+class UpdateBranchRowRequest(BaseModel):
+    """Override row cells on a branch"""
+    cells: Dict[str, Any]  # column_name -> value
+
+
+class MergeBranchRequest(BaseModel):
+    """Merge branch request"""
+    strategy: Literal["fail", "ours", "theirs"] = "fail"  # How cells changed on both sides are resolved
+    message: Optional[str] = None
@@ -1,8 +1,8 @@
 """
 Data request schemas
 """
-from pydantic import BaseModel
-from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Optional
 
 
 class UpdateCellRequest(BaseModel):
@@ -22,3 +22,35 @@ class UpdateRowRequest(BaseModel):
     row_id: int
     cells: Dict[str, Any]  # column_name -> value
 
+
+
+class BulkCreateRowsRequest(BaseModel):
+    """Bulk create rows request"""
+    rows: List[Dict[str, Any]]  # column_name -> value per row
+    chunk_size: int = Field(1000, ge=1, le=10000)  # rows per insert transaction
+
+
+class ValidateRowsRequest(BaseModel):
+    """Validate rows request (nothing is written)"""
+    rows: List[Dict[str, Any]]  # column_name -> value per row
+
+
+class CellPatchOperation(BaseModel):
+    """One write of a batch cell patch - addressed by cell_id, or by row_id + column name"""
+    cell_id: Optional[int] = None
+    row_id: Optional[int] = None
+    column: Optional[str] = None  # column name, with row_id
+    value: Any = None
+    version: Optional[int] = None  # expected cell version; the write is skipped if the cell changed
+    
+    @model_validator(mode="after")
+    def check_target(self) -> "CellPatchOperation":
+        """Require a cell_id or a row_id + column pair"""
+        if self.cell_id is None and (self.row_id is None or self.column is None):
+            raise ValueError("Either cell_id or row_id and column is required")
+        return self
+
+
+class BatchCellPatchRequest(BaseModel):
+    """Batch cell patch request"""
+    operations: List[CellPatchOperation] = Field(..., min_length=1, max_length=10000)
@@ -1,14 +1,16 @@
 """
 Version request schemas
 """
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
 
 
 class CreateCommitRequest(BaseModel):
-    """Create commit request"""
+    """Create commit request - commits the changes captured server-side"""
+    # Diffs are never taken from clients: a `changes` field is rejected, not ignored
+    model_config = ConfigDict(extra="forbid")
+    
     project_id: int
     table_id: Optional[int] = None
     message: str
-    changes: Dict[str, Any]  # cell_id -> {old_value, new_value}
 
@@ -0,0 +1,55 @@
+"""
+Branch response schemas
+"""
+from pydantic import BaseModel
+from typing import Optional, List, Any
+from datetime import datetime
+
+
+class BranchResponse(BaseModel):
+    """Branch response"""
+    id: int
+    table_id: int
+    name: str
+    description: Optional[str]
+    created_by: int
+    base_version_id: Optional[int]
+    created_at: datetime
+    updated_at: datetime
+
+
+class BranchChangeResponse(BaseModel):
+    """Cell overridden on a branch"""
+    row_id: int
+    column: str
+    base_value: Optional[Any]  # Base table value when first overridden
+    value: Optional[Any]
+
+
+class BranchChangesResponse(BaseModel):
+    """All cells overridden on a branch"""
+    branch_id: int
+    table_id: int
+    changes: List[BranchChangeResponse]
+
+
+class MergeConflictResponse(BaseModel):
+    """Cell changed differently on the branch and the table"""
+    row_id: int
+    column: str
+    base_value: Optional[Any]  # Common ancestor
+    ours_value: Optional[Any]  # Table
+    theirs_value: Optional[Any]  # Branch
+
+
+class MergeResponse(BaseModel):
+    """Merge (or merge preview) result"""
+    branch_id: int
+    table_id: int
+    ours_only: int  # Cells changed only on the table
+    theirs_only: int  # Cells changed only on the branch
+    convergent: int  # Cells changed identically on both
+    conflicts: List[MergeConflictResponse]
+    strategy: Optional[str] = None
+    version_id: Optional[int] = None  # Version recording the merge, None if nothing changed
+    applied_cells: Optional[int] = None
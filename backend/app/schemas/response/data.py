@@ -0,0 +1,71 @@
+"""
+Data response schemas
+"""
+from pydantic import BaseModel
+from typing import Any, List, Optional
+
+
+class BulkCreateRowsResponse(BaseModel):
+    """Bulk row ingestion result"""
+    table_id: int
+    inserted_rows: int
+    inserted_cells: int
+    chunks: int
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+class RowValidationErrorResponse(BaseModel):
+    """One kind of error of a column, with the rows it occurs in"""
+    column: Optional[str]
+    message: str
+    count: int
+    rows: List[int]  # row indexes in the request (first 100)
+
+
+class RowValidationResponse(BaseModel):
+    """Batch validation report"""
+    table_id: int
+    rows: int
+    valid_rows: int
+    invalid_rows: int
+    error_count: int
+    errors: List[RowValidationErrorResponse]
+    elapsed_seconds: float
+
+
+class DanglingReferenceResponse(BaseModel):
+    """A reference value whose row does not exist"""
+    row_id: int
+    column: str
+    value: Any
+    reference_table_id: int
+
+
+class DanglingReferencesResponse(BaseModel):
+    """Dangling reference report of a table"""
+    table_id: int
+    checked: int  # non-null reference values scanned
+    dangling_count: int
+    dangling: List[DanglingReferenceResponse]  # first `limit` of them
+    elapsed_seconds: float
+
+
+class CellPatchResult(BaseModel):
+    """Outcome of one batch cell patch operation"""
+    index: int  # position of the operation in the request
+    status: str  # updated, invalid, not_found, conflict or superseded
+    cell_id: Optional[int] = None
+    row_id: Optional[int] = None
+    column: Optional[str] = None
+    value: Any = None
+    version: Optional[int] = None  # new cell version when updated
+    error: Optional[str] = None
+
+
+class BatchCellPatchResponse(BaseModel):
+    """Batch cell patch result"""
+    updated: int
+    failed: int
+    results: List[CellPatchResult]
+    elapsed_seconds: float
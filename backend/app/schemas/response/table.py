@@ -34,4 +34,5 @@ class TableDataResponse(BaseModel):
     """Table data response"""
     table_id: int
     rows: List[Dict[str, Any]]  # List of row data
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to fetch the next page
 
@@ -2,7 +2,7 @@
 Version response schemas
 """
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -24,3 +24,61 @@ class DiffResponse(BaseModel):
     changes: Dict[str, Any]
     created_at: Optional[str]
 
+
+class RollbackResponse(BaseModel):
+    """Rollback response"""
+    message: str
+    version_id: int
+    rollback_version_id: int  # Version recording the rollback itself
+    restored_cells: int
+    missing_cells: int  # Cells of the version that no longer exist
+    deleted_rows: int = 0  # Rows the version created
+    restored_rows: int = 0  # Rows the version deleted, re-inserted
+    discarded_staged_changes: int = 0  # Staged edits of the touched cells (anyone's), dropped
+    chunks: int
+    elapsed_seconds: float
+
+
+class StagedChangesResponse(BaseModel):
+    """Staged (uncommitted) changes response"""
+    project_id: int
+    table_id: Optional[int]
+    changes: Dict[str, Any]  # cell_id -> {old_value, new_value, row_id, column_id, ...}
+
+
+class VersionChangeResponse(BaseModel):
+    """Change log entry response - one changed cell of a version"""
+    version_id: int
+    message: str
+    author_id: Optional[int]
+    created_at: Optional[datetime]
+    table_id: Optional[int]
+    row_id: Optional[int]
+    column_id: Optional[int]
+    cell_id: int
+    old_value: Optional[Any]
+    new_value: Optional[Any]
+    is_new: bool = False  # The version created the cell (with its row)
+    is_deleted: bool = False  # The version deleted the cell (with its row)
+
+
+class CellBlameResponse(BaseModel):
+    """Last writer of a cell"""
+    cell_id: int
+    version_id: int
+    author_id: int
+    author_username: Optional[str]
+    message: str
+    changed_at: Optional[datetime]
+
+
+class RowBlameResponse(BaseModel):
+    """Blame for the cells of a row, keyed by column name"""
+    row_id: int
+    cells: Dict[str, CellBlameResponse]
+
+
+class TableBlameResponse(BaseModel):
+    """Blame for one page of a table's rows (rows without committed changes are omitted)"""
+    table_id: int
+    rows: List[RowBlameResponse]
@@ -2,7 +2,7 @@
 Diff algorithm implementation
 O(n) time complexity for cell-by-cell comparison
 """
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Iterable, List, Tuple
 
 
 def calculate_cell_diff(old_cells: Dict[int, Any], new_cells: Dict[int, Any]) -> Dict[str, Dict[str, Any]]:
@@ -31,6 +31,42 @@ def calculate_cell_diff(old_cells: Dict[int, Any], new_cells: Dict[int, Any]) ->
     return changes
 
 
+def calculate_change_diff(changes: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Calculate a version diff from captured cell changes (CellChange or StagedChange)
+    Time complexity: O(n) where n is the number of changes
+    
+    Entries carry the cell's location (and table, for staged changes), so the change
+    log and as-of replays never depend on the cell still existing. Net no-op edits are
+    dropped; creations and deletions are kept whatever their values, except cells
+    created and deleted again before being committed.
+    Returns: {cell_id: {old_value, new_value, row_id, column_id[, table_id][, is_new][, is_deleted]}}
+    """
+    changes_by_cell: Dict[str, Dict[str, Any]] = {}
+    
+    for change in changes:
+        if change.cell_id is None or (change.is_new and change.is_deleted):
+            continue
+        if not (change.is_new or change.is_deleted) and change.old_value == change.new_value:
+            continue
+        
+        entry = {
+            "old_value": change.old_value,
+            "new_value": change.new_value,
+            "row_id": change.row_id,
+            "column_id": change.column_id
+        }
+        if getattr(change, "table_id", None):
+            entry["table_id"] = change.table_id
+        if change.is_new:
+            entry["is_new"] = True
+        if change.is_deleted:
+            entry["is_deleted"] = True
+        changes_by_cell[str(change.cell_id)] = entry
+    
+    return changes_by_cell
+
+
 def calculate_row_diff(old_row: Dict[str, Any], new_row: Dict[str, Any]) -> Dict[str, Any]:
     """
     Calculate diff between old and new row
@@ -71,3 +107,66 @@ def format_diff_for_display(changes: Dict[str, Dict[str, Any]]) -> List[Dict[str
     
     return formatted
 
+
+
+# Marks a key absent from one side of a three-way merge
+_MISSING = object()
+
+
+def _changed_keys(base: Dict[Any, Any], side: Dict[Any, Any]) -> set:
+    """
+    Keys whose value differs between base and side (added, removed or modified)
+    Uses set algebra on the dict item views, which runs in C; falls back to a
+    per-key comparison when values are unhashable
+    """
+    try:
+        return {key for key, _ in side.items() - base.items()} | (base.keys() - side.keys())
+    except TypeError:
+        keys = base.keys() | side.keys()
+        return {key for key in keys if base.get(key, _MISSING) != side.get(key, _MISSING)}
+
+
+def calculate_three_way_merge(
+    base: Dict[Any, Any],
+    ours: Dict[Any, Any],
+    theirs: Dict[Any, Any]
+) -> Dict[str, Any]:
+    """
+    Three-way merge of cell maps from a common ancestor (base) and two descendants
+    Time complexity: O(n) where n is the number of cells, mostly inside set operations
+    
+    Edits made on one side only are taken automatically, identical edits on both
+    sides are merged, and different edits of the same cell are conflicts.
+    Returns: {
+        changes: {key: value} to apply on top of ours (theirs-only edits),
+        conflicts: {key: {base_value, ours_value, theirs_value}},
+        ours_only, theirs_only, convergent: edit counts
+    }
+    A key missing from a side is reported as None.
+    """
+    changed_ours = _changed_keys(base, ours)
+    changed_theirs = _changed_keys(base, theirs)
+    both = changed_ours & changed_theirs
+    
+    changes = {key: theirs.get(key) for key in changed_theirs - both}
+    conflicts: Dict[Any, Dict[str, Any]] = {}
+    convergent = 0
+    for key in both:
+        ours_value = ours.get(key, _MISSING)
+        theirs_value = theirs.get(key, _MISSING)
+        if ours_value == theirs_value:
+            convergent += 1
+        else:
+            conflicts[key] = {
+                "base_value": base.get(key),
+                "ours_value": None if ours_value is _MISSING else ours_value,
+                "theirs_value": None if theirs_value is _MISSING else theirs_value
+            }
+    
+    return {
+        "changes": changes,
+        "conflicts": conflicts,
+        "ours_only": len(changed_ours) - len(both),
+        "theirs_only": len(changes),
+        "convergent": convergent
+    }
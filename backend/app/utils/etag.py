@@ -0,0 +1,35 @@
+"""
+Version ETags for conditional (If-Match) writes
+Tags are strong and name the resource: "row-12-v3", "cell-40-v7"
+"""
+from typing import Optional
+from app.core.exceptions import PreconditionFailedError, ValidationError
+
+
+def version_etag(kind: str, resource_id: int, version: int) -> str:
+    """ETag of a resource version"""
+    return f'"{kind}-{resource_id}-v{version}"'
+
+
+def parse_if_match(if_match: Optional[str], kind: str, resource_id: int) -> Optional[int]:
+    """
+    Get the version an If-Match header expects for a resource
+    None means unconditional (no header or "*"); a header naming only other
+    resources cannot match, so the precondition fails
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    
+    prefix = f"{kind}-{resource_id}-v"
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag.startswith(prefix):
+            try:
+                return int(tag[len(prefix):])
+            except ValueError:
+                raise ValidationError(f"Invalid If-Match tag '{tag}'")
+    
+    raise PreconditionFailedError(f"If-Match does not match {kind} {resource_id}")
@@ -0,0 +1,37 @@
+"""
+Keyset (cursor) pagination helpers
+Cursors are opaque to clients: urlsafe base64 of the (table_id, id) position
+"""
+import base64
+import json
+from typing import Optional
+from app.core.exceptions import ValidationError
+
+
+def encode_cursor(table_id: int, last_id: int) -> str:
+    """Encode the position after `last_id` in `table_id` as an opaque cursor"""
+    payload = json.dumps({"t": table_id, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, table_id: int) -> int:
+    """Decode a cursor for `table_id` and return the last seen id"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        cursor_table_id = int(payload["t"])
+        last_id = int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValidationError("Invalid cursor")
+    
+    if cursor_table_id != table_id:
+        raise ValidationError("Cursor does not belong to this table")
+    
+    return last_id
+
+
+def next_cursor_for(table_id: int, last_id: Optional[int], has_more: bool) -> Optional[str]:
+    """Build the cursor for the next page, or None when the last page was reached"""
+    if not has_more or last_id is None:
+        return None
+    return encode_cursor(table_id, last_id)
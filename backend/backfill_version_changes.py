@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Backfill the normalized version_changes log and cell blame index from existing versions
+
+Usage: python backfill_version_changes.py [batch_size]
+Only versions without change log entries are processed, so the script can be
+re-run safely. Cells deleted since a version are logged without a row/column.
+The blame index is rebuilt from the whole change log at the end.
+"""
+import asyncio
+import sys
+
+from sqlalchemy import select, exists
+from app.core.database import AsyncSessionLocal
+from app.infrastructure.models.user import UserModel
+from app.infrastructure.models.project import ProjectModel
+from app.infrastructure.models.table import TableModel, ColumnModel
+from app.infrastructure.models.cell import RowModel, CellModel
+from app.infrastructure.models.version import VersionModel, VersionChangeModel
+from app.infrastructure.repositories.version_repository import VersionRepository
+
+
+async def backfill(batch_size):
+    """Write change log entries for every version that has none, one batch per transaction"""
+    async with AsyncSessionLocal() as session:
+        version_repo = VersionRepository(session)
+        last_id = 0
+        total_versions = total_changes = 0
+        
+        while True:
+            stmt = select(VersionModel).where(
+                VersionModel.id > last_id,
+                ~exists().where(VersionChangeModel.version_id == VersionModel.id)
+            ).order_by(VersionModel.id).limit(batch_size)
+            result = await session.execute(stmt)
+            versions = [version_repo._to_domain(model) for model in result.scalars().all()]
+            if not versions:
+                break
+            
+            for version in versions:
+                total_changes += await version_repo.record_changes(version)
+            await session.commit()
+            
+            last_id = versions[-1].id
+            total_versions += len(versions)
+            print(f"OK: up to version {last_id} - {total_versions} versions, {total_changes} changes")
+        
+        blamed_cells = await version_repo.rebuild_blame()
+        await session.commit()
+        print(f"DONE: {total_versions} versions, {total_changes} changes backfilled, {blamed_cells} cells blamed")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
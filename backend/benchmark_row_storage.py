@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""Benchmark read/write throughput of the EAV and row-packed storage backends
+
+Usage: python benchmark_row_storage.py [rows] [columns] [database_url]
+Defaults to 20000 rows x 10 columns on a throwaway SQLite file. Pass a
+postgresql+asyncpg:// URL to measure PostgreSQL (COPY / JSONB paths).
+"""
+import asyncio
+import os
+import sys
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.core.database import Base
+from app.infrastructure.models.user import UserModel
+from app.infrastructure.models.project import ProjectModel
+from app.infrastructure.models.table import TableModel, ColumnModel
+from app.infrastructure.models.cell import RowModel, CellModel
+from app.infrastructure.models.version import VersionModel
+from app.infrastructure.repositories.data_repository import DataRepository
+from app.infrastructure.repositories.packed_data_repository import PackedDataRepository
+
+DEFAULT_URL = "sqlite+aiosqlite:///./benchmark_row_storage.db"
+CHUNK_SIZE = 1000
+PAGE_SIZE = 1000
+
+
+async def setup_table(session: AsyncSession, column_count: int) -> tuple:
+    """Create a user/project/table with alternating integer and string columns"""
+    user = UserModel(username="bench", email="bench@example.com", hashed_password="x")
+    session.add(user)
+    await session.flush()
+    project = ProjectModel(name="Benchmark", owner_id=user.id)
+    session.add(project)
+    await session.flush()
+    
+    table_ids = []
+    column_ids = []
+    for name in ("eav", "packed"):
+        table = TableModel(project_id=project.id, name=f"bench_{name}")
+        session.add(table)
+        await session.flush()
+        ids = []
+        for index in range(column_count):
+            column = ColumnModel(
+                table_id=table.id,
+                name=f"col_{index}",
+                data_type="integer" if index % 2 == 0 else "string",
+                order=index
+            )
+            session.add(column)
+            await session.flush()
+            ids.append(column.id)
+        table_ids.append(table.id)
+        column_ids.append(ids)
+    
+    await session.commit()
+    return table_ids, column_ids
+
+
+def make_rows(row_count: int, column_ids: list) -> list:
+    """Generate column_id -> value rows"""
+    return [
+        {
+            column_id: (row * index if index % 2 == 0 else f"value-{row}-{index}")
+            for index, column_id in enumerate(column_ids)
+        }
+        for row in range(row_count)
+    ]
+
+
+async def measure(label: str, repo, table_id: int, rows: list) -> None:
+    """Time chunked writes and a full keyset-paginated read"""
+    started = time.perf_counter()
+    for start in range(0, len(rows), CHUNK_SIZE):
+        await repo.create_rows(table_id, rows[start:start + CHUNK_SIZE])
+        await repo.commit()
+    write_seconds = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    read = 0
+    after_id = 0
+    while True:
+        page = await repo.get_rows_by_table_id(table_id, limit=PAGE_SIZE, after_id=after_id)
+        if not page:
+            break
+        read += len(page)
+        after_id = page[-1].id
+    read_seconds = time.perf_counter() - started
+    
+    print(
+        f"{label:<7} write: {len(rows) / write_seconds:>10.0f} rows/s ({write_seconds:.2f}s)   "
+        f"read: {read / read_seconds:>10.0f} rows/s ({read_seconds:.2f}s)"
+    )
+
+
+async def main(row_count: int, column_count: int, database_url: str):
+    """Run the benchmark against a fresh schema"""
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        (eav_table_id, packed_table_id), (eav_columns, packed_columns) = await setup_table(session, column_count)
+        print(f"Benchmark: {row_count} rows x {column_count} columns on {engine.dialect.name}")
+        await measure("eav", DataRepository(session), eav_table_id, make_rows(row_count, eav_columns))
+        session.expunge_all()
+        await measure("packed", PackedDataRepository(session), packed_table_id, make_rows(row_count, packed_columns))
+    
+    await engine.dispose()
+    if database_url == DEFAULT_URL and os.path.exists("benchmark_row_storage.db"):
+        os.remove("benchmark_row_storage.db")
+
+
+if __name__ == "__main__":
+    rows_arg = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    columns_arg = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    url_arg = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_URL
+    asyncio.run(main(rows_arg, columns_arg, url_arg))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""Migrate table data from the cells (EAV) layout to row-packed documents
+
+Usage: python migrate_row_storage.py [table_id ...]
+Packs every table when no ids are given. Cells are kept, so the EAV backend
+keeps working; set DATA_STORAGE_BACKEND=packed once the migration is done.
+"""
+import asyncio
+import sys
+
+from sqlalchemy import select
+from app.core.database import AsyncSessionLocal
+from app.infrastructure.models.user import UserModel
+from app.infrastructure.models.project import ProjectModel
+from app.infrastructure.models.table import TableModel, ColumnModel
+from app.infrastructure.models.cell import RowModel, CellModel
+from app.infrastructure.models.version import VersionModel
+from app.infrastructure.repositories.table_repository import TableRepository
+from app.infrastructure.repositories.packed_data_repository import PackedDataRepository
+
+
+async def migrate(table_ids):
+    """Pack the given tables (all tables when empty)"""
+    async with AsyncSessionLocal() as session:
+        if not table_ids:
+            result = await session.execute(select(TableModel.id).order_by(TableModel.id))
+            table_ids = list(result.scalars().all())
+        
+        table_repo = TableRepository(session)
+        packed_repo = PackedDataRepository(session)
+        
+        for table_id in table_ids:
+            table = await table_repo.get_by_id(table_id)
+            if not table:
+                print(f"SKIP: table {table_id} not found")
+                continue
+            count = await packed_repo.pack_table(table.id, table.columns)
+            print(f"OK: table {table.id} ({table.name}) - {count} rows packed")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate([int(arg) for arg in sys.argv[1:]]))
@@ -0,0 +1,167 @@
+"""
+Test fixtures
+The API runs against a throwaway SQLite database; every test starts with empty
+tables and empty caches. Set TEST_POSTGRES_URL to also run the PostgreSQL tests.
+"""
+import asyncio
+import importlib
+import os
+import pkgutil
+import tempfile
+
+# Must be set before the app (and its engine) is imported
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='gdh-tests-')}/test.db"
+os.environ.pop("USE_SQLITE", None)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.main import app
+from app.core.config import get_settings
+from app.core.database import Base, engine
+from app.infrastructure.cache.cache_manager import cache_manager
+from app.infrastructure import models
+from app.infrastructure.models.cell import CellModel
+
+# Every model module, so Base.metadata knows all tables
+for module in pkgutil.iter_modules(models.__path__):
+    importlib.import_module(f"{models.__name__}.{module.name}")
+
+# Columns of the table made by the `table` fixture: (name, data_type, is_required)
+DEFAULT_COLUMNS = [("Name", "string", True), ("Damage", "integer", False), ("Level", "integer", False)]
+
+
+async def _reset_database():
+    """Drop and recreate every table"""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Empty database and caches for every test"""
+    asyncio.run(_reset_database())
+    cache_manager.clear()
+    yield
+    cache_manager.clear()
+
+
+@pytest.fixture(params=["eav", "packed"])
+def storage_backend(request, monkeypatch):
+    """Run a test against each row storage backend"""
+    monkeypatch.setattr(get_settings(), "DATA_STORAGE_BACKEND", request.param)
+    return request.param
+
+
+@pytest.fixture
+def packed_storage(monkeypatch):
+    """Use the row-packed storage backend"""
+    monkeypatch.setattr(get_settings(), "DATA_STORAGE_BACKEND", "packed")
+
+
+@pytest.fixture
+def client():
+    """HTTP client for the API"""
+    return TestClient(app)
+
+
+def register(client: TestClient, username: str = "alice") -> dict:
+    """Register and log in a user, returns the Authorization headers"""
+    response = client.post(
+        "/api/v1/auth/register",
+        json={"username": username, "email": f"{username}@example.com", "password": "secret-password"}
+    )
+    assert response.status_code == 201, response.text
+    response = client.post("/api/v1/auth/login", json={"username": username, "password": "secret-password"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def create_table(client: TestClient, headers: dict, columns=DEFAULT_COLUMNS, name: str = "Weapons", project_id=None) -> dict:
+    """Create a table (in a new project unless one is given), returns the table with its columns"""
+    if project_id is None:
+        response = client.post("/api/v1/projects", json={"name": f"{name} project"}, headers=headers)
+        assert response.status_code == 201, response.text
+        project_id = response.json()["id"]
+    response = client.post("/api/v1/tables", json={"name": name, "project_id": project_id}, headers=headers)
+    assert response.status_code == 201, response.text
+    table = response.json()
+    table["columns"] = []
+    for order, (column_name, data_type, required, *options) in enumerate(columns, 1):
+        body = {"name": column_name, "data_type": data_type, "is_required": required, "order": order}
+        for extra in options:
+            body.update(extra)
+        response = client.post(f"/api/v1/tables/{table['id']}/columns", json=body, headers=headers)
+        assert response.status_code == 201, response.text
+        table["columns"].append(response.json())
+    return table
+
+
+def create_row(client: TestClient, headers: dict, table_id: int, cells: dict) -> dict:
+    """Create a row, returns it"""
+    response = client.post("/api/v1/data/rows", json={"table_id": table_id, "cells": cells}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def get_rows(client: TestClient, headers: dict, table_id: int, **params) -> list:
+    """Get rows of a table (one page)"""
+    response = client.get(f"/api/v1/data/table/{table_id}", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["rows"]
+
+
+def update_cell(client: TestClient, headers: dict, cell_id: int, value) -> dict:
+    """Stage a cell edit of the current user"""
+    response = client.patch("/api/v1/data/cell", json={"cell_id": cell_id, "value": value}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def commit(client: TestClient, headers: dict, table: dict, message: str = "Update") -> dict:
+    """Commit the current user's staged edits of a table"""
+    response = client.post(
+        "/api/v1/versions/commit",
+        json={"project_id": table["project_id"], "table_id": table["id"], "message": message},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def create_branch(client: TestClient, headers: dict, table: dict, name: str = "balance") -> dict:
+    """Create a branch of a table, returns it"""
+    response = client.post("/api/v1/branches", json={"table_id": table["id"], "name": name}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def update_branch_row(client: TestClient, headers: dict, branch: dict, row_id: int, cells: dict) -> dict:
+    """Override row cells on a branch, returns the row as seen on the branch"""
+    response = client.patch(f"/api/v1/branches/{branch['id']}/rows/{row_id}", json={"cells": cells}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def headers(client):
+    """Authorization headers of a registered user"""
+    return register(client)
+
+
+@pytest.fixture
+def table(client, headers):
+    """A table with Name (string, required), Damage and Level (integer) columns"""
+    return create_table(client, headers)
+
+
+def cell_ids(row_id: int) -> dict:
+    """Map a row's column IDs to its cell IDs (EAV storage)"""
+    async def load():
+        async with engine.connect() as connection:
+            result = await connection.execute(
+                select(CellModel.column_id, CellModel.id).where(CellModel.row_id == row_id)
+            )
+            return dict(result.all())
+    return asyncio.run(load())
@@ -0,0 +1,72 @@
+"""
+Batch cell patch: many writes in one request with a result per operation
+"""
+from tests.conftest import create_row, cell_ids, get_rows, commit
+
+
+def _patch(client, headers, operations: list) -> dict:
+    response = client.patch("/api/v1/data/cells:batch", json={"operations": operations}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_each_operation_reports_its_outcome(client, headers, table):
+    damage, level = table["columns"][1]["id"], table["columns"][2]["id"]
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10, "Level": 1})
+    cells = cell_ids(sword["id"])
+    
+    result = _patch(client, headers, [
+        {"cell_id": cells[damage], "value": 11},
+        {"row_id": sword["id"], "column": "Level", "value": "3"},
+        {"cell_id": 999, "value": 1},
+        {"row_id": sword["id"], "column": "Weight", "value": 1},
+        {"cell_id": cells[level], "value": "heavy"},
+        {"cell_id": cells[damage], "value": 12},
+    ])
+    
+    assert [r["status"] for r in result["results"]] == [
+        "superseded", "updated", "not_found", "not_found", "invalid", "updated"
+    ]
+    assert (result["updated"], result["failed"]) == (2, 4)
+    assert result["results"][1]["cell_id"] == cells[level]
+    assert result["results"][4]["error"].startswith("Column 'Level'")
+    assert result["results"][5]["version"] == 2
+    
+    [row] = get_rows(client, headers, table["id"])
+    assert (row["cells"]["Damage"], row["cells"]["Level"]) == ("12", "3")
+
+
+def test_stale_versions_conflict(client, headers, table):
+    damage = table["columns"][1]["id"]
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    cell_id = cell_ids(sword["id"])[damage]
+    
+    assert _patch(client, headers, [{"cell_id": cell_id, "value": 11, "version": 1}])["updated"] == 1
+    
+    [result] = _patch(client, headers, [{"cell_id": cell_id, "value": 99, "version": 1}])["results"]
+    assert result["status"] == "conflict"
+    assert get_rows(client, headers, table["id"])[0]["cells"]["Damage"] == "11"
+
+
+def test_patched_cells_are_staged(client, headers, table):
+    damage = table["columns"][1]["id"]
+    rows = [create_row(client, headers, table["id"], {"Name": f"Item {i}", "Damage": i}) for i in range(3)]
+    commit(client, headers, table, "Add items")
+    
+    _patch(client, headers, [{"row_id": row["id"], "column": "Damage", "value": 50} for row in rows])
+    
+    response = client.get(
+        "/api/v1/versions/staged",
+        params={"project_id": table["project_id"], "table_id": table["id"]},
+        headers=headers
+    )
+    staged = response.json()["changes"]
+    assert sorted((entry["row_id"], entry["old_value"], entry["new_value"]) for entry in staged.values()) == [
+        (rows[i]["id"], str(i), "50") for i in range(3)
+    ]
+    assert {entry["column_id"] for entry in staged.values()} == {damage}
+
+
+def test_operation_needs_a_target(client, headers):
+    response = client.patch("/api/v1/data/cells:batch", json={"operations": [{"value": 1}]}, headers=headers)
+    assert response.status_code == 422
@@ -0,0 +1,50 @@
+"""
+Cell blame: the last committed version (and author) of every cell of a row page
+"""
+from tests.conftest import create_row, cell_ids, update_cell, commit, get_rows
+
+
+def _blame(client, headers, table_id: int, **params) -> dict:
+    response = client.get(f"/api/v1/versions/blame/table/{table_id}", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_blame_names_the_last_writer_of_each_cell(client, headers, table):
+    damage = table["columns"][1]["id"]
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    created = commit(client, headers, table, "Add sword")
+    
+    update_cell(client, headers, cell_ids(sword["id"])[damage], 12)
+    buffed = commit(client, headers, table, "Buff sword")
+    # Staged edits are not blamed until committed
+    update_cell(client, headers, cell_ids(sword["id"])[damage], 99)
+    
+    blame = _blame(client, headers, table["id"])
+    assert blame["table_id"] == table["id"]
+    [row] = blame["rows"]
+    assert row["row_id"] == sword["id"]
+    assert (row["cells"]["Name"]["version_id"], row["cells"]["Name"]["message"]) == (created["id"], "Add sword")
+    assert (row["cells"]["Damage"]["version_id"], row["cells"]["Damage"]["message"]) == (buffed["id"], "Buff sword")
+    assert row["cells"]["Damage"]["author_username"] == "alice"
+    assert row["cells"]["Damage"]["cell_id"] == cell_ids(sword["id"])[damage]
+
+
+def test_blame_follows_the_row_page(client, headers, table):
+    rows = [create_row(client, headers, table["id"], {"Name": f"Item {i}"}) for i in range(5)]
+    commit(client, headers, table, "Add items")
+    
+    response = client.get(f"/api/v1/data/table/{table['id']}", params={"limit": 2}, headers=headers)
+    cursor = response.json()["next_cursor"]
+    page = get_rows(client, headers, table["id"], limit=2, cursor=cursor)
+    
+    blame = _blame(client, headers, table["id"], limit=2, cursor=cursor)
+    assert [row["row_id"] for row in blame["rows"]] == [row["id"] for row in page] == [rows[2]["id"], rows[3]["id"]]
+    
+    blame = _blame(client, headers, table["id"], skip=4, limit=2)
+    assert [row["row_id"] for row in blame["rows"]] == [rows[4]["id"]]
+
+
+def test_blame_of_unknown_table(client, headers):
+    response = client.get("/api/v1/versions/blame/table/999", headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,56 @@
+"""
+Data branches: copy-on-write overrides on top of the base table
+"""
+from tests.conftest import create_row, get_rows, create_branch, update_branch_row
+
+
+def _branch_rows(client, headers, branch, **params) -> list:
+    response = client.get(f"/api/v1/branches/{branch['id']}/data", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["rows"]
+
+
+def test_branch_edits_leave_the_table_untouched(client, headers, table):
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    axe = create_row(client, headers, table["id"], {"Name": "Axe", "Damage": 20})
+    branch = create_branch(client, headers, table)
+    
+    row = update_branch_row(client, headers, branch, sword["id"], {"Damage": 15})
+    assert row["cells"]["Damage"] == "15"
+    
+    branch_rows = _branch_rows(client, headers, branch)
+    assert [(r["id"], r["cells"]["Damage"]) for r in branch_rows] == [(sword["id"], "15"), (axe["id"], "20")]
+    assert [r["cells"]["Damage"] for r in get_rows(client, headers, table["id"])] == ["10", "20"]
+
+
+def test_branch_changes_list_overrides_with_base_values(client, headers, table):
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    branch = create_branch(client, headers, table)
+    update_branch_row(client, headers, branch, sword["id"], {"Damage": 15})
+    update_branch_row(client, headers, branch, sword["id"], {"Damage": 16})
+    
+    response = client.get(f"/api/v1/branches/{branch['id']}/changes", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["changes"] == [
+        {"row_id": sword["id"], "column": "Damage", "base_value": "10", "value": "16"}
+    ]
+
+
+def test_branch_pages_use_cursors(client, headers, table):
+    rows = [create_row(client, headers, table["id"], {"Name": f"Item {i}"}) for i in range(3)]
+    branch = create_branch(client, headers, table)
+    
+    response = client.get(f"/api/v1/branches/{branch['id']}/data", params={"limit": 2}, headers=headers)
+    first = response.json()
+    assert [r["id"] for r in first["rows"]] == [rows[0]["id"], rows[1]["id"]]
+    rest = _branch_rows(client, headers, branch, cursor=first["next_cursor"])
+    assert [r["id"] for r in rest] == [rows[2]["id"]]
+
+
+def test_deleted_branch_is_gone(client, headers, table):
+    branch = create_branch(client, headers, table)
+    response = client.get(f"/api/v1/branches/table/{table['id']}", headers=headers)
+    assert [b["id"] for b in response.json()] == [branch["id"]]
+    
+    assert client.delete(f"/api/v1/branches/{branch['id']}", headers=headers).status_code == 204
+    assert client.get(f"/api/v1/branches/{branch['id']}", headers=headers).status_code == 404
@@ -0,0 +1,49 @@
+"""
+Bulk row ingestion: a batch is validated as a whole, then inserted in chunks
+"""
+from tests.conftest import get_rows
+
+
+def _bulk(client, headers, table, rows, chunk_size=1000):
+    return client.post(
+        f"/api/v1/data/tables/{table['id']}/rows:bulk",
+        json={"rows": rows, "chunk_size": chunk_size},
+        headers=headers
+    )
+
+
+def test_bulk_insert_in_chunks(client, headers, table, storage_backend):
+    rows = [{"Name": f"Weapon {index}", "Damage": index} for index in range(7)]
+    
+    response = _bulk(client, headers, table, rows, chunk_size=3)
+    assert response.status_code == 201, response.text
+    result = response.json()
+    # Level is optional: every row gets all three cells
+    assert (result["inserted_rows"], result["inserted_cells"], result["chunks"]) == (7, 21, 3)
+    
+    names = [row["cells"]["Name"] for row in get_rows(client, headers, table["id"])]
+    assert names == [f"Weapon {index}" for index in range(7)]
+
+
+def test_invalid_batch_inserts_nothing(client, headers, table, storage_backend):
+    rows = [{"Name": "Sword", "Damage": 10}, {"Damage": "strong"}, {"Name": "Axe", "Damage": "heavy"}]
+    
+    response = _bulk(client, headers, table, rows, chunk_size=1)
+    assert response.status_code == 400, response.text
+    detail = response.json()["detail"]
+    assert detail.startswith("3 invalid values in batch")
+    assert "column 'Damage'" in detail and "column 'Name'" in detail
+    assert get_rows(client, headers, table["id"]) == []
+
+
+def test_empty_batch(client, headers, table):
+    response = _bulk(client, headers, table, [])
+    assert response.status_code == 201, response.text
+    assert response.json()["inserted_rows"] == 0
+
+
+def test_unknown_table(client, headers, table):
+    response = client.post(
+        "/api/v1/data/tables/999/rows:bulk", json={"rows": [{"Name": "Sword"}]}, headers=headers
+    )
+    assert response.status_code == 404
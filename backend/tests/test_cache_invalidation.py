@@ -0,0 +1,68 @@
+"""
+Tag-based cache invalidation: tagged entries are evicted by repository writes, a
+value loaded across an invalidation is not stored, and the per-tag bookkeeping
+stays bounded
+"""
+from app.infrastructure.cache.cache_manager import CacheManager
+from app.infrastructure.cache.invalidation import emit_invalidation, table_tag
+from tests.conftest import create_row, get_rows
+
+
+def test_invalidate_tags_evicts_tagged_entries():
+    cache = CacheManager(max_entries=10, max_bytes=1 << 20)
+    cache.set("page:1", [1], tags=[table_tag(1)])
+    cache.set("page:2", [2], tags=[table_tag(2)])
+    
+    assert emit_invalidation(table_ids=[1], cache=cache) == 1
+    assert cache.get("page:1") is None
+    assert cache.get("page:2") == [2]
+
+
+def test_value_loaded_across_an_invalidation_is_not_stored():
+    cache = CacheManager(max_entries=10, max_bytes=1 << 20)
+    versions = cache.tag_versions([table_tag(1)])
+    cache.invalidate_tags(table_tag(1))
+    
+    assert not cache.set("page:1", [1], tags=[table_tag(1)], if_tag_versions=versions)
+    assert cache.get("page:1") is None
+    
+    versions = cache.tag_versions([table_tag(1)])
+    assert cache.set("page:1", [1], tags=[table_tag(1)], if_tag_versions=versions)
+
+
+def test_tag_versions_are_bounded():
+    cache = CacheManager(max_entries=10, max_bytes=1 << 20)
+    for table_id in range(1000):
+        cache.invalidate_tags(table_tag(table_id))
+    
+    assert cache.stats()["tag_versions"] == 10
+
+
+def test_dropped_tag_versions_still_reject_stale_values():
+    cache = CacheManager(max_entries=10, max_bytes=1 << 20)
+    versions = cache.tag_versions([table_tag(1)])
+    cache.invalidate_tags(table_tag(1))
+    # Push the stamp of table 1 out of the bounded bookkeeping
+    for table_id in range(2, 100):
+        cache.invalidate_tags(table_tag(table_id))
+    
+    assert not cache.set("page:1", [1], tags=[table_tag(1)], if_tag_versions=versions)
+
+
+def test_clear_resets_tag_versions_and_rejects_loads_in_flight():
+    cache = CacheManager(max_entries=10, max_bytes=1 << 20)
+    cache.invalidate_tags(table_tag(1))
+    versions = cache.tag_versions([table_tag(2)])
+    cache.clear()
+    
+    assert cache.stats()["tag_versions"] == 0
+    assert not cache.set("page:2", [2], tags=[table_tag(2)], if_tag_versions=versions)
+
+
+def test_row_write_evicts_cached_table_pages(client, headers, table):
+    create_row(client, headers, table["id"], {"Name": "Sword"})
+    assert len(get_rows(client, headers, table["id"])) == 1
+    
+    # The first read is cached; the write must evict it
+    create_row(client, headers, table["id"], {"Name": "Axe"})
+    assert [row["cells"]["Name"] for row in get_rows(client, headers, table["id"])] == ["Sword", "Axe"]
@@ -0,0 +1,102 @@
+"""
+Bounded LRU + TTL cache: eviction by entry count and bytes, expiry, counters
+"""
+import pickle
+import time
+from datetime import datetime
+from app.domain.entities.cell import Cell, Row
+from app.infrastructure.cache.cache_manager import CacheManager, estimate_size
+
+
+def _page(rows: int, columns: int = 5) -> list:
+    """A table page as the data service caches it: rows of cells"""
+    now = datetime.utcnow()
+    return [
+        Row(id=row_id, table_id=1, created_at=now, updated_at=now, cells={
+            column_id: Cell(id=row_id * columns + column_id, row_id=row_id, column_id=column_id,
+                            value=f"value {row_id}/{column_id}", created_at=now, updated_at=now)
+            for column_id in range(1, columns + 1)
+        })
+        for row_id in range(rows)
+    ]
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = CacheManager(max_entries=2, max_bytes=1 << 20)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_is_enforced():
+    cache = CacheManager(max_entries=100, max_bytes=100)
+    cache.set("a", "x", size=60)
+    cache.set("b", "y", size=60)
+    
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 60
+    
+    # A value larger than the whole budget is never stored
+    assert not cache.set("huge", "z", size=101)
+    assert cache.get("b") == "y"
+
+
+def test_nested_values_are_sized_in_full():
+    page = _page(1000)
+    
+    # At least the serialized size: every row and cell is counted, not just the outer list
+    assert estimate_size(page) >= len(pickle.dumps(page))
+    
+    shared = "x" * 1000
+    assert estimate_size([shared, shared]) < 2 * estimate_size(shared)
+
+
+def test_table_pages_are_evicted_by_bytes():
+    # Room for ten pages by their serialized size; twelve pages cannot all fit
+    budget = 10 * len(pickle.dumps(_page(200)))
+    cache = CacheManager(max_entries=100, max_bytes=budget)
+    for page in range(12):
+        assert cache.set(f"table_page:{page}", _page(200))
+    
+    stats = cache.stats()
+    assert stats["evictions"] >= 1
+    assert stats["bytes"] <= budget
+    assert cache.get("table_page:0") is None
+
+
+def test_replacing_an_entry_releases_its_size():
+    cache = CacheManager(max_entries=10, max_bytes=1000)
+    cache.set("a", "x", size=400)
+    cache.set("a", "y", size=100)
+    
+    assert cache.stats()["bytes"] == 100
+    cache.delete("a")
+    assert cache.stats()["bytes"] == 0
+
+
+def test_expired_entries_are_dropped():
+    cache = CacheManager(max_entries=10, max_bytes=1 << 20)
+    cache.set("short", 1, ttl_seconds=0.01)
+    cache.set("long", 2, ttl_seconds=60)
+    time.sleep(0.02)
+    
+    assert cache.cleanup_expired() == 1
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_hit_ratio():
+    cache = CacheManager(max_entries=10, max_bytes=1 << 20)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+    
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (2, 1, 0.6667)
@@ -0,0 +1,120 @@
+"""
+Generated code artifacts: cached by table schema, data revision and template, with strong ETags
+"""
+import os
+from unittest.mock import patch
+from sqlalchemy import event
+from app.core.database import engine
+from app.infrastructure.code_generators.json_generator import JSONGenerator
+from app.infrastructure.code_generators.template_environment import TemplateEnvironment
+from tests.conftest import create_row, cell_ids, update_cell
+
+
+def _generate(client, headers, table, **extra_headers):
+    return client.get(
+        f"/api/v1/code/tables/{table['id']}/generate",
+        params={"format": "json"},
+        headers={**headers, **extra_headers}
+    )
+
+
+def test_unchanged_table_is_not_modified(client, headers, table):
+    create_row(client, headers, table["id"], {"Name": "Sword"})
+    
+    response = _generate(client, headers, table)
+    assert response.status_code == 200, response.text
+    assert "Sword" in response.text
+    etag = response.headers["etag"]
+    
+    response = _generate(client, headers, table, **{"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_cached_artifact_is_not_rendered_again(client, headers, table):
+    create_row(client, headers, table["id"], {"Name": "Sword"})
+    
+    with patch.object(JSONGenerator, "generate", autospec=True, side_effect=JSONGenerator.generate) as generate:
+        first = _generate(client, headers, table)
+        second = _generate(client, headers, table)
+    
+    assert generate.call_count == 1
+    assert first.text == second.text
+    assert first.headers["etag"] == second.headers["etag"]
+
+
+def test_data_and_schema_changes_produce_new_artifacts(client, headers, table):
+    create_row(client, headers, table["id"], {"Name": "Sword"})
+    etag = _generate(client, headers, table).headers["etag"]
+    
+    create_row(client, headers, table["id"], {"Name": "Axe"})
+    response = _generate(client, headers, table, **{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "Axe" in response.text
+    assert response.headers["etag"] != etag
+    etag = response.headers["etag"]
+    
+    response = client.post(
+        f"/api/v1/tables/{table['id']}/columns",
+        json={"name": "Weight", "data_type": "float", "order": 4},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    response = _generate(client, headers, table, **{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_cell_edits_and_deletes_produce_new_artifacts(client, headers, table):
+    damage = table["columns"][1]["id"]
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    axe = create_row(client, headers, table["id"], {"Name": "Axe"})
+    etags = [_generate(client, headers, table).headers["etag"]]
+    
+    update_cell(client, headers, cell_ids(sword["id"])[damage], 12)
+    etags.append(_generate(client, headers, table).headers["etag"])
+    assert client.delete(f"/api/v1/data/rows/{axe['id']}", headers=headers).status_code == 204
+    response = _generate(client, headers, table)
+    etags.append(response.headers["etag"])
+    
+    assert len(set(etags)) == 3
+    assert "Axe" not in response.text
+
+
+def test_writes_do_not_update_the_table_record(client, headers, table):
+    damage = table["columns"][1]["id"]
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        update_cell(client, headers, cell_ids(sword["id"])[damage], 12)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    
+    # Concurrent edits of different rows must not queue on one shared row lock
+    assert not [statement for statement in statements if statement.lstrip().upper().startswith("UPDATE TABLES")]
+
+
+def test_template_override_edits_change_the_revision(tmp_path):
+    override = tmp_path / "unity.j2"
+    override.write_text("v1 {{ table_name }}")
+    environment = TemplateEnvironment(templates_dir=str(tmp_path), auto_reload=True)
+    first = environment.get_template_revision("unity", "{{ table_name }}")
+    
+    override.write_text("version 2 {{ table_name }}")
+    os.utime(override, ns=(override.stat().st_mtime_ns + 10**9,) * 2)
+    assert environment.get_template_revision("unity", "{{ table_name }}") != first
+    
+    override.unlink()
+    assert environment.get_template_revision("unity", "{{ table_name }}").startswith("builtin/")
+
+
+def test_unknown_format_is_rejected(client, headers, table):
+    response = client.get(
+        f"/api/v1/code/tables/{table['id']}/generate", params={"format": "cobol"}, headers=headers
+    )
+    assert response.status_code == 400
@@ -0,0 +1,85 @@
+"""
+Columnar validation: same values as the row validator, errors grouped by column with row indexes
+"""
+import numpy as np
+from app.application.validators.columnar_validator import ColumnarValidator
+from app.application.validators.row_validator import RowValidator
+from app.domain.entities.table import Column
+from tests.conftest import create_table, create_row, get_rows
+
+COLUMNS = [
+    Column(id=1, table_id=1, name="Name", data_type="string", is_required=True),
+    Column(id=2, table_id=1, name="Damage", data_type="integer"),
+    Column(id=3, table_id=1, name="Speed", data_type="float", default_value="1.5"),
+    Column(id=4, table_id=1, name="Magic", data_type="boolean"),
+    Column(id=5, table_id=1, name="Rarity", data_type="enum", enum_values=["common", "rare"]),
+    Column(id=6, table_id=1, name="Owner", data_type="reference", reference_table_id=2),
+]
+
+
+def test_valid_rows_match_the_row_validator():
+    validator = RowValidator(COLUMNS)
+    rows = [
+        {"Name": "Sword", "Damage": 10, "Speed": 2, "Magic": True, "Rarity": "rare", "Owner": 1},
+        {"Name": "Axe", "Damage": "12", "Speed": "0.5", "Magic": "yes", "Owner": 2},
+        {"Name": "Bow", "Damage": "", "Magic": "0", "Rarity": "common"},
+    ]
+    
+    values, report = ColumnarValidator(validator).validate(rows, {2: np.array([1, 2])})
+    
+    assert (report["valid_rows"], report["errors"]) == (3, [])
+    assert values == [validator.validate_row(row)[0] for row in rows]
+    assert values[2] == {1: "Bow", 2: None, 3: 1.5, 4: False, 5: "common", 6: None}
+
+
+def test_errors_are_grouped_by_column_and_message():
+    validator = ColumnarValidator(RowValidator(COLUMNS))
+    rows = [
+        {"Name": "Sword", "Damage": "ten"},
+        {"Damage": 3},
+        {"Name": "Axe", "Damage": 1.5, "Rarity": "legendary"},
+        {"Name": "Bow", "Owner": 7, "Weight": 3},
+        {"Name": "Staff"},
+    ]
+    
+    _, report = validator.validate(rows, {2: np.array([1, 2])})
+    
+    assert (report["rows"], report["valid_rows"], report["invalid_rows"]) == (5, 1, 4)
+    errors = {(error["column"], error["message"]): error["rows"] for error in report["errors"]}
+    assert errors == {
+        ("Weight", "Unknown column"): [3],
+        ("Name", "Column 'Name' is required"): [1],
+        ("Damage", "Value does not match data type integer"): [0, 2],
+        ("Rarity", "Value does not match data type enum"): [2],
+        ("Owner", "Referenced row does not exist in table 2"): [3],
+    }
+    assert report["error_count"] == 6
+
+
+def test_validate_endpoint_writes_nothing(client, headers, table):
+    rows = [{"Name": "Sword", "Damage": 10}, {"Name": "Axe", "Damage": "heavy"}, {"Level": 2}]
+    
+    response = client.post(f"/api/v1/data/tables/{table['id']}/rows:validate", json={"rows": rows}, headers=headers)
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["table_id"], report["valid_rows"], report["invalid_rows"]) == (table["id"], 1, 2)
+    assert sorted((error["column"], error["rows"]) for error in report["errors"]) == [
+        ("Damage", [1]), ("Name", [2])
+    ]
+    assert get_rows(client, headers, table["id"]) == []
+
+
+def test_validate_endpoint_checks_references(client, headers, table):
+    owners = create_table(client, headers, [
+        ("Name", "string", True),
+        ("Weapon", "reference", False, {"reference_table_id": table["id"]}),
+    ], name="Owners", project_id=table["project_id"])
+    sword_id = create_row(client, headers, table["id"], {"Name": "Sword"})["id"]
+    
+    response = client.post(
+        f"/api/v1/data/tables/{owners['id']}/rows:validate",
+        json={"rows": [{"Name": "Ann", "Weapon": sword_id}, {"Name": "Bo", "Weapon": sword_id + 1}]},
+        headers=headers
+    )
+    [error] = response.json()["errors"]
+    assert (error["column"], error["rows"]) == ("Weapon", [1])
@@ -0,0 +1,92 @@
+"""
+Reference expansion: expand= inlines referenced rows on table reads and exports
+"""
+import json
+import pytest
+from app.infrastructure.repositories.data_repository import DataRepository
+from tests.conftest import create_table, create_row, get_rows
+
+
+@pytest.fixture
+def inventory(client, headers):
+    """Materials <- Weapons (Material) <- Owners (Weapon), with rows"""
+    materials = create_table(client, headers, [("Name", "string", True)], name="Materials")
+    project_id = materials["project_id"]
+    weapons = create_table(client, headers, [
+        ("Name", "string", True),
+        ("Material", "reference", False, {"reference_table_id": materials["id"]}),
+    ], name="Weapons", project_id=project_id)
+    owners = create_table(client, headers, [
+        ("Name", "string", True),
+        ("Weapon", "reference", False, {"reference_table_id": weapons["id"]}),
+    ], name="Owners", project_id=project_id)
+    
+    steel = create_row(client, headers, materials["id"], {"Name": "Steel"})
+    sword = create_row(client, headers, weapons["id"], {"Name": "Sword", "Material": steel["id"]})
+    axe = create_row(client, headers, weapons["id"], {"Name": "Axe"})
+    for name, weapon in [("Ann", sword), ("Bo", sword), ("Cy", axe), ("Di", None)]:
+        create_row(client, headers, owners["id"], {"Name": name, "Weapon": weapon["id"] if weapon else None})
+    return {"materials": materials, "weapons": weapons, "owners": owners, "steel": steel, "sword": sword, "axe": axe}
+
+
+def test_reference_is_replaced_by_the_row(client, headers, inventory):
+    rows = get_rows(client, headers, inventory["owners"]["id"], expand="Weapon")
+    
+    weapons = [row["cells"]["Weapon"] for row in rows]
+    assert [weapon and weapon["cells"]["Name"] for weapon in weapons] == ["Sword", "Sword", "Axe", None]
+    assert weapons[0]["id"] == inventory["sword"]["id"]
+    # Nested references stay values unless expanded
+    assert weapons[0]["cells"]["Material"] == str(inventory["steel"]["id"])
+
+
+def test_nested_paths_expand_each_level(client, headers, inventory):
+    rows = get_rows(client, headers, inventory["owners"]["id"], expand="Weapon.Material")
+    
+    assert rows[0]["cells"]["Weapon"]["cells"]["Material"]["cells"]["Name"] == "Steel"
+    assert rows[2]["cells"]["Weapon"]["cells"]["Material"] is None
+
+
+def test_referenced_rows_are_loaded_once_per_table(client, headers, inventory, monkeypatch):
+    loads = []
+    get_rows_by_ids = DataRepository.get_rows_by_ids
+    
+    async def counting(self, table_id, row_ids, *args, **kwargs):
+        loads.append((table_id, sorted(row_ids)))
+        return await get_rows_by_ids(self, table_id, row_ids, *args, **kwargs)
+    
+    monkeypatch.setattr(DataRepository, "get_rows_by_ids", counting)
+    get_rows(client, headers, inventory["owners"]["id"], expand="Weapon.Material")
+    
+    assert loads == [
+        (inventory["weapons"]["id"], sorted([inventory["sword"]["id"], inventory["axe"]["id"]])),
+        (inventory["materials"]["id"], [inventory["steel"]["id"]]),
+    ]
+
+
+def test_dangling_reference_expands_to_none(client, headers, inventory):
+    response = client.delete(f"/api/v1/data/rows/{inventory['axe']['id']}", params={"force": True}, headers=headers)
+    assert response.status_code == 204
+    
+    rows = get_rows(client, headers, inventory["owners"]["id"], expand="Weapon")
+    assert rows[2]["cells"]["Weapon"] is None
+
+
+def test_export_expands_references(client, headers, inventory):
+    response = client.get(
+        f"/api/v1/data/table/{inventory['owners']['id']}/stream",
+        params={"expand": "Weapon", "chunk_size": 2},
+        headers=headers
+    )
+    assert response.status_code == 200, response.text
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["cells"]["Weapon"] and row["cells"]["Weapon"]["cells"]["Name"] for row in rows] == [
+        "Sword", "Sword", "Axe", None
+    ]
+
+
+@pytest.mark.parametrize("expand", ["Name", "Unknown", "Weapon.Name", "Weapon.Material.Name.Extra.More"])
+def test_invalid_expand_is_rejected(client, headers, inventory, expand):
+    owners_id = inventory["owners"]["id"]
+    for path in (f"/api/v1/data/table/{owners_id}", f"/api/v1/data/table/{owners_id}/stream"):
+        response = client.get(path, params={"expand": expand}, headers=headers)
+        assert response.status_code == 400, response.text
@@ -0,0 +1,98 @@
+"""
+Three-way branch merges: one-sided edits apply, conflicts fail or follow a strategy
+"""
+import pytest
+from tests.conftest import create_row, cell_ids, update_cell, commit, get_rows, create_branch, update_branch_row
+
+
+@pytest.fixture
+def sword(client, headers, table):
+    """A committed Sword row (Damage 10, Level 1)"""
+    row = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10, "Level": 1})
+    commit(client, headers, table, "Add sword")
+    return row
+
+
+def _preview(client, headers, branch) -> dict:
+    response = client.get(f"/api/v1/branches/{branch['id']}/merge", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _merge(client, headers, branch, **body):
+    return client.post(f"/api/v1/branches/{branch['id']}/merge", json=body, headers=headers)
+
+
+def _sword_cells(client, headers, table) -> dict:
+    [row] = get_rows(client, headers, table["id"])
+    return row["cells"]
+
+
+def test_branch_only_edits_are_merged_as_a_version(client, headers, table, sword):
+    branch = create_branch(client, headers, table)
+    update_branch_row(client, headers, branch, sword["id"], {"Damage": 15})
+    
+    preview = _preview(client, headers, branch)
+    assert (preview["theirs_only"], preview["ours_only"], preview["conflicts"]) == (1, 0, [])
+    assert _sword_cells(client, headers, table)["Damage"] == "10"
+    
+    response = _merge(client, headers, branch)
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["strategy"], report["applied_cells"]) == ("fail", 1)
+    assert _sword_cells(client, headers, table)["Damage"] == "15"
+    
+    response = client.get(f"/api/v1/versions/{report['version_id']}/diff", headers=headers)
+    [change] = response.json()["changes"].values()
+    assert (change["old_value"], change["new_value"]) == ("10", "15")
+
+
+def test_table_only_and_convergent_edits_are_kept(client, headers, table, sword):
+    damage, level = table["columns"][1]["id"], table["columns"][2]["id"]
+    branch = create_branch(client, headers, table)
+    update_branch_row(client, headers, branch, sword["id"], {"Damage": 15, "Level": 2})
+    update_cell(client, headers, cell_ids(sword["id"])[damage], 15)
+    update_cell(client, headers, cell_ids(sword["id"])[level], 1)
+    
+    preview = _preview(client, headers, branch)
+    assert (preview["convergent"], preview["theirs_only"], preview["conflicts"]) == (1, 1, [])
+    
+    report = _merge(client, headers, branch).json()
+    assert report["applied_cells"] == 1
+    assert (_sword_cells(client, headers, table)["Damage"], _sword_cells(client, headers, table)["Level"]) == ("15", "2")
+
+
+def _conflicting_branch(client, headers, table, sword) -> dict:
+    """Branch setting Damage to 15 while the table set it to 12"""
+    damage = table["columns"][1]["id"]
+    branch = create_branch(client, headers, table)
+    update_branch_row(client, headers, branch, sword["id"], {"Damage": 15})
+    update_cell(client, headers, cell_ids(sword["id"])[damage], 12)
+    commit(client, headers, table, "Nerf sword")
+    return branch
+
+
+def test_conflicts_fail_the_merge_by_default(client, headers, table, sword):
+    branch = _conflicting_branch(client, headers, table, sword)
+    
+    assert _preview(client, headers, branch)["conflicts"] == [
+        {"row_id": sword["id"], "column": "Damage", "base_value": "10", "ours_value": "12", "theirs_value": "15"}
+    ]
+    response = _merge(client, headers, branch)
+    assert response.status_code == 409
+    assert _sword_cells(client, headers, table)["Damage"] == "12"
+
+
+@pytest.mark.parametrize("strategy, damage", [("ours", "12"), ("theirs", "15")])
+def test_strategy_resolves_conflicts(client, headers, table, sword, strategy, damage):
+    branch = _conflicting_branch(client, headers, table, sword)
+    
+    response = _merge(client, headers, branch, strategy=strategy, message="Resolve")
+    assert response.status_code == 200, response.text
+    assert _sword_cells(client, headers, table)["Damage"] == damage
+    assert (response.json()["version_id"] is not None) == (strategy == "theirs")
+
+
+def test_unknown_strategy_is_rejected(client, headers, table, sword):
+    branch = create_branch(client, headers, table)
+    assert _merge(client, headers, branch, strategy="newest").status_code == 422
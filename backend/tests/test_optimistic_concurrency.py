@@ -0,0 +1,65 @@
+"""
+Optimistic concurrency: row and cell versions, ETags and conditional If-Match writes
+"""
+import pytest
+from app.core.exceptions import PreconditionFailedError
+from app.utils.etag import parse_if_match
+from tests.conftest import create_row, cell_ids, get_rows
+
+
+def _patch_row(client, headers, row_id: int, cells: dict, if_match=None):
+    if if_match is not None:
+        headers = {**headers, "If-Match": if_match}
+    return client.patch(f"/api/v1/data/rows/{row_id}", json={"row_id": row_id, "cells": cells}, headers=headers)
+
+
+def _patch_cell(client, headers, cell_id: int, value, if_match=None):
+    if if_match is not None:
+        headers = {**headers, "If-Match": if_match}
+    return client.patch("/api/v1/data/cell", json={"cell_id": cell_id, "value": value}, headers=headers)
+
+
+def test_row_update_with_a_stale_etag_fails(client, headers, table, storage_backend):
+    row = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    
+    first = _patch_row(client, headers, row["id"], {"Damage": 12}, if_match=f'"row-{row["id"]}-v1"')
+    assert first.status_code == 200, first.text
+    assert first.json()["version"] == 2
+    assert first.headers["ETag"] == f'"row-{row["id"]}-v2"'
+    
+    # A second client still holding version 1 loses
+    stale = _patch_row(client, headers, row["id"], {"Damage": 99}, if_match=f'"row-{row["id"]}-v1"')
+    assert stale.status_code == 412
+    assert get_rows(client, headers, table["id"])[0]["cells"]["Damage"] in ("12", 12)
+    
+    retry = _patch_row(client, headers, row["id"], {"Damage": 99}, if_match=first.headers["ETag"])
+    assert retry.status_code == 200, retry.text
+
+
+def test_unconditional_row_updates_still_bump_the_version(client, headers, table):
+    row = create_row(client, headers, table["id"], {"Name": "Sword"})
+    
+    assert _patch_row(client, headers, row["id"], {"Damage": 1}).json()["version"] == 2
+    assert _patch_row(client, headers, row["id"], {"Damage": 2}, if_match="*").json()["version"] == 3
+
+
+def test_cell_update_with_a_stale_etag_fails(client, headers, table):
+    damage = table["columns"][1]["id"]
+    row = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    cell_id = cell_ids(row["id"])[damage]
+    
+    first = _patch_cell(client, headers, cell_id, 12, if_match=f'"cell-{cell_id}-v1"')
+    assert first.status_code == 200, first.text
+    assert first.headers["ETag"] == f'"cell-{cell_id}-v2"'
+    
+    stale = _patch_cell(client, headers, cell_id, 99, if_match=f'"cell-{cell_id}-v1"')
+    assert stale.status_code == 412
+    assert get_rows(client, headers, table["id"])[0]["cells"]["Damage"] == "12"
+
+
+def test_if_match_parsing():
+    assert parse_if_match(None, "row", 1) is None
+    assert parse_if_match("*", "row", 1) is None
+    assert parse_if_match('"row-2-v1", W/"row-1-v4"', "row", 1) == 4
+    with pytest.raises(PreconditionFailedError):
+        parse_if_match('"cell-1-v4"', "row", 1)
@@ -0,0 +1,63 @@
+"""
+Keyset (cursor) pagination of table reads
+"""
+import pytest
+from tests.conftest import create_table, create_row
+from app.utils.pagination import encode_cursor
+
+
+def _page(client, headers, table_id, **params) -> dict:
+    response = client.get(f"/api/v1/data/table/{table_id}", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_cursor_walks_every_row_once(client, headers, table, storage_backend):
+    for index in range(7):
+        create_row(client, headers, table["id"], {"Name": f"Weapon {index}"})
+    
+    names, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = _page(client, headers, table["id"], **params)
+        names += [row["cells"]["Name"] for row in page["rows"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    
+    assert names == [f"Weapon {index}" for index in range(7)]
+    assert pages == 3
+
+
+def test_cursor_is_stable_under_inserts_and_deletes(client, headers, table):
+    rows = [create_row(client, headers, table["id"], {"Name": f"Weapon {index}"}) for index in range(4)]
+    first = _page(client, headers, table["id"], limit=2)
+    
+    # Rows removed before the cursor do not shift the next page, unlike offsets
+    response = client.delete(f"/api/v1/data/rows/{rows[0]['id']}", headers=headers)
+    assert response.status_code == 204
+    create_row(client, headers, table["id"], {"Name": "Weapon 4"})
+    
+    second = _page(client, headers, table["id"], limit=2, cursor=first["next_cursor"])
+    assert [row["cells"]["Name"] for row in second["rows"]] == ["Weapon 2", "Weapon 3"]
+
+
+def test_last_page_has_no_cursor(client, headers, table):
+    create_row(client, headers, table["id"], {"Name": "Sword"})
+    assert _page(client, headers, table["id"], limit=1)["next_cursor"] is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30"])
+def test_malformed_cursor_is_rejected(client, headers, table, cursor):
+    response = client.get(f"/api/v1/data/table/{table['id']}", params={"cursor": cursor}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_cursor_of_another_table_is_rejected(client, headers, table):
+    other = create_table(client, headers, name="Armor", project_id=table["project_id"])
+    
+    response = client.get(
+        f"/api/v1/data/table/{table['id']}", params={"cursor": encode_cursor(other["id"], 1)}, headers=headers
+    )
+    assert response.status_code == 400
@@ -0,0 +1,45 @@
+"""
+Password hashing pool: off-loop bcrypt, queue bound, login over the pool
+"""
+import asyncio
+import threading
+import pytest
+from app.core.exceptions import ServiceUnavailableError
+from app.core.password_hashing import PasswordHashPool
+from tests.conftest import register
+
+
+def test_work_runs_off_the_event_loop_thread():
+    pool = PasswordHashPool(max_workers=1, max_queue=1)
+    
+    async def run():
+        return threading.get_ident(), await pool.run(threading.get_ident)
+    
+    loop_thread, worker_thread = asyncio.run(run())
+    assert loop_thread != worker_thread
+    assert pool.stats()["completed"] == 1
+
+
+def test_calls_beyond_the_queue_are_rejected():
+    pool = PasswordHashPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    
+    async def run():
+        running = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceUnavailableError):
+            await pool.run(release.wait)
+        release.set()
+        return await asyncio.gather(*running)
+    
+    assert asyncio.run(run()) == [True, True]
+    stats = pool.stats()
+    assert (stats["completed"], stats["rejected"], stats["pending"]) == (2, 1, 0)
+
+
+def test_login_checks_the_password(client):
+    register(client)
+    
+    response = client.post("/api/v1/auth/login", json={"username": "alice", "password": "wrong-password"})
+    assert response.status_code == 401
+    assert client.get("/health/auth").json()["password_hashing"]["completed"] >= 3
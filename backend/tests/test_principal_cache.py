@@ -0,0 +1,66 @@
+"""
+Principal cache: memoized tokens and user snapshots, eviction on deactivation
+"""
+import asyncio
+from unittest.mock import patch
+from app.application.services.auth_service import AuthService
+from app.core.database import AsyncSessionLocal
+from app.infrastructure.cache import principal_cache as principal_cache_module
+from app.infrastructure.cache.cache_manager import CacheManager
+from app.infrastructure.cache.principal_cache import PrincipalCache
+from app.infrastructure.models.user import UserModel
+from tests.conftest import register
+
+
+def test_token_is_decoded_once():
+    cache = PrincipalCache(CacheManager(max_entries=10, max_bytes=1 << 20))
+    payload = {"sub": "1", "exp": 4102444800}
+    with patch.object(principal_cache_module, "decode_access_token", return_value=payload) as decode:
+        assert cache.decode_token("token") == payload
+        assert cache.decode_token("token") == payload
+    
+    assert decode.call_count == 1
+
+
+def test_user_snapshot_is_served_without_the_loader():
+    cache = PrincipalCache(CacheManager(max_entries=10, max_bytes=1 << 20))
+    calls = 0
+    
+    async def loader():
+        nonlocal calls
+        calls += 1
+        return UserModel(id=7, username="alice", email="alice@example.com", hashed_password="hash", is_active=True)
+    
+    async def run():
+        await cache.get_user(7, loader)
+        return await cache.get_user(7, loader)
+    
+    user = asyncio.run(run())
+    assert calls == 1
+    assert (user.id, user.username, user.is_active) == (7, "alice", True)
+    # The password hash is never cached
+    assert user.hashed_password is None
+    
+    cache.invalidate_user(7)
+    asyncio.run(cache.get_user(7, loader))
+    assert calls == 2
+
+
+def test_deactivated_user_is_rejected_at_once(client):
+    headers = register(client)
+    assert client.get("/api/v1/projects", headers=headers).status_code == 200
+    
+    async def deactivate():
+        async with AsyncSessionLocal() as session:
+            assert await AuthService(session).set_user_active(1, False)
+            await session.commit()
+    
+    asyncio.run(deactivate())
+    response = client.get("/api/v1/projects", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_invalid_token_is_rejected(client):
+    response = client.get("/api/v1/projects", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
@@ -0,0 +1,87 @@
+"""
+Reference integrity: writes must name existing rows, referenced rows are protected from deletion
+"""
+import pytest
+from tests.conftest import create_table, create_row
+
+
+@pytest.fixture
+def owners(client, headers, table):
+    """An Owners table whose Weapon column references the `table` fixture"""
+    return create_table(client, headers, [
+        ("Name", "string", True),
+        ("Weapon", "reference", False, {"reference_table_id": table["id"]}),
+    ], name="Owners", project_id=table["project_id"])
+
+
+def test_rows_must_reference_existing_rows(client, headers, table, owners, storage_backend):
+    sword = create_row(client, headers, table["id"], {"Name": "Sword"})
+    create_row(client, headers, owners["id"], {"Name": "Ann", "Weapon": sword["id"]})
+    
+    response = client.post(
+        "/api/v1/data/rows",
+        json={"table_id": owners["id"], "cells": {"Name": "Bo", "Weapon": sword["id"] + 100}},
+        headers=headers
+    )
+    assert response.status_code == 400
+    assert "does not exist" in response.json()["detail"]
+    
+    response = client.post(
+        f"/api/v1/data/tables/{owners['id']}/rows:bulk",
+        json={"rows": [
+            {"Name": "Cy", "Weapon": sword["id"]},
+            {"Name": "Di", "Weapon": sword["id"] + 100},
+        ]},
+        headers=headers
+    )
+    assert response.status_code == 400
+
+
+def test_referenced_row_is_only_deleted_with_force(client, headers, table, owners, storage_backend):
+    sword = create_row(client, headers, table["id"], {"Name": "Sword"})
+    ann = create_row(client, headers, owners["id"], {"Name": "Ann", "Weapon": sword["id"]})
+    
+    response = client.delete(f"/api/v1/data/rows/{sword['id']}", headers=headers)
+    assert response.status_code == 409
+    assert f"Row {sword['id']} is referenced" in response.json()["detail"]
+    
+    response = client.delete(f"/api/v1/data/rows/{sword['id']}", params={"force": True}, headers=headers)
+    assert response.status_code == 204
+    
+    response = client.get(f"/api/v1/data/tables/{owners['id']}/references:dangling", headers=headers)
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["checked"], report["dangling_count"]) == (1, 1)
+    assert report["dangling"] == [
+        {"row_id": ann["id"], "column": "Weapon", "value": sword["id"], "reference_table_id": table["id"]}
+    ]
+
+
+def test_deleted_rows_can_no_longer_be_referenced(client, headers, table, owners):
+    sword = create_row(client, headers, table["id"], {"Name": "Sword"})
+    create_row(client, headers, owners["id"], {"Name": "Ann", "Weapon": sword["id"]})
+    
+    assert client.delete(f"/api/v1/data/rows/{sword['id']}", params={"force": True}, headers=headers).status_code == 204
+    
+    response = client.post(
+        "/api/v1/data/rows",
+        json={"table_id": owners["id"], "cells": {"Name": "Bo", "Weapon": sword["id"]}},
+        headers=headers
+    )
+    assert response.status_code == 400
+
+
+def test_unreferenced_row_is_deleted(client, headers, table, owners):
+    sword = create_row(client, headers, table["id"], {"Name": "Sword"})
+    axe = create_row(client, headers, table["id"], {"Name": "Axe"})
+    create_row(client, headers, owners["id"], {"Name": "Ann", "Weapon": sword["id"]})
+    
+    assert client.delete(f"/api/v1/data/rows/{axe['id']}", headers=headers).status_code == 204
+
+
+def test_row_is_unprotected_once_its_referrer_is_deleted(client, headers, table, owners, storage_backend):
+    sword = create_row(client, headers, table["id"], {"Name": "Sword"})
+    ann = create_row(client, headers, owners["id"], {"Name": "Ann", "Weapon": sword["id"]})
+    
+    assert client.delete(f"/api/v1/data/rows/{ann['id']}", headers=headers).status_code == 204
+    assert client.delete(f"/api/v1/data/rows/{sword['id']}", headers=headers).status_code == 204
@@ -0,0 +1,145 @@
+"""
+Version rollback: restores old values in one transaction, records itself as a version
+and can stream its progress
+"""
+import json
+from tests.conftest import create_row, get_rows, cell_ids, update_cell, commit, register
+
+
+def _buffed_version(client, headers, table) -> dict:
+    """Two weapons, committed, then both edited and committed in one version"""
+    damage = table["columns"][1]["id"]
+    rows = [
+        (create_row(client, headers, table["id"], {"Name": name, "Damage": value}), value)
+        for name, value in (("Sword", 10), ("Axe", 20))
+    ]
+    commit(client, headers, table, "Add weapons")
+    for row, value in rows:
+        update_cell(client, headers, cell_ids(row["id"])[damage], value + 5)
+    return commit(client, headers, table, "Buff")
+
+
+def _damages(client, headers, table) -> list:
+    return [row["cells"]["Damage"] for row in get_rows(client, headers, table["id"])]
+
+
+def test_rollback_restores_old_values(client, headers, table):
+    version = _buffed_version(client, headers, table)
+    assert _damages(client, headers, table) == ["15", "25"]
+    
+    response = client.post(f"/api/v1/versions/{version['id']}/rollback", params={"chunk_size": 1}, headers=headers)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["restored_cells"], result["missing_cells"], result["chunks"]) == (2, 0, 2)
+    assert _damages(client, headers, table) == ["10", "20"]
+    
+    # The rollback is a version of its own, so it can be rolled back as well
+    response = client.post(f"/api/v1/versions/{result['rollback_version_id']}/rollback", headers=headers)
+    assert response.status_code == 200, response.text
+    assert _damages(client, headers, table) == ["15", "25"]
+
+
+def test_rollback_streams_progress(client, headers, table):
+    version = _buffed_version(client, headers, table)
+    
+    response = client.post(
+        f"/api/v1/versions/{version['id']}/rollback", params={"chunk_size": 1, "stream": True}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    
+    assert lines[:-1] == [{"done": 1, "total": 2}, {"done": 2, "total": 2}]
+    assert lines[-1]["message"] == "Rollback successful"
+    assert lines[-1]["restored_cells"] == 2
+    assert _damages(client, headers, table) == ["10", "20"]
+
+
+def test_streamed_rollback_checks_version_first(client, headers, table):
+    version = _buffed_version(client, headers, table)
+    
+    response = client.post("/api/v1/versions/999/rollback", params={"stream": True}, headers=headers)
+    assert response.status_code == 404
+    
+    response = client.post(
+        f"/api/v1/versions/{version['id']}/rollback", params={"stream": True}, headers=register(client, "bob")
+    )
+    assert response.status_code == 403
+    assert _damages(client, headers, table) == ["15", "25"]
+
+
+def _rollback(client, headers, version_id) -> dict:
+    response = client.post(f"/api/v1/versions/{version_id}/rollback", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _names(client, headers, table, **params) -> dict:
+    return {row["cells"]["Name"]: row["id"] for row in get_rows(client, headers, table["id"], **params)}
+
+
+def test_rollback_of_a_create_deletes_the_row(client, headers, table):
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    commit(client, headers, table, "Add Sword")
+    axe = create_row(client, headers, table["id"], {"Name": "Axe", "Damage": 20})
+    axe_cells = cell_ids(axe["id"])
+    version = commit(client, headers, table, "Add Axe")
+    
+    result = _rollback(client, headers, version["id"])
+    assert (result["deleted_rows"], result["restored_rows"], result["missing_cells"]) == (1, 0, 0)
+    assert _names(client, headers, table) == {"Sword": sword["id"]}
+    assert cell_ids(axe["id"]) == {}
+    assert _names(client, headers, table, as_of_version=result["rollback_version_id"]) == {"Sword": sword["id"]}
+    
+    # The rollback recorded the deletion, so rolling it back brings the row back as it was
+    again = _rollback(client, headers, result["rollback_version_id"])
+    assert (again["deleted_rows"], again["restored_rows"]) == (0, 1)
+    assert _names(client, headers, table) == {"Sword": sword["id"], "Axe": axe["id"]}
+    assert cell_ids(axe["id"]) == axe_cells
+    assert _names(client, headers, table, as_of_version=again["rollback_version_id"]) == {
+        "Sword": sword["id"], "Axe": axe["id"]
+    }
+
+
+def test_rollback_of_a_delete_restores_the_row(client, headers, table):
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    axe = create_row(client, headers, table["id"], {"Name": "Axe", "Damage": 20})
+    commit(client, headers, table, "Add weapons")
+    axe_cells = cell_ids(axe["id"])
+    assert client.delete(f"/api/v1/data/rows/{axe['id']}", headers=headers).status_code == 204
+    version = commit(client, headers, table, "Remove Axe")
+    
+    result = _rollback(client, headers, version["id"])
+    assert (result["deleted_rows"], result["restored_rows"]) == (0, 1)
+    assert result["restored_cells"] == len(axe_cells)
+    assert _names(client, headers, table) == {"Sword": sword["id"], "Axe": axe["id"]}
+    assert cell_ids(axe["id"]) == axe_cells
+    assert _damages(client, headers, table) == ["10", "20"]
+    assert _names(client, headers, table, as_of_version=version["id"]) == {"Sword": sword["id"]}
+    assert _names(client, headers, table, as_of_version=result["rollback_version_id"]) == {
+        "Sword": sword["id"], "Axe": axe["id"]
+    }
+    
+    again = _rollback(client, headers, result["rollback_version_id"])
+    assert (again["deleted_rows"], again["restored_rows"]) == (1, 0)
+    assert _names(client, headers, table) == {"Sword": sword["id"]}
+
+
+def test_rollback_drops_staged_edits_of_its_cells(client, headers, table):
+    damage = table["columns"][1]["id"]
+    version = _buffed_version(client, headers, table)
+    sword = get_rows(client, headers, table["id"])[0]
+    update_cell(client, headers, cell_ids(sword["id"])[damage], 99)
+    
+    result = _rollback(client, headers, version["id"])
+    assert result["discarded_staged_changes"] == 1
+    assert _damages(client, headers, table) == ["10", "20"]
+    
+    # The rollback records the committed value it replaced, not the staged one
+    diff = client.get(f"/api/v1/versions/{result['rollback_version_id']}/diff", headers=headers).json()
+    sword_damage = diff["changes"][str(cell_ids(sword["id"])[damage])]
+    assert (sword_damage["old_value"], sword_damage["new_value"]) == ("15", "10")
+    
+    response = client.get(
+        "/api/v1/versions/staged", params={"project_id": table["project_id"], "table_id": table["id"]}, headers=headers
+    )
+    assert response.json()["changes"] == {}
@@ -0,0 +1,101 @@
+"""
+Single-flight coalescing: one loader run per key, failures and invalidation while loading
+"""
+import asyncio
+import pytest
+from app.infrastructure.cache.cache_manager import CacheManager
+from app.infrastructure.cache.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_load():
+    group = SingleFlight()
+    calls = 0
+    
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+    
+    async def run():
+        return await asyncio.gather(*(group.do("k", loader) for _ in range(5)))
+    
+    assert asyncio.run(run()) == [1] * 5
+    assert calls == 1
+    assert group.stats() == {"calls": 5, "shared": 4, "in_flight": 0}
+
+
+def test_failure_reaches_every_waiter_and_is_not_kept():
+    group = SingleFlight()
+    
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+    
+    async def ok():
+        return "fresh"
+    
+    async def run():
+        results = await asyncio.gather(*(group.do("k", failing) for _ in range(3)), return_exceptions=True)
+        return results, await group.do("k", ok)
+    
+    results, retry = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert retry == "fresh"
+
+
+def test_waiter_takes_over_when_leader_is_cancelled():
+    group = SingleFlight()
+    started = []
+    
+    async def loader():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return len(started)
+    
+    async def run():
+        leader = asyncio.create_task(group.do("k", loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(group.do("k", loader))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+    
+    assert asyncio.run(run()) == 2
+
+
+def test_do_cached_serves_from_cache():
+    group = SingleFlight()
+    cache = CacheManager(max_entries=10, max_bytes=1 << 20)
+    calls = 0
+    
+    async def loader():
+        nonlocal calls
+        calls += 1
+        return {"n": calls}
+    
+    async def run():
+        first = await group.do_cached("k", loader, 60, tags=("t",), cache=cache)
+        second = await group.do_cached("k", loader, 60, tags=("t",), cache=cache)
+        return first, second
+    
+    assert asyncio.run(run()) == ({"n": 1}, {"n": 1})
+    assert calls == 1
+
+
+def test_result_is_not_cached_when_its_tag_is_invalidated_while_loading():
+    group = SingleFlight()
+    cache = CacheManager(max_entries=10, max_bytes=1 << 20)
+    
+    async def loader():
+        # A write lands while the stale read is in flight
+        cache.invalidate_tags("t")
+        return "stale"
+    
+    async def run():
+        return await group.do_cached("k", loader, 60, tags=("t",), cache=cache)
+    
+    assert asyncio.run(run()) == "stale"
+    assert cache.get("k") is None
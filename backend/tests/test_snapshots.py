@@ -0,0 +1,116 @@
+"""
+Table reads as of a version: rebuilt from snapshots and the change log only, so
+uncommitted edits and rows whose creation or deletion is not committed never show
+"""
+import asyncio
+import pytest
+from sqlalchemy import select, func
+from app.core.config import get_settings
+from app.core.database import engine
+from app.infrastructure.models.snapshot import TableSnapshotModel
+from tests.conftest import create_row, get_rows, cell_ids, update_cell, commit, register
+
+
+@pytest.fixture(params=["log_only", "snapshot_every_version"])
+def snapshots(request, monkeypatch):
+    """Replay from the start of the log, or from a snapshot taken at every version"""
+    if request.param == "snapshot_every_version":
+        monkeypatch.setattr(get_settings(), "SNAPSHOT_EVERY_VERSIONS", 1)
+    return request.param
+
+
+def _as_of(client, headers, table, version) -> dict:
+    rows = get_rows(client, headers, table["id"], as_of_version=version["id"])
+    return {row["cells"]["Name"]: row["cells"]["Damage"] for row in rows}
+
+
+def _snapshot_count() -> int:
+    async def count():
+        async with engine.connect() as connection:
+            return (await connection.execute(select(func.count()).select_from(TableSnapshotModel))).scalar_one()
+    return asyncio.run(count())
+
+
+def test_uncommitted_edits_and_rows_are_not_read(client, headers, table, snapshots):
+    damage = table["columns"][1]["id"]
+    bob = register(client, "bob")
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    first = commit(client, headers, table, "Add sword")
+    
+    # Staged by bob and never committed: a new value and a new row
+    update_cell(client, bob, cell_ids(sword["id"])[damage], 777)
+    create_row(client, bob, table["id"], {"Name": "late", "Damage": 1})
+    
+    create_row(client, headers, table["id"], {"Name": "Axe", "Damage": 20})
+    second = commit(client, headers, table, "Add axe")
+    
+    assert _as_of(client, headers, table, first) == {"Sword": "10"}
+    assert _as_of(client, headers, table, second) == {"Sword": "10", "Axe": "20"}
+    assert _snapshot_count() == (2 if snapshots == "snapshot_every_version" else 0)
+    
+    # Once committed, they are read as of that version (and only from then on)
+    third = commit(client, bob, table, "Bob's work")
+    assert _as_of(client, headers, table, third) == {"Sword": "777", "Axe": "20", "late": "1"}
+    assert _as_of(client, headers, table, second) == {"Sword": "10", "Axe": "20"}
+
+
+def test_deleted_rows_leave_later_versions(client, headers, table, snapshots):
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    create_row(client, headers, table["id"], {"Name": "Axe", "Damage": 20})
+    first = commit(client, headers, table, "Add weapons")
+    
+    response = client.delete(f"/api/v1/data/rows/{sword['id']}", headers=headers)
+    assert response.status_code == 204, response.text
+    # Not committed yet: the latest version still has the row
+    assert _as_of(client, headers, table, first) == {"Sword": "10", "Axe": "20"}
+    
+    deletion = commit(client, headers, table, "Remove sword")
+    assert all(change["is_deleted"] for change in deletion["changes"].values())
+    
+    create_row(client, headers, table["id"], {"Name": "Spear", "Damage": 30})
+    third = commit(client, headers, table, "Add spear")
+    
+    assert _as_of(client, headers, table, first) == {"Sword": "10", "Axe": "20"}
+    assert _as_of(client, headers, table, deletion) == {"Axe": "20"}
+    assert _as_of(client, headers, table, third) == {"Axe": "20", "Spear": "30"}
+
+
+def test_deletion_records_committed_values(client, headers, table):
+    damage = table["columns"][1]["id"]
+    bob = register(client, "bob")
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    commit(client, headers, table, "Add sword")
+    sword_damage = cell_ids(sword["id"])[damage]
+    update_cell(client, bob, sword_damage, 777)
+    
+    response = client.delete(f"/api/v1/data/rows/{sword['id']}", headers=headers)
+    assert response.status_code == 204, response.text
+    
+    # Bob's edit went with the row; the deletion records the committed value
+    response = client.get(
+        "/api/v1/versions/staged", params={"project_id": table["project_id"]}, headers=bob
+    )
+    assert response.json()["changes"] == {}
+    deletion = commit(client, headers, table, "Remove sword")
+    assert deletion["changes"][str(sword_damage)]["old_value"] == "10"
+
+
+def test_rows_created_and_deleted_before_commit_leave_no_trace(client, headers, table):
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    response = client.delete(f"/api/v1/data/rows/{sword['id']}", headers=headers)
+    assert response.status_code == 204, response.text
+    
+    response = client.get("/api/v1/versions/staged", params={"project_id": table["project_id"]}, headers=headers)
+    assert response.json()["changes"] == {}
+
+
+def test_bulk_created_rows_are_staged(client, headers, table):
+    response = client.post(
+        f"/api/v1/data/tables/{table['id']}/rows:bulk",
+        json={"rows": [{"Name": f"Weapon {index}", "Damage": index} for index in range(5)], "chunk_size": 2},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    
+    version = commit(client, headers, table, "Import")
+    assert _as_of(client, headers, table, version) == {f"Weapon {index}": str(index) for index in range(5)}
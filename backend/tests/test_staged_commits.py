@@ -0,0 +1,103 @@
+"""
+Server-side change capture: edits are staged per user and sealed by a commit
+"""
+from tests.conftest import create_row, cell_ids, update_cell, commit, register, create_table
+
+
+def _staged(client, headers, table) -> dict:
+    response = client.get(
+        "/api/v1/versions/staged",
+        params={"project_id": table["project_id"], "table_id": table["id"]},
+        headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["changes"]
+
+
+def _commit_response(client, headers, table):
+    return client.post(
+        "/api/v1/versions/commit",
+        json={"project_id": table["project_id"], "table_id": table["id"], "message": "Update"},
+        headers=headers
+    )
+
+
+def test_edits_are_staged_and_sealed_by_commit(client, headers, table):
+    damage = table["columns"][1]["id"]
+    row = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    cells = cell_ids(row["id"])
+    commit(client, headers, table, "Add sword")
+    
+    update_cell(client, headers, cells[damage], 12)
+    update_cell(client, headers, cells[damage], 15)
+    
+    # Several edits of a cell stage one change from the committed value to the latest
+    staged = _staged(client, headers, table)
+    assert staged == {
+        str(cells[damage]): {
+            "old_value": "10", "new_value": "15", "row_id": row["id"], "column_id": damage, "table_id": table["id"]
+        }
+    }
+    
+    version = commit(client, headers, table, "Buff sword")
+    assert version["changes"] == staged
+    assert _staged(client, headers, table) == {}
+
+
+def test_created_rows_are_staged(client, headers, table):
+    row = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    
+    staged = _staged(client, headers, table)
+    assert {(entry["row_id"], entry["new_value"], entry.get("is_new")) for entry in staged.values()} >= {
+        (row["id"], "Sword", True), (row["id"], "10", True)
+    }
+
+
+def test_edit_back_to_the_committed_value_leaves_nothing_to_commit(client, headers, table):
+    damage = table["columns"][1]["id"]
+    row = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    cells = cell_ids(row["id"])
+    commit(client, headers, table, "Add sword")
+    
+    update_cell(client, headers, cells[damage], 12)
+    update_cell(client, headers, cells[damage], 10)
+    
+    response = _commit_response(client, headers, table)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "No staged changes to commit"
+
+
+def test_staged_changes_are_per_user(client, headers, table):
+    create_row(client, headers, table["id"], {"Name": "Sword"})
+    
+    bob = register(client, "bob")
+    bob_table = create_table(client, bob, name="Armor")
+    create_row(client, bob, bob_table["id"], {"Name": "Helmet"})
+    
+    assert _staged(client, bob, table) == {}
+    assert _commit_response(client, bob, table).status_code == 400
+    # One new cell per column of the row
+    assert len(_staged(client, headers, table)) == len(table["columns"])
+
+
+def test_commits_reject_client_supplied_changes(client, headers, table):
+    row = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    damage = cell_ids(row["id"])[table["columns"][1]["id"]]
+    staged = _staged(client, headers, table)
+    
+    response = client.post(
+        "/api/v1/versions/commit",
+        json={
+            "project_id": table["project_id"],
+            "table_id": table["id"],
+            "message": "Forged",
+            "changes": {str(damage): {"old_value": "10", "new_value": "9999"}}
+        },
+        headers=headers
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "changes"]
+    
+    # Nothing was committed: the buffer is still there for a real commit
+    assert _staged(client, headers, table) == staged
+    assert commit(client, headers, table)["changes"] == staged
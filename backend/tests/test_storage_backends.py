@@ -0,0 +1,79 @@
+"""
+Row storage backends: every endpoint uses the configured backend, and features
+built on cell IDs are rejected with a 4xx on the row-packed backend
+"""
+import pytest
+from tests.conftest import create_row, get_rows, cell_ids
+
+
+def test_rows_round_trip(client, headers, table, storage_backend):
+    row = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    
+    response = client.patch(
+        f"/api/v1/data/rows/{row['id']}", json={"row_id": row["id"], "cells": {"Level": 3}}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    
+    # The cells table stores text; row documents keep the JSON types
+    expected = {"Name": "Sword", "Damage": 10, "Level": 3} if storage_backend == "packed" \
+        else {"Name": "Sword", "Damage": "10", "Level": "3"}
+    assert [row["cells"] for row in get_rows(client, headers, table["id"])] == [expected]
+
+
+def test_packed_rejects_cell_updates(client, headers, table, packed_storage):
+    create_row(client, headers, table["id"], {"Name": "Sword"})
+    
+    response = client.patch("/api/v1/data/cell", json={"cell_id": 1, "value": "Axe"}, headers=headers)
+    assert response.status_code == 400
+    assert "EAV storage backend" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("method, path", [
+    ("get", "/api/v1/versions/staged?project_id={project_id}"),
+    ("get", "/api/v1/versions/history/row/{row_id}"),
+    ("get", "/api/v1/versions/blame/table/{table_id}"),
+    ("post", "/api/v1/versions/1/rollback"),
+    ("get", "/api/v1/data/table/{table_id}?as_of_version=1"),
+    ("get", "/api/v1/branches/table/{table_id}"),
+])
+def test_packed_rejects_cell_id_features(client, headers, table, packed_storage, method, path):
+    row = create_row(client, headers, table["id"], {"Name": "Sword"})
+    
+    url = path.format(project_id=table["project_id"], table_id=table["id"], row_id=row["id"])
+    response = getattr(client, method)(url, headers=headers)
+    assert response.status_code == 400, response.text
+    assert "EAV storage backend" in response.json()["detail"]
+
+
+def test_packed_rejects_commits(client, headers, table, packed_storage):
+    response = client.post(
+        "/api/v1/versions/commit",
+        json={"project_id": table["project_id"], "table_id": table["id"], "message": "Edit"},
+        headers=headers
+    )
+    assert response.status_code == 400
+    assert "EAV storage backend" in response.json()["detail"]
+
+
+def test_eav_cell_update_is_versioned(client, headers, table):
+    row = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    damage = table["columns"][1]["id"]
+    response = client.post(
+        "/api/v1/versions/commit",
+        json={"project_id": table["project_id"], "table_id": table["id"], "message": "Add sword"},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    
+    response = client.patch(
+        "/api/v1/data/cell", json={"cell_id": cell_ids(row["id"])[damage], "value": 12}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    
+    response = client.post(
+        "/api/v1/versions/commit",
+        json={"project_id": table["project_id"], "table_id": table["id"], "message": "Buff"},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    assert len(response.json()["changes"]) == 1
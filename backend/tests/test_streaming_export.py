@@ -0,0 +1,30 @@
+"""
+NDJSON export of whole tables, streamed chunk by chunk
+"""
+import json
+from tests.conftest import create_row
+
+
+def test_stream_exports_every_row(client, headers, table, storage_backend):
+    for index in range(5):
+        create_row(client, headers, table["id"], {"Name": f"Weapon {index}", "Damage": index})
+    
+    response = client.get(f"/api/v1/data/table/{table['id']}/stream", params={"chunk_size": 2}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="Weapons.ndjson"' in response.headers["content-disposition"]
+    
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["cells"]["Name"] for row in rows] == [f"Weapon {index}" for index in range(5)]
+    assert len({row["id"] for row in rows}) == 5
+
+
+def test_stream_of_empty_table(client, headers, table):
+    response = client.get(f"/api/v1/data/table/{table['id']}/stream", headers=headers)
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+def test_stream_of_unknown_table(client, headers, table):
+    response = client.get("/api/v1/data/table/999/stream", headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,45 @@
+"""
+Shared Jinja2 environment of the code generators: templates compile once per
+process and a templates directory can override the built-in ones
+"""
+from app.infrastructure.code_generators.template_environment import TemplateEnvironment
+from app.infrastructure.code_generators.unity_generator import UnityGenerator
+
+
+def test_builtin_template_compiles_once(tmp_path):
+    environment = TemplateEnvironment(templates_dir=str(tmp_path))
+    
+    first = environment.get_template("json", "{{ table_name }}")
+    assert environment.get_template("json", "{{ table_name }}") is first
+    assert first.render(table_name="Weapons") == "Weapons"
+    
+    # A different source is a different template, even for the same generator
+    assert environment.get_template("json", "[{{ table_name }}]").render(table_name="Weapons") == "[Weapons]"
+
+
+def test_templates_directory_overrides_builtin(tmp_path):
+    (tmp_path / "json.j2").write_text("override {{ table_name }}")
+    environment = TemplateEnvironment(templates_dir=str(tmp_path))
+    
+    assert environment.get_template("json", "{{ table_name }}").render(table_name="Weapons") == "override Weapons"
+    assert environment.get_template("unity", "{{ table_name }}").render(table_name="Weapons") == "Weapons"
+
+
+def test_missing_override_is_remembered(tmp_path):
+    environment = TemplateEnvironment(templates_dir=str(tmp_path))
+    environment.get_template("json", "{{ table_name }}")
+    
+    # Without auto-reload, an override added later is not looked up again
+    (tmp_path / "json.j2").write_text("override")
+    assert environment.get_template("json", "{{ table_name }}").render(table_name="Weapons") == "Weapons"
+    
+    reloading = TemplateEnvironment(templates_dir=str(tmp_path), auto_reload=True)
+    assert reloading.get_template("json", "{{ table_name }}").render(table_name="Weapons") == "override"
+
+
+def test_generator_renders_through_environment():
+    output = UnityGenerator().generate(
+        {"rows": [{"id": 1, "cells": {"Name": "Sword"}}]},
+        {"name": "Weapons", "columns": [{"name": "Name", "data_type": "string"}]}
+    )
+    assert "Game Data/Weapons" in output
@@ -0,0 +1,111 @@
+"""
+Row validation: every write path coerces values with the table's compiled validator
+and rejects values that do not fit their column
+"""
+import pytest
+from tests.conftest import create_table, create_row, get_rows, cell_ids, update_cell
+
+COLUMNS = [
+    ("Name", "string", True),
+    ("Damage", "integer", False),
+    ("Rarity", "enum", False, {"enum_values": ["common", "rare"]}),
+    ("Weight", "float", False, {"default_value": "1.5"}),
+]
+
+
+@pytest.fixture
+def weapons(client, headers):
+    return create_table(client, headers, COLUMNS)
+
+
+def _columns(table) -> dict:
+    return {column["name"]: column["id"] for column in table["columns"]}
+
+
+def test_create_row_applies_defaults_and_coercion(client, headers, weapons):
+    create_row(client, headers, weapons["id"], {"Name": "Sword", "Damage": "10", "Rarity": "rare"})
+    
+    [row] = get_rows(client, headers, weapons["id"])
+    assert row["cells"] == {"Name": "Sword", "Damage": "10", "Rarity": "rare", "Weight": "1.5"}
+
+
+@pytest.mark.parametrize("cells", [
+    {"Damage": 10},
+    {"Name": "Sword", "Damage": "not-a-number"},
+    {"Name": "Sword", "Rarity": "zzz"},
+])
+def test_create_row_rejects_invalid_values(client, headers, weapons, cells):
+    response = client.post(
+        "/api/v1/data/rows", json={"table_id": weapons["id"], "cells": cells}, headers=headers
+    )
+    assert response.status_code == 400, response.text
+    assert get_rows(client, headers, weapons["id"]) == []
+
+
+@pytest.mark.parametrize("column, value", [("Damage", "not-a-number"), ("Rarity", "zzz"), ("Weight", "heavy")])
+def test_cell_update_rejects_invalid_values(client, headers, weapons, column, value):
+    row = create_row(client, headers, weapons["id"], {"Name": "Sword", "Damage": 10, "Rarity": "common"})
+    cell_id = cell_ids(row["id"])[_columns(weapons)[column]]
+    
+    response = client.patch("/api/v1/data/cell", json={"cell_id": cell_id, "value": value}, headers=headers)
+    assert response.status_code == 400, response.text
+    assert f"Column '{column}'" in response.json()["detail"]
+    assert get_rows(client, headers, weapons["id"])[0]["cells"] == {
+        "Name": "Sword", "Damage": "10", "Rarity": "common", "Weight": "1.5"
+    }
+
+
+def test_cell_update_coerces_values(client, headers, weapons):
+    row = create_row(client, headers, weapons["id"], {"Name": "Sword", "Damage": 10})
+    
+    update_cell(client, headers, cell_ids(row["id"])[_columns(weapons)["Damage"]], "12")
+    update_cell(client, headers, cell_ids(row["id"])[_columns(weapons)["Rarity"]], "rare")
+    
+    assert get_rows(client, headers, weapons["id"])[0]["cells"]["Damage"] == "12"
+    assert get_rows(client, headers, weapons["id"])[0]["cells"]["Rarity"] == "rare"
+
+
+def test_required_cell_cannot_be_cleared(client, headers, weapons):
+    row = create_row(client, headers, weapons["id"], {"Name": "Sword"})
+    cell_id = cell_ids(row["id"])[_columns(weapons)["Name"]]
+    
+    response = client.patch("/api/v1/data/cell", json={"cell_id": cell_id, "value": None}, headers=headers)
+    assert response.status_code == 400, response.text
+
+
+def test_validator_follows_schema_changes(client, headers, weapons):
+    create_row(client, headers, weapons["id"], {"Name": "Sword"})
+    
+    response = client.post(
+        f"/api/v1/tables/{weapons['id']}/columns",
+        json={"name": "Level", "data_type": "integer", "is_required": True, "order": 5},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    
+    # The cached validator of the table must not be reused for the new schema
+    response = client.post(
+        "/api/v1/data/rows", json={"table_id": weapons["id"], "cells": {"Name": "Axe"}}, headers=headers
+    )
+    assert response.status_code == 400, response.text
+    create_row(client, headers, weapons["id"], {"Name": "Axe", "Level": 3})
+
+
+def test_cell_update_checks_references(client, headers, weapons):
+    materials = create_table(client, headers, [("Name", "string", True)], name="Materials", project_id=weapons["project_id"])
+    iron = create_row(client, headers, materials["id"], {"Name": "Iron"})
+    response = client.post(
+        f"/api/v1/tables/{weapons['id']}/columns",
+        json={"name": "Material", "data_type": "reference", "reference_table_id": materials["id"], "order": 5},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    material = response.json()["id"]
+    
+    row = create_row(client, headers, weapons["id"], {"Name": "Sword", "Material": iron["id"]})
+    cell_id = cell_ids(row["id"])[material]
+    
+    response = client.patch("/api/v1/data/cell", json={"cell_id": cell_id, "value": iron["id"] + 100}, headers=headers)
+    assert response.status_code == 400, response.text
+    
+    update_cell(client, headers, cell_id, iron["id"])
@@ -0,0 +1,61 @@
+"""
+Change history: every committed cell change is queryable by cell, row and column
+"""
+from tests.conftest import create_row, cell_ids, update_cell, commit
+
+
+def _history(client, headers, kind: str, identifier: int, **params) -> list:
+    response = client.get(f"/api/v1/versions/history/{kind}/{identifier}", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_history_by_cell_row_and_column(client, headers, table):
+    damage, level = table["columns"][1]["id"], table["columns"][2]["id"]
+    sword = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10, "Level": 1})
+    axe = create_row(client, headers, table["id"], {"Name": "Axe", "Damage": 20, "Level": 1})
+    sword_cells, axe_cells = cell_ids(sword["id"]), cell_ids(axe["id"])
+    created = commit(client, headers, table, "Add weapons")
+    
+    update_cell(client, headers, sword_cells[damage], 12)
+    first = commit(client, headers, table, "Buff sword")
+    update_cell(client, headers, sword_cells[damage], 14)
+    update_cell(client, headers, sword_cells[level], 2)
+    update_cell(client, headers, axe_cells[damage], 18)
+    second = commit(client, headers, table, "Rebalance")
+    
+    # Newest first, with the location of each change; the row's creation comes first
+    cell_history = _history(client, headers, "cell", sword_cells[damage])
+    assert [
+        (entry["version_id"], entry["old_value"], entry["new_value"], entry["is_new"]) for entry in cell_history
+    ] == [
+        (second["id"], "12", "14", False),
+        (first["id"], "10", "12", False),
+        (created["id"], None, "10", True),
+    ]
+    assert {(entry["row_id"], entry["column_id"], entry["table_id"]) for entry in cell_history} == {
+        (sword["id"], damage, table["id"])
+    }
+    assert cell_history[0]["message"] == "Rebalance"
+    
+    row_history = _history(client, headers, "row", sword["id"])
+    assert sorted(entry["cell_id"] for entry in row_history if not entry["is_new"]) == sorted(
+        [sword_cells[damage], sword_cells[damage], sword_cells[level]]
+    )
+    assert len(row_history) == 6
+    
+    column_history = _history(client, headers, "column", damage)
+    assert {entry["row_id"] for entry in column_history} == {sword["id"], axe["id"]}
+    assert len(column_history) == 5
+    
+    assert len(_history(client, headers, "column", damage, skip=1, limit=1)) == 1
+
+
+def test_uncommitted_edits_are_not_history(client, headers, table):
+    damage = table["columns"][1]["id"]
+    row = create_row(client, headers, table["id"], {"Name": "Sword", "Damage": 10})
+    
+    commit(client, headers, table, "Add sword")
+    update_cell(client, headers, cell_ids(row["id"])[damage], 12)
+    
+    assert {entry["new_value"] for entry in _history(client, headers, "row", row["id"])} == {"Sword", "10", None}
@@ -7,9 +7,10 @@ interface EditableCellProps {
   column: Column
   rowId: number
   onSave: (rowId: number, columnName: string, value: any) => void
+  onPasteBlock?: (rowId: number, columnName: string, text: string) => void
 }
 
-export default function EditableCell({ value, column, rowId, onSave }: EditableCellProps) {
+export default function EditableCell({ value, column, rowId, onSave, onPasteBlock }: EditableCellProps) {
   const [editing, setEditing] = useState(false)
   const [editValue, setEditValue] = useState(value ?? '')
 
@@ -37,6 +38,17 @@ export default function EditableCell({ value, column, rowId, onSave }: EditableC
     }
   }
 
+  const handlePaste = (e: React.ClipboardEvent) => {
+    // A multi-cell block (tab/newline separated) is spread over the grid from this cell
+    const text = e.clipboardData.getData('text/plain')
+    if (onPasteBlock && /[\t\n]/.test(text.replace(/[\r\n]+$/, ''))) {
+      e.preventDefault()
+      setEditValue(value ?? '')
+      setEditing(false)
+      onPasteBlock(rowId, column.name, text)
+    }
+  }
+
   const handleChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     let newValue: any = e.target.value
 
@@ -80,6 +92,7 @@ export default function EditableCell({ value, column, rowId, onSave }: EditableC
           onChange={handleChange}
           onBlur={handleBlur}
           onKeyDown={handleKeyDown}
+          onPaste={handlePaste}
           type={column.data_type === 'integer' || column.data_type === 'float' ? 'number' : 'text'}
           size="small"
           fullWidth
@@ -31,6 +31,7 @@ import {
 import { Add as AddIcon, Delete as DeleteIcon, Edit as EditIcon, Save as SaveIcon, Code as CodeIcon } from '@mui/icons-material'
 import { dataService } from '../services/data.service'
 import { Table, Row } from '../types/domain'
+import { CellPatchOperation } from '../types/api'
 import EditableCell from '../components/table-editor/EditableCell'
 
 export default function TableEditorPage() {
@@ -70,6 +71,23 @@ export default function TableEditorPage() {
     },
   })
 
+  const patchCellsMutation = useMutation({
+    mutationFn: (operations: CellPatchOperation[]) => dataService.patchCells(operations),
+    onSuccess: (result) => {
+      queryClient.invalidateQueries({ queryKey: ['tableData', tableId] })
+      if (result.failed > 0) {
+        const errors = result.results
+          .filter((item) => item.status !== 'updated')
+          .slice(0, 3)
+          .map((item) => item.error)
+        setError(`${result.failed} of ${result.results.length} pasted cells were not saved: ${errors.join('; ')}`)
+      }
+    },
+    onError: (err: any) => {
+      setError(err.response?.data?.detail || 'Failed to paste cells')
+    },
+  })
+
   const createRowMutation = useMutation({
     mutationFn: (cells: Record<string, any>) => dataService.createRow(tableIdNum, cells),
     onSuccess: () => {
@@ -84,18 +102,25 @@ export default function TableEditorPage() {
   })
 
   const deleteRowMutation = useMutation({
-    mutationFn: (rowId: number) => dataService.deleteRow(rowId),
+    mutationFn: ({ rowId, force }: { rowId: number; force?: boolean }) => dataService.deleteRow(rowId, force),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['tableData', tableId] })
     },
-    onError: (err: any) => {
+    onError: (err: any, variables) => {
+      // 409: other rows still reference this one
+      if (err.response?.status === 409 && !variables.force) {
+        if (window.confirm(`${err.response.data.detail}\n\nDelete anyway?`)) {
+          deleteRowMutation.mutate({ rowId: variables.rowId, force: true })
+        }
+        return
+      }
       setError(err.response?.data?.detail || 'Failed to delete row')
     },
   })
 
   const createCommitMutation = useMutation({
-    mutationFn: ({ message, changes }: { message: string; changes: Record<string, any> }) =>
-      dataService.createCommit(parseInt(projectId || '0'), message, changes, tableIdNum),
+    mutationFn: ({ message }: { message: string }) =>
+      dataService.createCommit(parseInt(projectId || '0'), message, undefined, tableIdNum),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['versions', projectId] })
       setCommitDialogOpen(false)
@@ -112,6 +137,34 @@ export default function TableEditorPage() {
     updateRowMutation.mutate({ rowId, cells })
   }
 
+  const handlePasteBlock = (rowId: number, columnName: string, text: string) => {
+    if (!table || !tableData) return
+
+    // Clipboard rows/columns map onto the grid starting at the pasted-into cell;
+    // everything is sent as one batch request
+    const startRow = tableData.rows.findIndex((row: Row) => row.id === rowId)
+    const startColumn = table.columns.findIndex((column) => column.name === columnName)
+    const operations: CellPatchOperation[] = []
+    text
+      .replace(/\r\n?/g, '\n')
+      .replace(/\n$/, '')
+      .split('\n')
+      .forEach((line, i) => {
+        const row = tableData.rows[startRow + i]
+        if (!row) return
+        line.split('\t').forEach((cellText, j) => {
+          const column = table.columns[startColumn + j]
+          if (!column) return
+          operations.push({ row_id: row.id!, column: column.name, value: cellText === '' ? null : cellText })
+        })
+      })
+
+    if (operations.length > 0) {
+      setError(null)
+      patchCellsMutation.mutate(operations)
+    }
+  }
+
   const handleAddRow = () => {
     if (!table) return
     
@@ -143,7 +196,7 @@ export default function TableEditorPage() {
 
   const handleDeleteRow = (rowId: number) => {
     if (window.confirm('Are you sure you want to delete this row?')) {
-      deleteRowMutation.mutate(rowId)
+      deleteRowMutation.mutate({ rowId })
     }
   }
 
@@ -153,12 +206,9 @@ export default function TableEditorPage() {
       return
     }
     
-    // For now, create a simple commit with empty changes
-    // In a real implementation, we'd track changes
-    const changes: Record<string, any> = {}
-    
+    // Edits are captured server-side; the commit seals them
     setError(null)
-    createCommitMutation.mutate({ message: commitMessage.trim(), changes })
+    createCommitMutation.mutate({ message: commitMessage.trim() })
   }
 
   // Early returns after all hooks
@@ -257,6 +307,7 @@ export default function TableEditorPage() {
                     column={column}
                     rowId={row.id!}
                     onSave={handleCellSave}
+                    onPasteBlock={handlePasteBlock}
                   />
                 ))}
                 <TableCell>
@@ -1,5 +1,6 @@
 import { apiClient } from './api-client'
 import { Project, Table, Row, Version } from '../types/domain'
+import { CellPatchOperation, BatchCellPatchResponse, TableDataQuery } from '../types/api'
 
 export const dataService = {
   // Projects
@@ -86,8 +87,8 @@ export const dataService = {
     return response.data
   },
 
-  async deleteRow(rowId: number): Promise<void> {
-    await apiClient.delete(`/api/v1/data/rows/${rowId}`)
+  async deleteRow(rowId: number, force = false): Promise<void> {
+    await apiClient.delete(`/api/v1/data/rows/${rowId}`, { params: force ? { force } : undefined })
   },
 
   async updateCell(cellId: number, value: any): Promise<void> {
@@ -98,10 +99,16 @@ export const dataService = {
   },
 
   // Data
-  async getTableData(tableId: number, skip = 0, limit = 100): Promise<{ table_id: number; rows: Row[] }> {
+  async getTableData(
+    tableId: number,
+    skip = 0,
+    limit = 100,
+    query: TableDataQuery = {}
+  ): Promise<{ table_id: number; rows: Row[] }> {
     const response = await apiClient.get<{ table_id: number; rows: Row[] }>(
       `/api/v1/data/table/${tableId}`,
-      { params: { skip, limit } }
+      // Repeated filter=... parameters, not filter[]=...
+      { params: { skip, limit, ...query }, paramsSerializer: { indexes: null } }
     )
     return response.data
   },
@@ -110,6 +117,13 @@ export const dataService = {
     await apiClient.patch('/api/v1/data/cell', { cell_id: cellId, value })
   },
 
+  async patchCells(operations: CellPatchOperation[]): Promise<BatchCellPatchResponse> {
+    const response = await apiClient.patch<BatchCellPatchResponse>('/api/v1/data/cells:batch', {
+      operations,
+    })
+    return response.data
+  },
+
   // Versions
   async getVersionsByProject(projectId: number, skip = 0, limit = 100): Promise<Version[]> {
     const response = await apiClient.get<Version[]>(`/api/v1/versions/project/${projectId}`, {
@@ -121,7 +135,7 @@ export const dataService = {
   async createCommit(
     projectId: number,
     message: string,
-    changes: Record<string, any>,
+    changes?: Record<string, any>,
     tableId?: number
   ): Promise<Version> {
     const response = await apiClient.post<Version>('/api/v1/versions/commit', {
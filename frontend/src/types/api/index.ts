@@ -18,3 +18,35 @@ export interface ApiError {
   detail: string
 }
 
+
+export interface TableDataQuery {
+  filter?: string[]
+  sort?: string
+  fields?: string
+}
+
+export interface CellPatchOperation {
+  cell_id?: number
+  row_id?: number
+  column?: string
+  value: any
+  version?: number
+}
+
+export interface CellPatchResult {
+  index: number
+  status: 'updated' | 'invalid' | 'not_found' | 'conflict' | 'superseded'
+  cell_id: number | null
+  row_id: number | null
+  column: string | null
+  value: any
+  version: number | null
+  error: string | null
+}
+
+export interface BatchCellPatchResponse {
+  updated: number
+  failed: number
+  results: CellPatchResult[]
+  elapsed_seconds: number
+}